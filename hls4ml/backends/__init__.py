@@ -1,28 +1,48 @@
-from hls4ml.backends.backend import Backend, get_available_backends, get_backend, register_backend  # noqa: F401
+import importlib
+
+from hls4ml.backends.backend import (  # noqa: F401
+    Backend,
+    get_available_backends,
+    get_backend,
+    init_lazy_backends,
+    register_backend,
+)
 from hls4ml.backends.fpga.fpga_backend import FPGABackend  # noqa: F401
-from hls4ml.backends.libero.libero_backend import LiberoBackend
-from hls4ml.backends.oneapi.oneapi_backend import OneAPIBackend
 from hls4ml.backends.plugin_loader import load_backend_plugins
-from hls4ml.backends.quartus.quartus_backend import QuartusBackend
-from hls4ml.backends.symbolic.symbolic_backend import SymbolicExpressionBackend
-from hls4ml.backends.vivado.vivado_backend import VivadoBackend
-from hls4ml.backends.vivado_accelerator.vivado_accelerator_backend import VivadoAcceleratorBackend
-from hls4ml.backends.vivado_accelerator.vivado_accelerator_config import VivadoAcceleratorConfig  # noqa: F401
 
-from hls4ml.backends.catapult.catapult_backend import CatapultBackend  # isort: skip
+# Built-in backends, imported and instantiated on first use
+_builtin_backends = {
+    'Vivado': ('hls4ml.backends.vivado.vivado_backend', 'VivadoBackend'),
+    'VivadoAccelerator': ('hls4ml.backends.vivado_accelerator.vivado_accelerator_backend', 'VivadoAcceleratorBackend'),
+    'Vitis': ('hls4ml.backends.vitis.vitis_backend', 'VitisBackend'),
+    'Quartus': ('hls4ml.backends.quartus.quartus_backend', 'QuartusBackend'),
+    'Catapult': ('hls4ml.backends.catapult.catapult_backend', 'CatapultBackend'),
+    'SymbolicExpression': ('hls4ml.backends.symbolic.symbolic_backend', 'SymbolicExpressionBackend'),
+    'oneAPI': ('hls4ml.backends.oneapi.oneapi_backend', 'OneAPIBackend'),
+    'Libero': ('hls4ml.backends.libero.libero_backend', 'LiberoBackend'),
+}
+
+_lazy_classes = {class_name: module_name for module_name, class_name in _builtin_backends.values()}
+_lazy_classes['VivadoAcceleratorConfig'] = 'hls4ml.backends.vivado_accelerator.vivado_accelerator_config'
+
+
+def __getattr__(name):
+    # The backend classes are imported on first access, e.g., `from hls4ml.backends import VivadoBackend`
+    if name in _lazy_classes:
+        return getattr(importlib.import_module(_lazy_classes[name]), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _lazy_backend_factory(module_name, class_name):
+    def create_backend():
+        return getattr(importlib.import_module(module_name), class_name)()
 
-from hls4ml.backends.vitis.vitis_backend import VitisBackend  # isort: skip
+    return create_backend
 
 
 def _register_builtin_backends():
-    register_backend('Vivado', VivadoBackend)
-    register_backend('VivadoAccelerator', VivadoAcceleratorBackend)
-    register_backend('Vitis', VitisBackend)
-    register_backend('Quartus', QuartusBackend)
-    register_backend('Catapult', CatapultBackend)
-    register_backend('SymbolicExpression', SymbolicExpressionBackend)
-    register_backend('oneAPI', OneAPIBackend)
-    register_backend('Libero', LiberoBackend)
+    for backend_name, (module_name, class_name) in _builtin_backends.items():
+        register_backend(backend_name, _lazy_backend_factory(module_name, class_name))
 
 
 _register_builtin_backends()
@@ -151,14 +151,26 @@ class Backend:
 
 
 backend_map = {}
+_initializing_backends = set()
+
+
+class _LazyBackend:
+    """Placeholder of a registered backend that has not been instantiated yet."""
+
+    def __init__(self, factory):
+        self.factory = factory
 
 
 def register_backend(name, backend_cls):
-    """Create the backend instance and add it to the registry.
+    """Add the backend to the registry.
+
+    The backend is instantiated (and its optimizers, templates and flows registered) on first use, when retrieved with
+    ``get_backend()``, or when one of its flows or optimizers is requested.
 
     Args:
         name (str): Name of the backend.
-        backend_cls (class): Backend class to instantiate. Class must implement a constructor without parameters.
+        backend_cls (class): Backend class to instantiate. Class must implement a constructor without parameters. Any
+            callable without parameters returning the backend instance can be used instead of the class.
 
     Raises:
         Exception: If the backend has already been registered.
@@ -166,12 +178,42 @@ def register_backend(name, backend_cls):
     if name.lower() in backend_map:
         raise Exception(f'Backend {name} already registered')
 
-    backend_map[name.lower()] = backend_cls()
+    backend_map[name.lower()] = _LazyBackend(backend_cls)
 
 
 def get_backend(name):
-    return backend_map[name.lower()]
+    backend = backend_map[name.lower()]
+    if isinstance(backend, _LazyBackend):
+        if name.lower() in _initializing_backends:
+            raise Exception(f'Backend {name} is used before its initialization completed')
+        _initializing_backends.add(name.lower())
+        try:
+            backend = backend.factory()
+        finally:
+            _initializing_backends.discard(name.lower())
+        backend_map[name.lower()] = backend
+
+    return backend
 
 
 def get_available_backends():
     return list(backend_map.keys())
+
+
+def init_lazy_backends(name=None):
+    """Instantiate the registered backends that have not been used yet.
+
+    Args:
+        name (str, optional): Name of a flow or optimizer. If it has a backend prefix (e.g., ``vivado:ip``), only that
+            backend is instantiated. If None, all backends are instantiated. Defaults to None.
+    """
+    if name is None:
+        backend_names = list(backend_map.keys())
+    elif ':' in name:
+        backend_names = [name.split(':', 1)[0]]
+    else:
+        return
+
+    for backend_name in backend_names:
+        if isinstance(backend_map.get(backend_name), _LazyBackend) and backend_name not in _initializing_backends:
+            get_backend(backend_name)
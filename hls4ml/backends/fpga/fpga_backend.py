@@ -50,15 +50,29 @@ from hls4ml.model.types import (
     XnorPrecisionType,
 )
 from hls4ml.utils import attribute_descriptions as descriptions
+from hls4ml.utils.compile_cache import get_compile_cache
 from hls4ml.writer import get_writer
 
 
+def _get_divisors(n):
+    """Sorted list of the divisors of a positive integer."""
+    small, large = [], []
+    for i in range(1, math.isqrt(n) + 1):
+        if n % i == 0:
+            small.append(i)
+            if i != n // i:
+                large.append(n // i)
+    return small + large[::-1]
+
+
 class FPGABackend(Backend):
     def __init__(self, name):
         super().__init__(name)
 
         self.writer = get_writer(self.name)
 
+        self._valid_reuse_factors = {}
+
         self.attribute_map = {}
 
         accum_layers = [
@@ -175,7 +189,19 @@ class FPGABackend(Backend):
             string: Returns the name of the compiled library.
         """
 
-        lib_name = None
+        lib_name = '{}/firmware/{}-{}.so'.format(
+            model.config.get_output_dir(), model.config.get_project_name(), model.config.get_config_value('Stamp')
+        )
+
+        # Stitched projects of MultiModelGraph are built from the sources of the subgraphs in other directories
+        cache = get_compile_cache()
+        if cache is not None and not hasattr(model, 'graphs'):
+            cache_key = cache.make_key(model.config.get_output_dir(), model.config.get_config_value('Stamp'))
+            if cache.get(cache_key, lib_name):
+                return lib_name
+        else:
+            cache_key = None
+
         ret_val = subprocess.run(
             ['./build_lib.sh'],
             shell=True,
@@ -187,9 +213,9 @@ class FPGABackend(Backend):
         if ret_val.returncode != 0:
             print(ret_val.stdout)
             raise Exception(f'Failed to compile project "{model.config.get_project_name()}"')
-        lib_name = '{}/firmware/{}-{}.so'.format(
-            model.config.get_output_dir(), model.config.get_project_name(), model.config.get_config_value('Stamp')
-        )
+
+        if cache_key is not None:
+            cache.put(cache_key, lib_name)
 
         return lib_name
 
@@ -251,12 +277,38 @@ class FPGABackend(Backend):
         raise Exception(f'Cannot get mult size for layer {layer.name} ({layer.class_name})')
 
     def get_valid_reuse_factors(self, n_in, n_out):
-        max_rf = n_in * n_out
-        valid_reuse_factors = []
-        for rf in range(1, max_rf + 1):
-            _assert = self._validate_reuse_factor(n_in, n_out, rf)
-            if _assert:
-                valid_reuse_factors.append(rf)
+        """Get the valid reuse factors of a layer with the given number of inputs and outputs of the multiplication.
+
+        Args:
+            n_in (int): Number of inputs.
+            n_out (int): Number of outputs.
+
+        Returns:
+            list: Sorted list of valid reuse factors.
+        """
+        return list(self._get_valid_reuse_factors(n_in, n_out))
+
+    def get_reuse_factor_options(self, n_in, n_out):
+        """Get the valid reuse factors of a layer along with the number of multipliers each of them results in.
+
+        Args:
+            n_in (int): Number of inputs.
+            n_out (int): Number of outputs.
+
+        Returns:
+            dict: Mapping of the valid reuse factors (in increasing order) to their multiplier limit.
+        """
+        return {rf: (n_in * n_out) // rf for rf in self._get_valid_reuse_factors(n_in, n_out)}
+
+    def _get_valid_reuse_factors(self, n_in, n_out):
+        key = (n_in, n_out)
+        valid_reuse_factors = self._valid_reuse_factors.get(key)
+        if valid_reuse_factors is None:
+            # A valid reuse factor divides n_in * n_out (see _validate_reuse_factor), so only the divisors are checked
+            valid_reuse_factors = tuple(
+                rf for rf in _get_divisors(n_in * n_out) if self._validate_reuse_factor(n_in, n_out, rf)
+            )
+            self._valid_reuse_factors[key] = valid_reuse_factors
         return valid_reuse_factors
 
     def _validate_reuse_factor(self, n_in, n_out, rf):
@@ -63,9 +63,11 @@ class VitisBackend(VivadoBackend):
         io_type='io_parallel',
         namespace=None,
         write_weights_txt=True,
+        weights_format='txt',
         write_tar=False,
         write_emulation_constants=False,
         tb_output_stream='both',
+        compile_units=1,
         **_,
     ):
         """Create initial configuration of the Vitis backend.
@@ -79,15 +81,22 @@ class VitisBackend(VivadoBackend):
             namespace (str, optional): If defined, place all generated code within a namespace. Defaults to None.
             write_weights_txt (bool, optional): If True, writes weights to .txt files which speeds up compilation.
                 Defaults to True.
+            weights_format (str, optional): Format of the weight files written with ``write_weights_txt``, 'txt' or 'bin'.
+                Binary files are faster to write and to load in the C simulation. Defaults to 'txt'.
             write_tar (bool, optional): If True, compresses the output directory into a .tar.gz file. Defaults to False.
             write_emulation_constants (bool, optional): If True, write constants to define.h useful for emulation.
                 Defaults to False.
             tb_output_stream (str, optional): Controls where to write the output. Options are 'stdout', 'file' and 'both'.
                 Defaults to 'both'.
+            compile_units (int, optional): Number of translation units the network is split into when compiling the C
+                simulation library, allowing them to be compiled in parallel and incrementally. Defaults to 1.
 
         Returns:
             dict: initial configuration.
         """
+        if weights_format not in ('txt', 'bin'):
+            raise Exception(f'Unsupported weights format "{weights_format}", expected "txt" or "bin"')
+
         config = {}
 
         config['Part'] = part if part is not None else 'xcvu13p-flga2577-2-e'
@@ -98,9 +107,11 @@ class VitisBackend(VivadoBackend):
         config['WriterConfig'] = {
             'Namespace': namespace,
             'WriteWeightsTxt': write_weights_txt,
+            'WeightsFormat': weights_format,
             'WriteTar': write_tar,
             'TBOutputStream': tb_output_stream,
             'WriteEmulationConstants': write_emulation_constants,
+            'CompileUnits': compile_units,
         }
 
         return config
@@ -1,4 +1,5 @@
 import json
+import time
 
 import h5py
 
@@ -10,73 +11,152 @@ class KerasReader:
         raise NotImplementedError
 
 
-class KerasFileReader(KerasReader):
-    def __init__(self, config):
-        self.config = config
-        self.h5file = h5py.File(config['KerasH5'], mode='r')
+class KerasH5Index:
+    """An open .h5 file of a Keras model, indexed for the lookup of weights.
 
-    def __del__(self):
-        if self.h5file:
-            self.h5file.close()
+    The file is opened once and the names of the objects under each group are collected in a single traversal, so
+    finding a variable of a layer doesn't traverse the file again. The index is shared by the readers of the file (e.g.,
+    of the nested models and wrapped layers), and the datasets are only read when their data is requested.
+
+    Args:
+        file_path (str): Path to the .h5 file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.h5file = h5py.File(file_path, mode='r')
+        self.opens = 1
+        self.readers = 0
+        self.datasets_read = 0
+        self.bytes_read = 0
+        self.read_time = 0.0
+
+        start = time.perf_counter()
+        # h5 file comes from model.save(), the weights of the layers are in the model_weights group
+        self.has_model_weights = 'model_weights' in self.h5file
+        root = 'model_weights' if self.has_model_weights else ''
+        root_depth = 1 if root else 0
+        # Path of each group -> names of the objects under it, relative to the group, in the order of h5py's visit()
+        self._members = {root: []}
 
-    def _find_data(self, layer_name, var_name):
         def h5_visitor_func(name):
-            if var_name in name:
-                return name
+            path = f'{root}/{name}' if root else name
+            self._members.setdefault(path, [])
+            parts = path.split('/')
+            for depth in range(root_depth, len(parts)):
+                self._members['/'.join(parts[:depth])].append('/'.join(parts[depth:]))
 
-        if 'model_weights' in list(self.h5file.keys()):  # h5 file comes from model.save()
-            layer_path = f'model_weights/{layer_name}'
-        else:
-            layer_path = layer_name
+        self.h5file[root or '/'].visit(h5_visitor_func)
+        self._found = {}
+        self.index_time = time.perf_counter() - start
 
-        data_path = self.h5file[layer_path].visit(h5_visitor_func)
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Close the file."""
+        h5file = getattr(self, 'h5file', None)
+        if h5file:
+            h5file.close()
+
+    def find_data(self, layer_path, var_name):
+        """Find the first object under the layer group whose name contains the name of the variable.
+
+        Args:
+            layer_path (str): Path of the group of the layer.
+            var_name (str): Name (or part of the name) of the variable.
+
+        Raises:
+            KeyError: If the group of the layer doesn't exist.
+
+        Returns:
+            h5py.Dataset: The dataset of the variable, or None if there is no such variable.
+        """
+        key = (layer_path, var_name)
+        if key not in self._found:
+            if layer_path not in self._members:
+                raise KeyError(f"Unable to open object (object '{layer_path}' doesn't exist)")
+            self._found[key] = next((name for name in self._members[layer_path] if var_name in name), None)
+
+        data_path = self._found[key]
         if data_path:
             return self.h5file[f'/{layer_path}/{data_path}']
         else:
             return None
 
+    def read(self, dataset):
+        """Read the data of a dataset."""
+        start = time.perf_counter()
+        data = dataset[()]
+        self.read_time += time.perf_counter() - start
+        self.datasets_read += 1
+        self.bytes_read += getattr(data, 'nbytes', 0)
+        return data
+
+    def stats(self):
+        """Statistics of the access to the file.
+
+        Returns:
+            dict: Number of times the file was opened and of currently open handles, number of readers sharing the
+            file, number of datasets and bytes read, and the time spent indexing the file and reading the data.
+        """
+        return {
+            'opens': self.opens,
+            'open_handles': 1 if self.h5file else 0,
+            'readers': self.readers,
+            'datasets_read': self.datasets_read,
+            'bytes_read': self.bytes_read,
+            'index_time': self.index_time,
+            'read_time': self.read_time,
+        }
+
+
+class KerasFileReader(KerasReader):
+    def __init__(self, config, h5_index=None):
+        self.config = config
+        self.h5_index = h5_index if h5_index is not None else KerasH5Index(config['KerasH5'])
+        self.h5_index.readers += 1
+
+    @property
+    def h5file(self):
+        return self.h5_index.h5file
+
+    def _find_data(self, layer_name, var_name):
+        if self.h5_index.has_model_weights:  # h5 file comes from model.save()
+            layer_path = f'model_weights/{layer_name}'
+        else:
+            layer_path = layer_name
+
+        return self.h5_index.find_data(layer_path, var_name)
+
     def get_weights_data(self, layer_name, var_name):
         data = self._find_data(layer_name, var_name)
         if data:
-            return data[()]
+            return self.h5_index.read(data)
         else:
             return None
 
+    def stats(self):
+        """Statistics of the access to the .h5 file, shared by all readers of the file (see ``KerasH5Index.stats()``)."""
+        return self.h5_index.stats()
+
 
 class KerasNestedFileReader(KerasFileReader):
     def __init__(self, data_reader, nested_path):
-        super().__init__(data_reader.config)
+        super().__init__(data_reader.config, h5_index=data_reader.h5_index)
         self.nested_path = nested_path
 
     def _find_data(self, layer_name, var_name):
-        def h5_visitor_func(name):
-            if var_name in name:
-                return name
-
-        layer_path = f'model_weights/{self.nested_path}/{layer_name}'
-
-        data_path = self.h5file[layer_path].visit(h5_visitor_func)
-        if data_path:
-            return self.h5file[f'/{layer_path}/{data_path}']
-        else:
-            return None
+        return self.h5_index.find_data(f'model_weights/{self.nested_path}/{layer_name}', var_name)
 
 
 class KerasWrappedLayerFileReader(KerasFileReader):
     def __init__(self, data_reader, layer_path):
-        super().__init__(data_reader.config)
+        super().__init__(data_reader.config, h5_index=data_reader.h5_index)
         self.layer_path = f'model_weights/{layer_path}'
 
     def _find_data(self, layer_name, var_name):
-        def h5_visitor_func(name):
-            if var_name in name:
-                return name
-
-        data_path = self.h5file[self.layer_path].visit(h5_visitor_func)
-        if data_path:
-            return self.h5file[f'/{self.layer_path}/{data_path}']
-        else:
-            return None
+        return self.h5_index.find_data(self.layer_path, var_name)
 
 
 class KerasModelReader(KerasReader):
@@ -53,9 +53,7 @@ def parse_resize_layer(node, input_names, input_shapes, graph):
     layer['algorithm'] = get_onnx_attribute(node, 'mode')
     # The following is used in initialize() method.
     # Probably a better solution would be to have a channels last parameter at QONNX level
-    layer['data_format'] = (
-        'channels_last' if any(node.domain == 'qonnx.custom_op.channels_last' for node in graph.node) else 'channels_first'
-    )
+    layer['data_format'] = 'channels_last' if 'qonnx.custom_op.channels_last' in graph.domains else 'channels_first'
 
     return layer
 
@@ -67,9 +65,7 @@ def parse_pad_layer(node, input_names, input_shapes, graph):
     layer['class_name'] = 'ZeroPadding'
     layer['inputs'] = input_names
     layer['outputs'] = list(node.output)
-    layer['data_format'] = (
-        'channels_last' if any(node.domain == 'qonnx.custom_op.channels_last' for node in graph.node) else 'channels_first'
-    )
+    layer['data_format'] = 'channels_last' if 'qonnx.custom_op.channels_last' in graph.domains else 'channels_first'
 
     mode = get_onnx_attribute(node, 'mode')
     if mode is not None and mode != 'constant':
@@ -31,11 +31,100 @@ def get_onnx_attribute(operation, name, default=None):
     return value
 
 
+class OnnxGraphIndex:
+    """Index of the tensors and nodes of an ONNX graph, built once at the start of the conversion.
+
+    Lookups of the shapes, initializers, producers and consumers of tensors by name are done in constant time, instead
+    of scanning the graph. Initializers are converted to NumPy arrays on first access and the arrays are cached.
+
+    The index is passed to the layer handlers in place of the graph, all other attributes (e.g., ``node``) are looked up
+    in the underlying graph.
+
+    Args:
+        graph: The ONNX graph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+        # When a name appears more than once, the first occurrence wins, as in a linear scan
+        self._inputs = {}
+        for x in graph.input:
+            self._inputs.setdefault(x.name, x)
+        # Regular variables take precedence over the outputs (possible if an output is intermediate) and global inputs
+        self._value_info = {}
+        for collection in (graph.value_info, graph.output, graph.input):
+            for x in collection:
+                self._value_info.setdefault(x.name, x)
+        self._initializers = {}
+        for x in graph.initializer:
+            self._initializers.setdefault(x.name, x)
+
+        self._producers = {}
+        self._consumers = {}
+        self.domains = set()
+        for node in graph.node:
+            self.domains.add(node.domain)
+            for out in node.output:
+                self._producers.setdefault(out, node)
+            for inp in node.input:
+                consumers = self._consumers.setdefault(inp, [])
+                if not consumers or consumers[-1] is not node:
+                    consumers.append(node)
+
+        self._constants = {}
+
+    def __getattr__(self, name):
+        if name == 'graph' or name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.graph, name)
+
+    @staticmethod
+    def _get_dims(value_info):
+        if value_info is None:
+            return None
+        return list(d.dim_value for d in value_info.type.tensor_type.shape.dim)
+
+    def get_shape(self, name):
+        """Return the shape of a tensor, or None if the tensor is not found."""
+        return self._get_dims(self._value_info.get(name))
+
+    def get_global_input_shape(self, name):
+        """Return the shape of a global input of the graph, or None if there is no such input."""
+        return self._get_dims(self._inputs.get(name))
+
+    def is_initializer(self, name):
+        """Return True if the tensor is an initializer of the graph."""
+        return name in self._initializers
+
+    def get_constant_value(self, name):
+        """Return the value of an initializer as a NumPy array, converting it on first access."""
+        if name not in self._constants:
+            from onnx import numpy_helper
+
+            if name not in self._initializers:
+                raise RuntimeError(f'Could not find the initializer {name}')
+            self._constants[name] = numpy_helper.to_array(self._initializers[name])
+        return self._constants[name]
+
+    def get_producer(self, name):
+        """Return the node producing a tensor, or None if the tensor is not produced by any node."""
+        return self._producers.get(name)
+
+    def get_consumers(self, name):
+        """Return the nodes taking a tensor as input, in graph order."""
+        return list(self._consumers.get(name, []))
+
+
+def _get_graph_index(graph):
+    return graph if isinstance(graph, OnnxGraphIndex) else OnnxGraphIndex(graph)
+
+
 def get_global_input_shape(graph, inp):
     """Return the global input shape of the graph with name inp
 
     Arguments:
-        graph:  the onnx graph
+        graph:  the onnx graph or its OnnxGraphIndex
         inp (str):  the global input name
 
     Returns:
@@ -44,46 +133,47 @@ def get_global_input_shape(graph, inp):
     Raises:
         StopIteration:  If the global input name is not found
     """
-    inp_shape = next(x.type.tensor_type.shape.dim for x in graph.input if x.name == inp)
-    return list(x.dim_value for x in inp_shape)
+    shape = _get_graph_index(graph).get_global_input_shape(inp)
+    if shape is None:
+        raise StopIteration(f'Could not find the global input {inp}')
+    return shape
 
 
 def get_input_shape(graph, node):
     """Return the input shapes of the node in the model
 
     Arguments:
-        graph:  the onnx graph
+        graph:  the onnx graph or its OnnxGraphIndex
         node:  the onnx node for which the input is desired
 
     Returns:
         list of lists: The shapes of all the inputs
 
     Raises:
-        StopIteration:  If the an input name is not found in the graph
+        RuntimeError:  If the an input name is not found in the graph
     """
+    index = _get_graph_index(graph)
     rv = []
     for inp in node.input:
-        # first try regular variables
-        vals = [x for x in graph.value_info if x.name == inp]
-        if not vals:
-            # then try outputs (possible if an output is intermediate)
-            vals = [x for x in graph.output if x.name == inp]
-        if not vals:
-            # then try global input.
-            vals = [x for x in graph.input if x.name == inp]
-        if not vals:
+        dim = index.get_shape(inp)
+        if dim is None:
             raise RuntimeError(f'Could not find the shape for input {inp}')
-        dim = list(d.dim_value for d in vals[0].type.tensor_type.shape.dim)
         if dim:
             rv.append(dim)
     return rv
 
 
 def get_constant_value(graph, constant_name):
-    tensor = next((x for x in graph.initializer if x.name == constant_name), None)
-    from onnx import numpy_helper
+    """Return the value of an initializer of the graph as a NumPy array
+
+    Arguments:
+        graph:  the onnx graph or its OnnxGraphIndex
+        constant_name (str):  the name of the initializer
 
-    return numpy_helper.to_array(tensor)
+    Returns:
+        ndarray: The value of the initializer
+    """
+    return _get_graph_index(graph).get_constant_value(constant_name)
 
 
 def compute_pads_1d(operation, layer):
@@ -165,7 +255,7 @@ def get_out_layer_name(graph):
     Get the output layer's name for the model.
     graph.output only returns the output's node index
     """
-    output_index_list = [x.name for x in graph.output]
+    output_index_list = {x.name for x in graph.output}
     return [node.name for node in graph.node if node.output[0] in output_index_list]
 
 
@@ -188,10 +278,13 @@ def parse_onnx_model(onnx_model):
 
     # We don't infer the shapes because the qonnx package preprocessing does it.
 
+    # Index the graph once, the handlers look up shapes and initializers by name in the index
+    graph = OnnxGraphIndex(onnx_model.graph)
+
     # Obtain list of input/ouput layers
     all_inputs = [x.name for x in onnx_model.graph.input]
     all_initializers = [x.name for x in onnx_model.graph.initializer]
-    input_layers = [x for x in all_inputs if x not in all_initializers]
+    input_layers = [x for x in all_inputs if not graph.is_initializer(x)]
     constant_layers = all_initializers  # no need to copy it even though we change it
     output_layers = get_out_layer_name(onnx_model.graph)
 
@@ -201,7 +294,7 @@ def parse_onnx_model(onnx_model):
         input_layer = {}
         input_layer['name'] = replace_char_inconsitency(inp)
         input_layer['class_name'] = 'InputLayer'
-        inp_shape = get_global_input_shape(onnx_model.graph, inp)
+        inp_shape = get_global_input_shape(graph, inp)
         # We only support ONNX where the first dimension is the batch dimension.
         # Remove the batch dimension in all subsequnt use
         input_layer['input_shape'] = inp_shape[1:]
@@ -213,11 +306,13 @@ def parse_onnx_model(onnx_model):
 
         layer_list.append(input_layer)
 
+    # Every initializer becomes a Constant layer, which needs its value to be initialized, so all initializers are
+    # converted here. The conversion is cached, so handlers asking for the same initializer don't convert it again.
     for i, constant in enumerate(constant_layers):
         constant_layer = {}
         constant_layer['name'] = replace_char_inconsitency(constant)
         constant_layer['class_name'] = 'Constant'
-        constant_layer['value'] = get_constant_value(onnx_model.graph, constant)
+        constant_layer['value'] = graph.get_constant_value(constant)
 
         # Clean the layer name for specific models
         sanitize_layer_name(constant_layer)
@@ -240,7 +335,7 @@ def parse_onnx_model(onnx_model):
 
         # Note that at this point, input shape still contains batch dimension
         # in cases where it appears. That is not filtered out till later.
-        input_shapes = get_input_shape(onnx_model.graph, node)
+        input_shapes = get_input_shape(graph, node)
 
         if node.op_type in skip_layers:
             # Currently supported skipped layers have only one input and output
@@ -255,7 +350,7 @@ def parse_onnx_model(onnx_model):
         input_names = [inputs_map.get(x, x) for x in node.input]
 
         # Process the layer
-        layer = layer_handlers[node.op_type](node, input_names, input_shapes, onnx_model.graph)
+        layer = layer_handlers[node.op_type](node, input_names, input_shapes, graph)
 
         sanitize_layer_name(layer)
         print(f'Layer name: {layer["name"]}, layer type: {layer["class_name"]}, current shape: {input_shapes}')
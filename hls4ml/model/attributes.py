@@ -154,12 +154,15 @@ class AttributeDict(MutableMapping):
     such as registering variables or modifying the key name to ensure it follows the convention.
 
     Specific "views" (mappings) of this class can be used to filter desired attributes via the ``AttributeMapping`` class.
+    The keys of the attributes of each class filtered by a view are indexed on first use and kept up to date as attributes
+    are set or deleted, so the views don't need to scan all attributes.
     """
 
     def __init__(self, layer):
         self.layer = layer
         self.attributes = {}
         self._expected_attributes = [a.name for a in self.layer.expected_attributes]
+        self._class_keys = {}  # Keys of the attributes of a given class, in insertion order
 
     def __getitem__(self, key):
         return self.attributes[key]
@@ -168,21 +171,62 @@ class AttributeDict(MutableMapping):
         return len(self.attributes)
 
     def __iter__(self):
-        yield from self.attributes.keys()
+        return iter(self.attributes)
 
     def __setitem__(self, key, value):
         if isinstance(value, TensorVariable):
             self.layer.model.register_output_variable(key, value)
-            self.attributes['result_t'] = value.type
+            self._store('result_t', value.type)
             if key in self._expected_attributes and key in self.layer.outputs:
                 key = '__hls4ml_reserved_out_' + key
         elif isinstance(value, WeightVariable):
-            self.attributes[key + '_t'] = value.type
+            self._store(key + '_t', value.type)
 
-        self.attributes[key] = value
+        self._store(key, value)
+        self._touch_layer()
 
     def __delitem__(self, key):
         del self.attributes[key]
+        for keys in self._class_keys.values():
+            keys.pop(key, None)
+        self._touch_layer()
+
+    def _touch_layer(self):
+        # Changed attributes may change the match of optimizer passes on the layer, see optimize_model()
+        touch_nodes = getattr(getattr(self.layer, 'model', None), '_touch_nodes', None)
+        if touch_nodes is not None:
+            touch_nodes(self.layer)
+
+    def _store(self, key, value):
+        replaced = key in self.attributes
+        self.attributes[key] = value
+        stale = []
+        for clazz, keys in self._class_keys.items():
+            if isinstance(value, clazz):
+                if key in keys:
+                    continue
+                if replaced:
+                    stale.append(clazz)  # The key keeps its position in the attributes, so re-index on next use
+                else:
+                    keys[key] = None
+            elif key in keys:
+                del keys[key]
+        for clazz in stale:
+            del self._class_keys[clazz]
+
+    def get_class_keys(self, clazz):
+        """Get the keys of the attributes whose values are instances of the given class.
+
+        Args:
+            clazz (type): The class of the values.
+
+        Returns:
+            dict_keys: The keys, in insertion order. The returned view is only valid until the attributes are modified.
+        """
+        keys = self._class_keys.get(clazz)
+        if keys is None:
+            keys = self._class_keys[clazz] = dict.fromkeys(k for k, v in self.attributes.items() if isinstance(v, clazz))
+        return keys.keys()
 
 
 class AttributeMapping(MutableMapping):
@@ -198,11 +242,10 @@ class AttributeMapping(MutableMapping):
         return self.attributes[key]
 
     def __len__(self):
-        return sum(map(lambda x: isinstance(x, self.clazz), self.attributes.values()))
+        return len(self.attributes.get_class_keys(self.clazz))
 
     def __iter__(self):
-        precision_keys = [k for k, v in self.attributes.items() if isinstance(v, self.clazz)]
-        yield from precision_keys
+        return iter(list(self.attributes.get_class_keys(self.clazz)))
 
     def __setitem__(self, key, value):
         self.attributes[key] = value
@@ -235,13 +278,12 @@ class VariableMapping(AttributeMapping):
             return self.attributes[key]
 
     def __iter__(self):
-        precision_keys = [k for k, v in self.attributes.items() if isinstance(v, self.clazz)]
-        for key in precision_keys:
+        variable_keys = list(self.attributes.get_class_keys(self.clazz))
+        for key in variable_keys:
             if key.startswith('__hls4ml_reserved_out_'):
                 yield key[len('__hls4ml_reserved_out_') :]
             else:
                 yield key
-        super().__iter__()
 
 
 class TypeMapping(AttributeMapping):
@@ -127,7 +127,16 @@ def update_flow(flow_name, add_optimizers=None, remove_optimizers=None):
             flow._remove_optimizer(opt)
 
 
+def _init_lazy_backends(name=None):
+    # Flows of the backends are registered when the backend is first used
+    from hls4ml.backends.backend import init_lazy_backends
+
+    init_lazy_backends(name)
+
+
 def get_flow(name):
+    if name not in flow_map:
+        _init_lazy_backends(name)
     if name in flow_map:
         return flow_map[name]
     else:
@@ -135,8 +144,10 @@ def get_flow(name):
 
 
 def get_backend_flows(backend):
+    _init_lazy_backends(backend.lower() + ':')
     return [flow for flow in flow_map.keys() if flow.startswith(backend.lower() + ':')]
 
 
 def get_available_flows():
+    _init_lazy_backends()
     return list(flow_map.keys())
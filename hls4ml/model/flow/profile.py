@@ -0,0 +1,255 @@
+import json
+import time
+
+
+class PassProfile:
+    """Statistics of the application of an optimizer pass within a flow.
+
+    Args:
+        name (str): Name of the optimizer pass.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.time = 0.0
+        self.matches = 0
+        self.transforms = 0
+        self.nodes_before = None
+        self.nodes_after = None
+        self.spans = []  # (start, duration) of each consecutive run of the pass
+
+    def start(self, n_nodes):
+        """Mark the start of a run of the pass.
+
+        Args:
+            n_nodes (int): Number of nodes in the model graph.
+
+        Returns:
+            float: The start time of the run.
+        """
+        if self.nodes_before is None:
+            self.nodes_before = n_nodes
+        return time.perf_counter()
+
+    def stop(self, start, n_nodes, matches, transforms):
+        """Mark the end of a run of the pass.
+
+        Args:
+            start (float): Start time of the run, as returned by ``start()``.
+            n_nodes (int): Number of nodes in the model graph.
+            matches (int): Number of calls to ``match()`` during the run.
+            transforms (int): Number of calls to ``transform()`` during the run.
+        """
+        duration = time.perf_counter() - start
+        self.time += duration
+        self.matches += matches
+        self.transforms += transforms
+        self.nodes_after = n_nodes
+        if matches > 0 or transforms > 0:
+            self.spans.append((start, duration))
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'time': self.time,
+            'matches': self.matches,
+            'transforms': self.transforms,
+            'nodes_before': self.nodes_before,
+            'nodes_after': self.nodes_after,
+        }
+
+
+class FlowProfile:
+    """Statistics of a single application of a flow.
+
+    Args:
+        name (str): Name of the flow.
+        n_nodes (int): Number of nodes in the model graph before the flow is applied.
+    """
+
+    def __init__(self, name, n_nodes):
+        self.name = name
+        self.start = time.perf_counter()
+        self.time = None
+        self.self_time = 0.0
+        self.nodes_before = n_nodes
+        self.nodes_after = None
+        self.passes = {}
+
+    def get_pass(self, pass_name):
+        """Get the statistics of an optimizer pass, creating them if needed.
+
+        Args:
+            pass_name (str): Name of the optimizer pass.
+
+        Returns:
+            PassProfile: The statistics of the pass.
+        """
+        pass_profile = self.passes.get(pass_name)
+        if pass_profile is None:
+            pass_profile = self.passes[pass_name] = PassProfile(pass_name)
+        return pass_profile
+
+    def finish(self, n_nodes, self_time):
+        self.time = time.perf_counter() - self.start
+        self.self_time = self_time
+        self.nodes_after = n_nodes
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'time': self.time,
+            'self_time': self.self_time,
+            'nodes_before': self.nodes_before,
+            'nodes_after': self.nodes_after,
+            'passes': [pass_profile.to_dict() for pass_profile in self.passes.values()],
+        }
+
+
+class FlowProfiler:
+    """Records the time spent in the flows applied to a model graph, and in each of their optimizer passes.
+
+    For every applied flow, the profiler records the wall time (both in total and excluding the required flows), the size
+    of the model graph before and after, and, for each of the optimizer passes of the flow, the wall time, the number of
+    calls to ``match()`` and ``transform()`` and the size of the model graph before and after the pass.
+
+    The profiler of a model graph is available as ``ModelGraph.flow_profiler``.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.flows = []
+        self._origin = time.perf_counter()
+
+    def start_flow(self, flow_name, n_nodes):
+        """Start recording the application of a flow.
+
+        Args:
+            flow_name (str): Name of the flow.
+            n_nodes (int): Number of nodes in the model graph.
+
+        Returns:
+            FlowProfile: The statistics of the flow, or None if the profiler is disabled.
+        """
+        if not self.enabled:
+            return None
+        flow_profile = FlowProfile(flow_name, n_nodes)
+        self.flows.append(flow_profile)
+        return flow_profile
+
+    def clear(self):
+        """Remove all the recorded statistics."""
+        self.flows = []
+
+    def report(self):
+        """Get the recorded statistics of all applied flows, in the order in which the flows were started.
+
+        Returns:
+            list: A list of dictionaries with the statistics of each flow. The statistics of the optimizer passes are in the
+            list under the ``'passes'`` key. Times are given in seconds.
+        """
+        return [flow_profile.to_dict() for flow_profile in self.flows]
+
+    def pass_summary(self):
+        """Get the statistics of the optimizer passes, summed over all applied flows.
+
+        Returns:
+            list: A list of dictionaries with the total time and number of ``match()`` and ``transform()`` calls of each
+            pass, sorted by decreasing time.
+        """
+        summary = {}
+        for flow_profile in self.flows:
+            for pass_profile in flow_profile.passes.values():
+                pass_summary = summary.setdefault(
+                    pass_profile.name, {'name': pass_profile.name, 'time': 0.0, 'matches': 0, 'transforms': 0}
+                )
+                pass_summary['time'] += pass_profile.time
+                pass_summary['matches'] += pass_profile.matches
+                pass_summary['transforms'] += pass_profile.transforms
+
+        return sorted(summary.values(), key=lambda pass_summary: pass_summary['time'], reverse=True)
+
+    def print_report(self, top=20):
+        """Print the optimizer passes taking the most time.
+
+        Args:
+            top (int, optional): Number of passes to print. If None, all passes are printed. Defaults to 20.
+        """
+        summary = self.pass_summary()[:top]
+        total_time = sum(flow_profile.self_time for flow_profile in self.flows)
+        width = max([len('Pass')] + [len(pass_summary['name']) for pass_summary in summary])
+        print(f'Applied {len(self.flows)} flows in {total_time:.3f} s')
+        print(f'{"Pass":<{width}} {"Time [s]":>10} {"Matches":>10} {"Transforms":>10}')
+        for pass_summary in summary:
+            print(
+                f'{pass_summary["name"]:<{width}} {pass_summary["time"]:>10.4f} '
+                f'{pass_summary["matches"]:>10} {pass_summary["transforms"]:>10}'
+            )
+
+    def to_json(self, file_path=None):
+        """Export the recorded statistics to JSON.
+
+        Args:
+            file_path (str, optional): Path of the file to write. If None, the JSON string is returned instead.
+
+        Returns:
+            str: The JSON string, if ``file_path`` is None.
+        """
+        report = self.report()
+        if file_path is None:
+            return json.dumps(report, indent=2)
+        with open(file_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    def to_chrome_trace(self, file_path=None):
+        """Export the recorded statistics in the Chrome trace event format.
+
+        The resulting file can be opened with ``chrome://tracing`` or Perfetto. Each flow is shown as a slice, with the
+        runs of its optimizer passes nested inside. The arguments of the slices hold the statistics of the flow or pass.
+
+        Args:
+            file_path (str, optional): Path of the file to write. If None, the trace is returned instead.
+
+        Returns:
+            dict: The trace, if ``file_path`` is None.
+        """
+
+        def to_us(t):
+            return (t - self._origin) * 1e6
+
+        events = []
+        for flow_profile in self.flows:
+            flow_dict = flow_profile.to_dict()
+            flow_dict.pop('passes')
+            events.append(
+                {
+                    'name': flow_profile.name,
+                    'cat': 'flow',
+                    'ph': 'X',
+                    'ts': to_us(flow_profile.start),
+                    'dur': (flow_profile.time or 0.0) * 1e6,
+                    'pid': 0,
+                    'tid': 0,
+                    'args': flow_dict,
+                }
+            )
+            for pass_profile in flow_profile.passes.values():
+                for start, duration in pass_profile.spans:
+                    events.append(
+                        {
+                            'name': pass_profile.name,
+                            'cat': 'pass',
+                            'ph': 'X',
+                            'ts': to_us(start),
+                            'dur': duration * 1e6,
+                            'pid': 0,
+                            'tid': 0,
+                            'args': {'flow': flow_profile.name, **pass_profile.to_dict()},
+                        }
+                    )
+
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if file_path is None:
+            return trace
+        with open(file_path, 'w') as f:
+            json.dump(trace, f)
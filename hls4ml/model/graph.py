@@ -5,21 +5,42 @@ import importlib.util
 import os
 import platform
 import shutil
+import subprocess
+import tempfile
 import threading
+import time
 import uuid
 from collections import OrderedDict
+from collections.abc import ItemsView, KeysView, MutableMapping, ValuesView
 
 import numpy as np
 import numpy.ctypeslib as npc
 
 from hls4ml.backends import get_backend
-from hls4ml.model.flow import get_flow
+from hls4ml.model.flow import FlowProfiler, get_flow
 from hls4ml.model.layers import Layer, layer_map
 from hls4ml.model.optimizer import get_available_passes, optimize_model
 from hls4ml.model.types import Serializable
 from hls4ml.utils.string_utils import convert_to_snake_case
 
 
+def _dlclose(lib):
+    if platform.system() == 'Linux':
+        libdl_libs = ['libdl.so', 'libdl.so.2']
+        for libdl in libdl_libs:
+            try:
+                dlclose_func = ctypes.CDLL(libdl).dlclose
+                break
+            except Exception:
+                continue
+    elif platform.system() == 'Darwin':
+        dlclose_func = ctypes.CDLL('libc.dylib').dlclose
+
+    dlclose_func.argtypes = [ctypes.c_void_p]
+    dlclose_func.restype = ctypes.c_int
+    dlclose_func(lib._handle)
+
+
 class HLSConfig(Serializable):
     """The configuration class as stored in the ModelGraph.
 
@@ -398,6 +419,248 @@ class HLSConfig(Serializable):
         return config
 
 
+class _NodeKeysView(KeysView):
+    def __iter__(self):
+        return (name for name, _ in self._mapping._get_order())
+
+    def __reversed__(self):
+        return (name for name, _ in reversed(self._mapping._get_order()))
+
+
+class _NodeValuesView(ValuesView):
+    def __iter__(self):
+        return (node for _, node in self._mapping._get_order())
+
+    def __reversed__(self):
+        return (node for _, node in reversed(self._mapping._get_order()))
+
+
+class _NodeItemsView(ItemsView):
+    def __iter__(self):
+        return iter(self._mapping._get_order())
+
+    def __reversed__(self):
+        return reversed(self._mapping._get_order())
+
+
+class NodeDict(MutableMapping):
+    """Ordered container of the nodes of a model graph, indexed by the tensors they produce and consume.
+
+    Behaves like an ``OrderedDict`` mapping the node names to the nodes, with the addition of ``insert_after()`` and
+    ``replace()`` to splice nodes into the sequence in constant time. The index of the producer and consumers of every
+    tensor is updated as nodes are added or removed, and when the inputs or outputs of a node in the container change.
+    Iteration goes over a snapshot of the sequence, taken on first use after a change.
+
+    Args:
+        nodes (dict, optional): Initial nodes, in order. Defaults to None.
+    """
+
+    _rank_gap = 2**32
+
+    def __init__(self, nodes=None):
+        self._nodes = {}
+        self._prev = {}
+        self._next = {}
+        self._first = None
+        self._last = None
+        self._rank = {}  # Increasing along the sequence, to sort nodes in graph order
+        self._producers = {}
+        self._consumers = {}
+        self._indexed = {}  # The tensors each node is indexed under
+        self._order = None  # Cached sequence of (name, node), as iterating over the linked list is slow
+        if nodes is not None:
+            for name, node in nodes.items():
+                self[name] = node
+
+    def __getitem__(self, name):
+        return self._nodes[name]
+
+    def __setitem__(self, name, node):
+        if name in self._nodes:
+            self._unindex(self._nodes[name])
+            self._nodes[name] = node
+            self._index(name, node)
+            self._order = None
+        else:
+            self._link(name, node, self._last)
+
+    def __delitem__(self, name):
+        node = self._nodes.pop(name)
+        self._unindex(node)
+        self._order = None
+        prev_name = self._prev.pop(name)
+        next_name = self._next.pop(name)
+        del self._rank[name]
+        if prev_name is None:
+            self._first = next_name
+        else:
+            self._next[prev_name] = next_name
+        if next_name is None:
+            self._last = prev_name
+        else:
+            self._prev[next_name] = prev_name
+
+    def _walk(self):
+        name = self._first
+        while name is not None:
+            yield name
+            name = self._next[name]
+
+    def _get_order(self):
+        if self._order is None:
+            self._order = [(name, self._nodes[name]) for name in self._walk()]
+        return self._order
+
+    def __iter__(self):
+        return (name for name, _ in self._get_order())
+
+    def __reversed__(self):
+        return (name for name, _ in reversed(self._get_order()))
+
+    def keys(self):
+        return _NodeKeysView(self)
+
+    def values(self):
+        return _NodeValuesView(self)
+
+    def items(self):
+        return _NodeItemsView(self)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, name):
+        return name in self._nodes
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self.items())!r})'
+
+    def _link(self, name, node, prev_name):
+        next_name = self._first if prev_name is None else self._next[prev_name]
+        prev_rank = self._rank[prev_name] if prev_name is not None else 0
+        if next_name is None:
+            rank = prev_rank + self._rank_gap
+        else:
+            rank = (prev_rank + self._rank[next_name]) // 2
+            if rank == prev_rank:
+                self._renumber()
+                prev_rank = self._rank[prev_name] if prev_name is not None else 0
+                rank = prev_rank + self._rank_gap // 2
+
+        self._nodes[name] = node
+        self._order = None
+        self._rank[name] = rank
+        self._prev[name] = prev_name
+        self._next[name] = next_name
+        if prev_name is None:
+            self._first = name
+        else:
+            self._next[prev_name] = name
+        if next_name is None:
+            self._last = name
+        else:
+            self._prev[next_name] = name
+        self._index(name, node)
+
+    def _renumber(self):
+        for i, name in enumerate(self._walk(), start=1):
+            self._rank[name] = i * self._rank_gap
+
+    def insert_after(self, prev_name, name, node):
+        """Insert a node right after another one.
+
+        Args:
+            prev_name (str): Name of the node after which to insert. If None, the node is inserted first.
+            name (str): Name of the new node.
+            node (Layer): The new node.
+        """
+        if name in self._nodes:
+            raise Exception(f'Node {name} already exists in the graph.')
+        if prev_name is not None and prev_name not in self._nodes:
+            raise KeyError(prev_name)
+        self._link(name, node, prev_name)
+
+    def replace(self, old_name, name, node):
+        """Replace a node with another one (possibly with a different name) at the same position.
+
+        Args:
+            old_name (str): Name of the node to replace.
+            name (str): Name of the new node.
+            node (Layer): The new node.
+        """
+        if name != old_name and name in self._nodes:
+            raise Exception(f'Node {name} already exists in the graph.')
+        prev_name = self._prev[old_name]
+        del self[old_name]
+        self._link(name, node, prev_name)
+
+    def _index(self, name, node):
+        inputs = tuple(dict.fromkeys(getattr(node, 'inputs', None) or ()))
+        outputs = tuple(dict.fromkeys(getattr(node, 'outputs', None) or ()))
+        self._indexed[node] = (name, inputs, outputs)
+        node_dicts = getattr(node, '_node_dicts', None)
+        if node_dicts is not None:
+            node_dicts[id(self)] = self
+        for inp_name in inputs:
+            self._consumers.setdefault(inp_name, []).append(node)
+        for out_name in outputs:
+            self._producers.setdefault(out_name, []).append(node)
+
+    def _unindex(self, node):
+        _, inputs, outputs = self._indexed.pop(node)
+        node_dicts = getattr(node, '_node_dicts', None)
+        if node_dicts is not None:
+            node_dicts.pop(id(self), None)
+        for tensor_map, tensor_names in ((self._consumers, inputs), (self._producers, outputs)):
+            for tensor_name in tensor_names:
+                tensor_nodes = tensor_map[tensor_name]
+                tensor_nodes[:] = [n for n in tensor_nodes if n is not node]
+                if not tensor_nodes:
+                    del tensor_map[tensor_name]
+
+    def update_index(self, node):
+        """Update the index after the inputs or outputs of a node have changed.
+
+        Args:
+            node (Layer): The node that changed. Ignored if not in the container.
+        """
+        if node in self._indexed:
+            name = self._indexed[node][0]
+            self._unindex(node)
+            self._index(name, node)
+
+    def _in_order(self, nodes):
+        if len(nodes) > 1:
+            return sorted(nodes, key=lambda node: self._rank[self._indexed[node][0]])
+        return list(nodes)
+
+    def get_producer(self, tensor_name):
+        """The node producing the given tensor, or None if the tensor is not produced by any node."""
+        producers = self._producers.get(tensor_name)
+        if not producers:
+            return None
+        return self._in_order(producers)[0]
+
+    def get_consumers(self, tensor_name):
+        """The nodes taking the given tensor as input, in graph order."""
+        return self._in_order(self._consumers.get(tensor_name, ()))
+
+    def get_consumers_of(self, tensor_names):
+        """The nodes taking any of the given tensors as input, in graph order."""
+        nodes = {}
+        for tensor_name in tensor_names:
+            nodes.update(dict.fromkeys(self._consumers.get(tensor_name, ())))
+        return self._in_order(nodes)
+
+    def get_tensor_nodes(self, tensor_names):
+        """The nodes producing or consuming any of the given tensors, in graph order."""
+        nodes = {}
+        for tensor_name in tensor_names:
+            nodes.update(dict.fromkeys(self._producers.get(tensor_name, ())))
+            nodes.update(dict.fromkeys(self._consumers.get(tensor_name, ())))
+        return self._in_order(nodes)
+
+
 class ModelGraph(Serializable):
     """The ModelGraph represents the network that is being processed by hls4ml.
 
@@ -417,6 +680,17 @@ class ModelGraph(Serializable):
         self.index = initial_index
         self.output_vars = {}
         self._top_function_lib = None
+        self._worker_libs = []
+        self._touched_nodes = None  # nodes touched by graph changes, tracked while optimizing
+        self.flow_profiler = FlowProfiler()
+
+    @property
+    def graph(self):
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph):
+        self._graph = graph if isinstance(graph, NodeDict) else NodeDict(graph)
 
     @classmethod
     def from_layer_list(cls, config_dict, layer_list, inputs=None, outputs=None, initial_index=0):
@@ -522,16 +796,46 @@ class ModelGraph(Serializable):
         if flow_name in applied_flows:
             return
         flow = get_flow(flow_name)
+        flow_profile = self.flow_profiler.start_flow(flow.name, len(self.graph))
 
         for sub_flow in flow.requires:
             if sub_flow not in applied_flows.keys():
                 self._apply_sub_flow(sub_flow, applied_flows)
 
+        optimize_start = time.perf_counter()
         if len(flow.optimizers) > 0:
-            applied_passes = optimize_model(self, flow.optimizers)
+            applied_passes = optimize_model(self, flow.optimizers, profile=flow_profile)
         else:
             applied_passes = set()
         applied_flows[flow.name] = applied_passes
+        if flow_profile is not None:
+            flow_profile.finish(len(self.graph), time.perf_counter() - optimize_start)
+
+    def _touch_nodes(self, *nodes):
+        if getattr(self, '_touched_nodes', None) is not None:
+            self._touched_nodes.update(node for node in nodes if node is not None)
+
+    def get_producer(self, tensor_name):
+        """Get the node producing a tensor.
+
+        Args:
+            tensor_name (str): Name of the tensor.
+
+        Returns:
+            Layer: The node with the tensor among its outputs, or None if there is no such node in the graph.
+        """
+        return self.graph.get_producer(tensor_name)
+
+    def get_consumers(self, tensor_name):
+        """Get the nodes consuming a tensor.
+
+        Args:
+            tensor_name (str): Name of the tensor.
+
+        Returns:
+            list: The nodes with the tensor among their inputs, in graph order.
+        """
+        return self.graph.get_consumers(tensor_name)
 
     def make_node(self, kind, name, attributes, inputs, outputs=None, initialize=True):
         """Make a new node not connected to the model graph.
@@ -597,14 +901,10 @@ class ModelGraph(Serializable):
             raise Exception('Cannot insert a node with more than one input (for now).')
 
         prev_node = node.get_input_node(node.inputs[0])
-        next_nodes = []
-        for x in self.graph.values():
-            overlap = [value for value in x.inputs if value in prev_node.outputs]
-            if overlap:
-                next_nodes.append(x)
+        next_nodes = self.graph.get_consumers_of(prev_node.outputs)
 
         if before is None:
-            next_node = next((x for x in self.graph.values() if x.inputs and x.inputs[0] in prev_node.outputs), None)
+            next_node = next((x for x in next_nodes if x.inputs and x.inputs[0] in prev_node.outputs), None)
         else:
             if before not in next_nodes:
                 raise Exception(
@@ -614,18 +914,14 @@ class ModelGraph(Serializable):
                 )
             next_node = before
 
+        self._touch_nodes(node, prev_node, *next_nodes)
+
         if next_node is not None:
             next_node.inputs[input_idx] = node.outputs[0]
         else:
             self.outputs = [node.outputs[0] if name == prev_node.outputs[0] else name for name in self.outputs]
 
-        new_graph = OrderedDict()
-        for k, v in self.graph.items():
-            new_graph[k] = v
-            if k == prev_node.name:
-                new_graph[node.name] = node
-
-        self.graph = new_graph
+        self.graph.insert_after(prev_node.name, node.name, node)
 
     def remove_node(self, node):
         """Removes a node from the graph.
@@ -663,13 +959,15 @@ class ModelGraph(Serializable):
                 f'Input and output shapes do not match for {node.name}: {inp_var.shape} -> {out_var.shape}'
             # fmt: on
 
-            next_nodes = [x for x in self.graph.values() if node.outputs[0] in x.inputs]
+            next_nodes = self.get_consumers(node.outputs[0])
+            self._touch_nodes(node, node.get_input_node(inputs[0]), *next_nodes)
             for next_node in next_nodes:
                 # Connect inputs -> next
                 for i, nxt_inp in enumerate(next_node.inputs):
                     if outputs[0] == nxt_inp:
                         next_node.inputs[i] = inputs[0]
 
+        self._touch_nodes(node)
         del self.output_vars[node.outputs[0]]
         del self.graph[node.name]
 
@@ -697,15 +995,18 @@ class ModelGraph(Serializable):
                 new_output = repl[old_output]
                 self.outputs = [new_output if name == old_output else name for name in self.outputs]
 
-        for node in self.graph.values():
+        for node in self.graph.get_tensor_nodes(repl):
             for i, n in enumerate(node.inputs):
                 if n in repl:
                     node.inputs[i] = repl[n]
+                    self._touch_nodes(node)
             for i, n in enumerate(node.outputs):
                 if n in repl:
                     node.outputs[i] = repl[n]
+                    self._touch_nodes(node)
 
-        self.graph = OrderedDict((new_node.name, new_node) if k == old_node.name else (k, v) for k, v in self.graph.items())
+        self._touch_nodes(old_node, new_node)
+        self.graph.replace(old_node.name, new_node.name, new_node)
 
     def split_node(self, old_node, new_node1, new_node2):
         """Replace an existing node in the graph with two nodes in sequence.
@@ -732,22 +1033,19 @@ class ModelGraph(Serializable):
                 new_output = repl[old_output]
                 self.outputs = [new_output if name == old_output else name for name in self.outputs]
 
-        for node in self.graph.values():
+        for node in self.graph.get_tensor_nodes(repl):
             for i, n in enumerate(node.inputs):
                 if n in repl:
                     node.inputs[i] = repl[n]
+                    self._touch_nodes(node)
             for i, n in enumerate(node.outputs):
                 if n in repl:
                     node.outputs[i] = repl[n]
+                    self._touch_nodes(node)
 
-        new_graph = OrderedDict()
-        for key, value in self.graph.items():
-            if key == old_node.name:
-                new_graph[new_node1.name] = new_node1
-                new_graph[new_node2.name] = new_node2
-            else:
-                new_graph[key] = value
-        self.graph = new_graph
+        self._touch_nodes(old_node, new_node1, new_node2)
+        self.graph.replace(old_node.name, new_node1.name, new_node1)
+        self.graph.insert_after(new_node1.name, new_node2.name, new_node2)
 
     def next_layer(self):
         self.index += 1
@@ -803,23 +1101,37 @@ class ModelGraph(Serializable):
 
     def _compile(self):
         lib_name = self.config.backend.compile(self)
+        for worker_lib in self._worker_libs:
+            _dlclose(worker_lib)
+        self._worker_libs = []
         if self._top_function_lib is not None:
-            if platform.system() == 'Linux':
-                libdl_libs = ['libdl.so', 'libdl.so.2']
-                for libdl in libdl_libs:
-                    try:
-                        dlclose_func = ctypes.CDLL(libdl).dlclose
-                        break
-                    except Exception:
-                        continue
-            elif platform.system() == 'Darwin':
-                dlclose_func = ctypes.CDLL('libc.dylib').dlclose
-
-            dlclose_func.argtypes = [ctypes.c_void_p]
-            dlclose_func.restype = ctypes.c_int
-            dlclose_func(self._top_function_lib._handle)
+            _dlclose(self._top_function_lib)
         self._top_function_lib = ctypes.cdll.LoadLibrary(lib_name)
 
+    def _get_worker_libs(self, n_workers):
+        """Get independent handles of the compiled library, one for each worker thread.
+
+        The generated code keeps global state (weights loaded on the first call, static buffers of some layers, trace
+        storage), so calling the same library from multiple threads is not safe. Instead, each additional worker loads a
+        private copy of the library, with its own copy of the global state. The copies are kept until the next compile.
+
+        Args:
+            n_workers (int): Number of workers.
+
+        Returns:
+            list: Library handles, the first being the one loaded by `compile()`.
+        """
+        if len(self._worker_libs) < n_workers - 1:
+            lib_path = self._top_function_lib._name
+            # The dynamic loader returns the already loaded library for the same path, hence the copies
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                for i in range(len(self._worker_libs), n_workers - 1):
+                    worker_lib_path = os.path.join(tmp_dir, f'worker{i}_{os.path.basename(lib_path)}')
+                    shutil.copyfile(lib_path, worker_lib_path)
+                    self._worker_libs.append(ctypes.cdll.LoadLibrary(worker_lib_path))
+
+        return [self._top_function_lib] + self._worker_libs[: n_workers - 1]
+
     def _get_top_function(self, x):
         if self._top_function_lib is None:
             raise Exception('Model not compiled')
@@ -854,6 +1166,28 @@ class ModelGraph(Serializable):
 
         return top_function, ctype
 
+    def _get_batch_function(self, ctype, lib=None):
+        if lib is None:
+            lib = self._top_function_lib
+        if ctype == ctypes.c_float:
+            dtype = 'float'
+        else:
+            dtype = 'double'
+        try:
+            batch_function = getattr(lib, f'{self.config.get_project_name()}_batch_{dtype}')
+        except AttributeError:
+            # Libraries built with an older version of the bridge don't export the batched entry point
+            return None
+
+        n_inputs = len(self.get_input_variables())
+        n_outputs = len(self.get_output_variables())
+
+        batch_function.restype = None
+        batch_function.argtypes = [npc.ndpointer(ctype, flags='C_CONTIGUOUS') for i in range(n_inputs + n_outputs)]
+        batch_function.argtypes += [ctypes.c_size_t]
+
+        return batch_function
+
     def _compute_n_samples(self, x):
         if len(self.get_input_variables()) == 1:
             xlist = [x]
@@ -873,31 +1207,117 @@ class ModelGraph(Serializable):
 
         return int(n_sample)
 
-    def _predict(self, x):
+    def _predict_chunks(self, x, n_workers=1, chunk_size=None, out=None):
+        """Run the C simulation of the model, one chunk of samples at a time.
+
+        Only the inputs of the current chunk are read, so memory-mapped inputs are never loaded as a whole.
+
+        Args:
+            x (np.ndarray or list): Input data, a list of arrays for models with multiple inputs.
+            n_workers (int, optional): Number of threads each chunk is split across. Defaults to 1.
+            chunk_size (int, optional): Number of samples per chunk. Defaults to None (the whole batch).
+            out (list, optional): Arrays of shape (n_samples, output_size), one for each output, the outputs are
+                written to. Defaults to None, in which case new arrays are allocated for each chunk.
+
+        Yields:
+            tuple: The start and stop index of the chunk and the list of arrays holding its outputs.
+        """
         top_function, ctype = self._get_top_function(x)
         n_samples = self._compute_n_samples(x)
         n_inputs = len(self.get_input_variables())
-        n_outputs = len(self.get_output_variables())
+        dtype = np.dtype(ctype)
 
-        output = []
-        if n_samples == 1 and n_inputs == 1:
-            x = [x]
+        if n_inputs == 1:
+            inp = [x]
+        else:
+            inp = x
+        # Views of the (contiguous) inputs, nothing is read yet
+        inp = [np.ascontiguousarray(xj).reshape(n_samples, -1) for xj in inp]
+        out_sizes = [yj.size() for yj in self.get_output_variables()]
+
+        if chunk_size is None:
+            chunk_size = n_samples
+        chunk_size = max(int(chunk_size), 1)
+
+        batch_function = self._get_batch_function(ctype)
+        n_workers = max(min(n_workers, chunk_size, n_samples), 1)
+        if batch_function is not None and n_workers > 1:
+            batch_functions = [self._get_batch_function(ctype, lib) for lib in self._get_worker_libs(n_workers)]
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=n_workers)
+        else:
+            executor = None
 
-        for i in range(n_samples):
-            predictions = [np.zeros(yj.size(), dtype=ctype) for yj in self.get_output_variables()]
-            if n_inputs == 1:
-                inp = [np.asarray(x[i])]
-            else:
-                inp = [np.asarray(xj[i]) for xj in x]
-            inp = [np.ascontiguousarray(_inp) for _inp in inp]
+        def predict_chunk(chunk_function, inp_chunk, out_chunk):
+            chunk_function(*inp_chunk, *out_chunk, len(inp_chunk[0]))
 
-            top_function(*inp, *predictions)
-            output.append(predictions)
+        try:
+            for start in range(0, n_samples, chunk_size):
+                stop = min(start + chunk_size, n_samples)
+                inp_chunk = [xj[start:stop] for xj in inp]
+                if out is None:
+                    output = [np.zeros((stop - start, size), dtype=dtype) for size in out_sizes]
+                else:
+                    output = [oj[start:stop] for oj in out]
+                # Outputs of a different type are simulated into a temporary array and converted afterwards
+                sim_output = [yj if yj.dtype == dtype else np.zeros(yj.shape, dtype=dtype) for yj in output]
+
+                if batch_function is None:
+                    for i in range(stop - start):
+                        top_function(*[xj[i] for xj in inp_chunk], *[yj[i] for yj in sim_output])
+                elif executor is not None:
+                    # ctypes releases the GIL for the duration of the call, so the parts run concurrently
+                    bounds = np.linspace(0, stop - start, n_workers + 1).astype(int)
+                    futures = [
+                        executor.submit(
+                            predict_chunk,
+                            chunk_function,
+                            [xj[lo:hi] for xj in inp_chunk],
+                            [yj[lo:hi] for yj in sim_output],
+                        )
+                        for chunk_function, lo, hi in zip(batch_functions, bounds[:-1], bounds[1:])
+                        if hi > lo
+                    ]
+                    for future in futures:
+                        future.result()
+                else:
+                    batch_function(*inp_chunk, *sim_output, stop - start)
 
-        # Convert to list of numpy arrays (one for each output)
-        output = [np.asarray([output[i_sample][i_output] for i_sample in range(n_samples)]) for i_output in range(n_outputs)]
+                for yj, sim_yj in zip(output, sim_output):
+                    if yj is not sim_yj:
+                        yj[...] = sim_yj
 
-        if n_samples == 1 and n_outputs == 1:
+                yield start, stop, output
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _predict(self, x, n_workers=1, out=None, chunk_size=None):
+        n_samples = self._compute_n_samples(x)
+        n_outputs = len(self.get_output_variables())
+
+        if out is not None:
+            out_list = [out] if isinstance(out, np.ndarray) else list(out)
+            if len(out_list) != n_outputs:
+                raise Exception(f'Expected {n_outputs} output arrays, got {len(out_list)}')
+            output = []
+            for oj, yj in zip(out_list, self.get_output_variables()):
+                if not isinstance(oj, np.ndarray):
+                    raise Exception(f'Expected numpy.ndarray as output, but got {type(oj)}')
+                if oj.size != n_samples * yj.size():
+                    raise Exception(f'Output size mismatch, got {oj.shape}, expected {n_samples} samples of {yj.shape}')
+                if not oj.flags['C_CONTIGUOUS'] or not oj.flags['WRITEABLE']:
+                    raise Exception('Output array must be writeable and c_contiguous')
+                output.append(oj.reshape(n_samples, -1))
+        else:
+            _, ctype = self._get_top_function(x)
+            output = [np.zeros((n_samples, yj.size()), dtype=ctype) for yj in self.get_output_variables()]
+
+        for _ in self._predict_chunks(x, n_workers=n_workers, chunk_size=chunk_size, out=output):
+            pass
+
+        if out is not None:
+            return out
+        elif n_samples == 1 and n_outputs == 1:
             return output[0][0]
         elif n_outputs == 1:
             return output[0]
@@ -906,88 +1326,116 @@ class ModelGraph(Serializable):
         else:
             return output
 
-    def predict(self, x, *args, **kwargs):
+    def predict(self, x, *args, n_workers=1, out=None, chunk_size=None, **kwargs):
+        """Run the C simulation of the compiled model.
+
+        Args:
+            x (np.ndarray or list): Input data, a list of arrays for models with multiple inputs.
+            n_workers (int, optional): Number of threads the batch is split across. Each thread uses its own copy of
+                the compiled library. Defaults to 1.
+            out (np.ndarray or list, optional): Array (e.g., a ``np.memmap``), or list of arrays for models with multiple
+                outputs, the outputs are written to. Each array must be C-contiguous and hold ``n_samples`` outputs.
+                If given, ``out`` is returned. Defaults to None.
+            chunk_size (int, optional): Number of samples simulated at a time. Defaults to None (the whole batch).
+
+        Returns:
+            np.ndarray or list: The output of the model, a list of arrays for models with multiple outputs.
+        """
         backend = self.config.backend
 
         if hasattr(backend, 'predict') and callable(backend.predict):
             return backend.predict(self, x, *args, **kwargs)
 
-        return self._predict(x)
+        return self._predict(x, n_workers=n_workers, out=out, chunk_size=chunk_size)
+
+    def predict_iter(self, x, chunk_size=1024, n_workers=1):
+        """Run the C simulation of the compiled model, yielding the outputs one chunk of samples at a time.
+
+        Only one chunk of the inputs and outputs is held in memory at a time, so inputs larger than the memory (e.g.,
+        loaded with ``np.load(..., mmap_mode='r')``) can be simulated.
+
+        Args:
+            x (np.ndarray or list): Input data, a list of arrays for models with multiple inputs.
+            chunk_size (int, optional): Number of samples per chunk. Defaults to 1024.
+            n_workers (int, optional): Number of threads each chunk is split across. Defaults to 1.
+
+        Yields:
+            np.ndarray or list: The output of the model for the chunk, of shape (n_chunk_samples, output_size), or a
+            list of such arrays for models with multiple outputs.
+        """
+        for _, _, output in self._predict_chunks(x, n_workers=n_workers, chunk_size=chunk_size):
+            yield output[0] if len(output) == 1 else output
 
     def trace(self, x):
+        """Run the C simulation of the model, recording the outputs of the traced layers.
+
+        The model is recompiled with tracing enabled. The whole batch is simulated with a single call to the compiled
+        library, which writes the outputs of the traced layers directly to the returned arrays.
+
+        Args:
+            x (np.ndarray or list): Input data, a list of arrays for models with multiple inputs.
+
+        Returns:
+            tuple: The output of the model (as returned by ``predict()``) and a dictionary mapping the names of the traced
+            layers to arrays of shape (n_samples, *layer_output_shape) holding their outputs.
+        """
+        self._compile_trace()
+        return self._trace_batch(x)
+
+    def _compile_trace(self):
+        """Recompile the model with tracing enabled, so that batches can be traced with ``_trace_batch()``."""
         print(f'Recompiling {self.config.get_project_name()} with tracing')
         self.config.trace_output = True
         self.compile()
 
-        top_function, ctype = self._get_top_function(x)
+    def _trace_batch(self, x):
+        """Simulate a batch with the library compiled by ``_compile_trace()``, recording the outputs of the traced layers.
+
+        Args:
+            x (np.ndarray or list): Input data, a list of arrays for models with multiple inputs.
+
+        Returns:
+            tuple: The output of the model and the outputs of the traced layers, as returned by ``trace()``.
+        """
+        _, ctype = self._get_top_function(x)
         n_samples = self._compute_n_samples(x)
         n_inputs = len(self.get_input_variables())
         n_outputs = len(self.get_output_variables())
 
         class TraceData(ctypes.Structure):
-            _fields_ = [('name', ctypes.c_char_p), ('data', ctypes.c_void_p)]
+            _fields_ = [('name', ctypes.c_char_p), ('data', ctypes.c_void_p), ('size', ctypes.c_size_t)]
 
         trace_output = {}
-        layer_sizes = {}
-        n_traced = 0
         for layer in self.get_layers():
             if layer.get_attr('function_cpp', None) and layer.get_attr('trace', False):
-                n_traced += len(layer.get_variables())
-                trace_output[layer.name] = []
-                layer_sizes[layer.name] = layer.get_output_variable().shape
+                layer_shape = layer.get_output_variable().shape
+                trace_output[layer.name] = np.zeros((n_samples, *layer_shape), dtype=ctype)
 
-        collect_func = self._top_function_lib.collect_trace_output
-        collect_func.argtypes = [ctypes.POINTER(TraceData)]
-        collect_func.restype = None
-        trace_data = (TraceData * n_traced)()
+        trace_data = (TraceData * len(trace_output))(
+            *[TraceData(name.encode(), data.ctypes.data, data[0].size) for name, data in trace_output.items()]
+        )
 
         alloc_func = self._top_function_lib.allocate_trace_storage
-        alloc_func.argtypes = [ctypes.c_size_t]
+        alloc_func.argtypes = [ctypes.c_size_t, ctypes.c_size_t, ctypes.POINTER(TraceData), ctypes.c_size_t]
         alloc_func.restype = None
 
         free_func = self._top_function_lib.free_trace_storage
         free_func.argtypes = None
         free_func.restype = None
 
-        curr_dir = os.getcwd()
-        os.chdir(self.config.get_output_dir() + '/firmware')
-
-        output = []
-        if n_samples == 1 and n_inputs == 1:
-            x = [x]
+        batch_function = self._get_batch_function(ctype)
+        if n_inputs == 1:
+            inp = [x]
+        else:
+            inp = x
+        inp = [np.ascontiguousarray(xj).reshape(n_samples, -1) for xj in inp]
+        output = [np.zeros((n_samples, yj.size()), dtype=ctype) for yj in self.get_output_variables()]
 
+        alloc_func(ctypes.sizeof(ctype), n_samples, trace_data, len(trace_output))
         try:
-            alloc_func(ctypes.sizeof(ctype))
-
-            for i in range(n_samples):
-                predictions = [np.zeros(yj.size(), dtype=ctype) for yj in self.get_output_variables()]
-                if n_inputs == 1:
-                    inp = [np.asarray(x[i])]
-                else:
-                    inp = [np.asarray(xj[i]) for xj in x]
-                argtuple = inp
-                argtuple += predictions
-                argtuple = tuple(argtuple)
-                top_function(*argtuple)
-                output.append(predictions)
-                collect_func(trace_data)
-                for trace in trace_data:
-                    layer_name = str(trace.name, 'utf-8')
-                    layer_data = ctypes.cast(trace.data, ctypes.POINTER(ctype))
-                    np_array = np.ctypeslib.as_array(layer_data, shape=layer_sizes[layer_name])
-                    trace_output[layer_name].append(np.copy(np_array))
-
-            for key in trace_output.keys():
-                trace_output[key] = np.asarray(trace_output[key])
-
-            # Convert to list of numpy arrays (one for each output)
-            output = [
-                np.asarray([output[i_sample][i_output] for i_sample in range(n_samples)]) for i_output in range(n_outputs)
-            ]
-
-            free_func()
+            batch_function(*inp, *output, n_samples)
         finally:
-            os.chdir(curr_dir)
+            free_func()
 
         if n_samples == 1 and n_outputs == 1:
             return output[0][0], trace_output
@@ -1031,17 +1479,19 @@ class ModelGraph(Serializable):
             f'{cls.__name__} is not intended to be deserialized directly. Use {cls.__name__}.from_saved_state instead.'
         )
 
-    def save(self, file_path):
+    def save(self, file_path, fmt='tar'):
         """Saves the ModelGraph to a file.
 
         See `hls4ml.utils.serialization.serialize_model` for details on the file format.
 
         Args:
             file_path (str): The path to the file where the model will be saved.
+            fmt (str, optional): The format of the file, ``'tar'`` (gzipped archive) or ``'binary'`` (uncompressed, faster
+                to save and load). Defaults to ``'tar'``.
         """
         from hls4ml.utils.serialization import serialize_model
 
-        serialize_model(self, file_path)
+        serialize_model(self, file_path, fmt=fmt)
 
 
 class MultiModelGraph:
@@ -1098,7 +1548,8 @@ class MultiModelGraph:
             subgraph.graph = graph_dict
             subgraph.inputs = input_layer.outputs if idx > 0 else base_model.inputs
             subgraph.outputs = slice_[-1].outputs if idx < len(node_slices) - 1 else base_model.outputs
-            subgraph._applied_flows = base_model._applied_flows
+            # Each subgraph records its own flows, so that subgraphs can be written concurrently
+            subgraph._applied_flows = list(base_model._applied_flows)
 
             # NOTE might need to examine other subgraph-related flows (i.e., fifo_optimizer)
             subgraph.apply_flow('vivado:specific_types')
@@ -1158,11 +1609,17 @@ class MultiModelGraph:
         self.get_output_variables = ModelGraph.get_output_variables.__get__(self, MultiModelGraph)
         self._compute_n_samples = ModelGraph._compute_n_samples.__get__(self, MultiModelGraph)
         self._get_top_function = ModelGraph._get_top_function.__get__(self, MultiModelGraph)
+        self._get_batch_function = ModelGraph._get_batch_function.__get__(self, MultiModelGraph)
+        self._get_worker_libs = ModelGraph._get_worker_libs.__get__(self, MultiModelGraph)
+        self._predict_chunks = ModelGraph._predict_chunks.__get__(self, MultiModelGraph)
         self._predict = ModelGraph._predict.__get__(self, MultiModelGraph)
+        self.predict_iter = ModelGraph.predict_iter.__get__(self, MultiModelGraph)
 
     def _initialize_io_attributes(self, graphs):
         self.graph_reports = None
+        self.graph_timings = {}
         self._top_function_lib = None
+        self._worker_libs = []
         self.inputs = graphs[0].inputs
         self.outputs = graphs[-1].outputs
         self.output_vars = {k: v for graph in graphs for k, v in graph.output_vars.items()}
@@ -1239,43 +1696,12 @@ class MultiModelGraph:
         if (sim_stitched_design or export_stitched_design) and not stitch_design:
             raise ValueError('You cannot simulate or export a stitched design without enabling stitch_design.')
 
-        build_results = {}
-        status = {}
-        status_lock = threading.Lock()
-
-        for idx, _ in enumerate(self.graphs, start=1):
-            status[f'graph{idx}'] = 'Pending'
-
-        def build_wrapper(idx, g, **kwargs):
-            graph_name = f'graph{idx}'
-            with status_lock:
-                status[graph_name] = 'Running'
-                self._print_status(status)
-            try:
-                result = g.build(log_to_stdout=False, export=export, **kwargs)
-                with status_lock:
-                    status[graph_name] = 'Completed'
-                    self._print_status(status)
-                return result
-            except Exception as exc:
-                with status_lock:
-                    status[graph_name] = 'Failed'
-                    self._print_status(status)
-                raise exc
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_idx = {
-                executor.submit(build_wrapper, idx, g, **kwargs): idx for idx, g in enumerate(self.graphs, start=1)
-            }
-            for future in concurrent.futures.as_completed(future_to_idx):
-                idx = future_to_idx[future]
-                graph_name = f'graph{idx}'
-                try:
-                    result = future.result()
-                    build_results[graph_name] = result
-                except Exception as exc:
-                    build_results[graph_name] = None
-                    print(f'Error while building {graph_name}: {exc}')
+        build_results, errors = self._run_on_graphs(
+            'build', lambda g: g.build(log_to_stdout=False, export=export, **kwargs), max_workers=max_workers
+        )
+        for graph_name, exc in errors.items():
+            build_results[graph_name] = None
+            print(f'Error while building {graph_name}: {exc}')
 
         self.graph_reports = build_results
 
@@ -1299,21 +1725,53 @@ class MultiModelGraph:
 
         return self.graph_reports
 
-    def write(self):
-        for g in self.graphs:
-            g.write()
+    def write(self, max_workers=None):
+        """Write the subgraphs in parallel, followed by the stitched project.
+
+        Args:
+            max_workers (int, optional): Maximum number of subgraphs written at the same time. Defaults to None (chosen by
+                ``ThreadPoolExecutor``).
+        """
+        _, errors = self._run_on_graphs('write', lambda g: g.write(), max_workers=max_workers)
+        for exc in errors.values():
+            raise exc
         self.nn_config = self.parse_nn_config()
         self.config.config['Stamp'] = self._make_stamp()
         # Bypass VitisWriter and invoke write_hls directly from VivadoWriter
         super(self.backend.writer.__class__, self.backend.writer).write_hls(self, is_multigraph=True)
 
-    def compile(self):
-        self.write()
+    def compile(self, max_workers=None):
+        """Write the project and compile the stitched library used by ``predict()``.
+
+        The subgraphs are written, and their objects compiled, in parallel. The time taken by each subgraph is printed
+        and kept in ``graph_timings``.
+
+        Args:
+            max_workers (int, optional): Maximum number of subgraphs written or compiled at the same time. Defaults to
+                None (chosen by ``ThreadPoolExecutor``).
+        """
+        self.write(max_workers=max_workers)
+        _, errors = self._run_on_graphs('compile', self._compile_graph_object, max_workers=max_workers)
+        for exc in errors.values():
+            raise exc
         self._compile()
 
-    def predict(self, x, sim='csim'):
+    def _compile_graph_object(self, g):
+        graph_dir = os.path.basename(os.path.normpath(g.config.get_output_dir()))
+        ret_val = subprocess.run(
+            ['./build_lib.sh', graph_dir],
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=self.config.get_output_dir(),
+        )
+        if ret_val.returncode != 0:
+            print(ret_val.stdout)
+            raise Exception(f'Failed to compile project "{g.config.get_project_name()}"')
+
+    def predict(self, x, sim='csim', n_workers=1, out=None, chunk_size=None):
         if sim == 'csim':
-            return self._predict(x)
+            return self._predict(x, n_workers=n_workers, out=out, chunk_size=chunk_size)
         elif sim == 'rtl':
             self.nn_config = self.parse_nn_config()
             assert (
@@ -1411,10 +1869,64 @@ class MultiModelGraph:
 
         return pragma_str, fifo_depth
 
-    def _print_status(self, status):
+    def _run_on_graphs(self, task, func, max_workers=None):
+        """Run a function on each subgraph in parallel, printing the status and time taken by each subgraph.
+
+        Args:
+            task (str): Name of the task, under which the times are stored in ``graph_timings``.
+            func (callable): Function called with each subgraph.
+            max_workers (int, optional): Maximum number of threads. Defaults to None.
+
+        Returns:
+            tuple: Dictionaries of the results of the subgraphs that succeeded and of the exceptions raised by the others,
+            keyed by subgraph name (``graph<index>``).
+        """
+        status = {f'graph{idx}': 'Pending' for idx in range(1, len(self.graphs) + 1)}
+        timings = self.graph_timings[task] = {}
+        status_lock = threading.Lock()
+
+        def wrapper(graph_name, g):
+            with status_lock:
+                status[graph_name] = 'Running'
+                self._print_status(status, timings)
+            start = time.perf_counter()
+            try:
+                result = func(g)
+            except Exception:
+                with status_lock:
+                    timings[graph_name] = time.perf_counter() - start
+                    status[graph_name] = 'Failed'
+                    self._print_status(status, timings)
+                raise
+            with status_lock:
+                timings[graph_name] = time.perf_counter() - start
+                status[graph_name] = 'Completed'
+                self._print_status(status, timings)
+            return result
+
+        results = {}
+        errors = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_name = {
+                executor.submit(wrapper, graph_name, g): graph_name for graph_name, g in zip(status, self.graphs)
+            }
+            for future in concurrent.futures.as_completed(future_to_name):
+                graph_name = future_to_name[future]
+                try:
+                    results[graph_name] = future.result()
+                except Exception as exc:
+                    errors[graph_name] = exc
+
+        return results, errors
+
+    def _print_status(self, status, timings=None):
         print('\r', end='')
         status_icons = {'Pending': '○', 'Running': '⌛', 'Completed': '✅', 'Failed': '❌'}
-        status_str = ' | '.join(f'{proj}: {status_icons.get(stat, "?")}' for proj, stat in status.items())
+        timings = timings or {}
+        status_str = ' | '.join(
+            f'{proj}: {status_icons.get(stat, "?")}' + (f' {timings[proj]:.1f}s' if proj in timings else '')
+            for proj, stat in status.items()
+        )
         print(status_str, flush=True)
 
     def _assert_consistent_pragmas(self):
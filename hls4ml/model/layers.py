@@ -1,4 +1,5 @@
 import typing
+import weakref
 from copy import copy
 from warnings import warn
 
@@ -47,6 +48,72 @@ class classproperty:
         return self.func(owner)
 
 
+class _TensorNames(list):
+    """The list of input or output tensor names of a layer, updating the index of the model graph when modified."""
+
+    def __init__(self, layer, names=()):
+        super().__init__(names)
+        self._layer = layer
+
+    def __reduce__(self):
+        return self.__class__, (None, list(self)), {'_layer': self._layer}
+
+    def _changed(self):
+        if self._layer is not None:
+            self._layer._update_tensor_index()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __iadd__(self, other):
+        super().__iadd__(other)
+        self._changed()
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._changed()
+        return self
+
+    def append(self, value):
+        super().append(value)
+        self._changed()
+
+    def extend(self, values):
+        super().extend(values)
+        self._changed()
+
+    def insert(self, index, value):
+        super().insert(index, value)
+        self._changed()
+
+    def pop(self, index=-1):
+        value = super().pop(index)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        super().remove(value)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+
 class Layer(Serializable):
     """The base class for all layers, which are the nodes in the model graph.
     Note:  they don't necessarily correspond 1:1 with the network layers.
@@ -90,6 +157,7 @@ class Layer(Serializable):
             )
         self.model: 'ModelGraph' = model
         self.name = name
+        self._node_dicts = weakref.WeakValueDictionary()  # The node containers indexing the tensors of this layer
         self.inputs = inputs
         self.outputs = outputs
         if self.outputs is None:
@@ -198,6 +266,30 @@ class Layer(Serializable):
                 accum_t = NamedType(*reversed(self.model.config.get_precision(self, 'accum')))
                 self.set_attr('accum_t', accum_t)
 
+    @property
+    def inputs(self):
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, inputs):
+        self._inputs = None if inputs is None else _TensorNames(self, inputs)
+        self._update_tensor_index()
+
+    @property
+    def outputs(self):
+        return self._outputs
+
+    @outputs.setter
+    def outputs(self, outputs):
+        self._outputs = None if outputs is None else _TensorNames(self, outputs)
+        self._update_tensor_index()
+
+    def _update_tensor_index(self):
+        node_dicts = self.__dict__.get('_node_dicts')
+        if node_dicts:
+            for node_dict in list(node_dicts.values()):
+                node_dict.update_index(self)
+
     def _set_type_t(self, name):
         has_type_t = any(a for a in self.expected_attributes if a.name == name + '_t' and isinstance(a, TypeAttribute))
         if has_type_t:
@@ -210,11 +302,7 @@ class Layer(Serializable):
                 input_name = self.inputs[0]
             else:
                 return None
-        nodes = [node for node in self.model.graph.values() if input_name in node.outputs]
-        if len(nodes) == 0:
-            return None
-        else:
-            return nodes[0]
+        return self.model.get_producer(input_name)
 
     def get_input_variable(self, input_name=None) -> TensorVariable:
         if input_name is not None:
@@ -225,11 +313,7 @@ class Layer(Serializable):
     def get_output_use_map(self):
         output_map = {}
         for output in self.outputs:
-            output_map[output] = []
-            for layer in self.model.get_layers():
-                for inp in layer.inputs:
-                    if output == inp:
-                        output_map[output].append(layer)
+            output_map[output] = self.get_output_nodes(output)
         return output_map
 
     def get_output_nodes(self, output_name=None):
@@ -239,10 +323,9 @@ class Layer(Serializable):
         else:
             outputs = self.outputs
         for output in outputs:
-            for layer in self.model.get_layers():
-                for inp in layer.inputs:
-                    if output == inp:
-                        output_nodes.append(layer)
+            for layer in self.model.get_consumers(output):
+                # A layer taking the same tensor more than once is listed once per use
+                output_nodes.extend(layer for inp in layer.inputs if output == inp)
         return output_nodes
 
     def get_output_variable(self, output_name=None) -> TensorVariable:
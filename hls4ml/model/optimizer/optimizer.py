@@ -1,3 +1,4 @@
+import heapq
 import importlib
 import inspect
 import os
@@ -252,6 +253,13 @@ def register_pass(name, opt_cls, backend=None):
     return name
 
 
+def _init_lazy_backends(name=None):
+    # Optimizers of the backends are registered when the backend is first used
+    from hls4ml.backends.backend import init_lazy_backends
+
+    init_lazy_backends(name)
+
+
 def get_optimizer(name):
     """Return the optimizer instance registered with the given name.
 
@@ -264,6 +272,8 @@ def get_optimizer(name):
     Returns:
         OptimizerPass: The optimizer from the registry.
     """
+    if name not in optimizer_map:
+        _init_lazy_backends(name)
     if name in optimizer_map:
         return optimizer_map[name]
     else:
@@ -279,6 +289,7 @@ def get_backend_passes(backend):
     Returns:
         list: List of optimizer names registered with the given backend.
     """
+    _init_lazy_backends(backend.lower() + ':')
     return [opt for opt in optimizer_map.keys() if opt.startswith(backend.lower() + ':')]
 
 
@@ -288,42 +299,145 @@ def get_available_passes():
     Returns:
         list: List of registered passes.
     """
+    _init_lazy_backends()
     return list(optimizer_map.keys())
 
 
-def optimize_model(model, passes):
+def _get_neighborhood(model, nodes, radius=2):
+    """Nodes within ``radius`` edges of the given nodes in the current graph (including the given nodes)."""
+    neighborhood = set(nodes)
+    frontier = set(nodes)
+    for _ in range(radius):
+        next_frontier = set()
+        for node in frontier:
+            for inp_name in node.inputs:
+                producer = model.get_producer(inp_name)
+                if producer is not None:
+                    next_frontier.add(producer)
+            for out_name in node.outputs:
+                next_frontier.update(model.get_consumers(out_name))
+        frontier = next_frontier - neighborhood
+        neighborhood |= frontier
+
+    return neighborhood
+
+
+def optimize_model(model, passes, profile=None):
     """Optimize a given model with the given passes.
 
     The passes are attempted until all passes no longer match or no changes to the model graph occur.
 
+    The passes are tried in order on the nodes of the model graph (in graph order). Whenever a transformation alters the
+    model graph, the optimization restarts from the first pass. Rather than matching every pass on every node again after
+    each restart, the result of a failed match is remembered until the node, or a node within two edges of it, is touched
+    by a transformation: transformed, inserted, removed or replaced in the graph, or having one of its attributes set or
+    deleted. Passes matching on a layer class are only tried on nodes of that class. Nodes that matched a pass are tried
+    again on every restart, and model passes reporting a change invalidate all remembered matches.
+
+    This applies the passes as if all nodes were tried as long as the ``match()`` of a pass only depends on the node and
+    the nodes within two edges of it, and these nodes are only changed through the methods of the model graph or their
+    attributes. A failed match is not retried if it depends on other state, e.g., nodes further away in the graph, or
+    objects modified in place, such as the precision of a type shared with other layers.
+
     Args:
         model (ModelGraph): The model to optimize.
         passes (list): List of passes to apply.
+        profile (FlowProfile, optional): If given, the time spent in each pass, the number of calls to ``match()`` and
+            ``transform()`` and the size of the model graph are recorded in it.
 
     Returns:
         set: The set of applied passes (the passes that matched the predicate).
     """
     optimizers = {opt_pass: get_optimizer(opt_pass) for opt_pass in passes}
     applied_passes = set()
-    optimization_done = False
-    while not optimization_done:
-        for opt_name, opt in optimizers.items():
-            if isinstance(opt, ModelOptimizerPass):
-                if opt_name not in applied_passes:
-                    res = opt.transform(model)
-                    if res:
-                        applied_passes.add(opt_name)
-                continue
-            for node in model.graph.values():
-                if opt.match(node):
+
+    def can_match(opt, node):
+        return not isinstance(opt, LayerOptimizerPass) or isinstance(node, opt.layer_class)
+
+    # Nodes that may match each pass, i.e., not known to fail the match
+    pending = {
+        opt_name: {node for node in model.graph.values() if can_match(opt, node)}
+        for opt_name, opt in optimizers.items()
+        if not isinstance(opt, ModelOptimizerPass)
+    }
+
+    def invalidate(nodes):
+        for opt_name, opt_pending in pending.items():
+            opt = optimizers[opt_name]
+            opt_pending.update(node for node in nodes if can_match(opt, node))
+
+    model._touched_nodes = set()
+    try:
+        optimization_done = False
+        while not optimization_done:
+            optimization_done = True
+            for opt_name, opt in optimizers.items():
+                if isinstance(opt, ModelOptimizerPass):
+                    if opt_name not in applied_passes:
+                        if profile is not None:
+                            pass_profile = profile.get_pass(opt_name)
+                            pass_start = pass_profile.start(len(model.graph))
+                        graph_before = set(model.graph.values())
+                        res = opt.transform(model)
+                        if profile is not None:
+                            pass_profile.stop(pass_start, len(model.graph), 0, 1)
+                        if res:
+                            applied_passes.add(opt_name)
+                            invalidate(model.graph.values())
+                        else:
+                            touched = model._touched_nodes | (set(model.graph.values()) - graph_before)
+                            invalidate(_get_neighborhood(model, touched))
+                        model._touched_nodes.clear()
+                    continue
+
+                if profile is not None:
+                    pass_profile = profile.get_pass(opt_name)
+                    pass_start = pass_profile.start(len(model.graph))
+                n_matches = n_transforms = 0
+
+                # The nodes are visited in the order of the graph at the start of the scan, skipping those known to fail
+                nodes = list(model.graph.values())
+                position = {node: i for i, node in enumerate(nodes)}
+                to_visit = [position[node] for node in pending[opt_name] if node in position]
+                heapq.heapify(to_visit)
+                i_node = -1
+                while to_visit:
+                    i_next = heapq.heappop(to_visit)
+                    if i_next == i_node:
+                        continue
+                    i_node = i_next
+                    node = nodes[i_node]
+                    n_matches += 1
+                    if not opt.match(node):
+                        pending[opt_name].discard(node)
+                        continue
+
+                    graph_before = set(model.graph.values())
+                    io_before = (list(model.inputs), list(model.outputs))
                     res = opt.transform(model, node)
+                    n_transforms += 1
                     applied_passes.add(opt_name)
+
+                    touched = model._touched_nodes | {node}
+                    touched.update(n for n in model.graph.values() if n not in graph_before)
+                    model._touched_nodes.clear()
+                    if io_before != (list(model.inputs), list(model.outputs)):
+                        touched.update(model.graph.values())
+                    invalidated = _get_neighborhood(model, touched)
+                    invalidate(invalidated)
                     if res:
+                        optimization_done = False
                         break
-            else:
-                continue
-            break
-        else:
-            optimization_done = True
+                    # Nodes invalidated later in the scan are visited in this scan
+                    for invalidated_node in invalidated:
+                        if position.get(invalidated_node, -1) > i_node and can_match(opt, invalidated_node):
+                            heapq.heappush(to_visit, position[invalidated_node])
+
+                if profile is not None:
+                    pass_profile.stop(pass_start, len(model.graph), n_matches, n_transforms)
+                if not optimization_done:
+                    break
+    finally:
+        model._touched_nodes = None
 
     return applied_passes
@@ -72,7 +72,7 @@ def get_input_layers(layer: Layer) -> list[Layer]:
 
 def get_output_layers(layer: Layer) -> list[Layer]:
     model: 'ModelGraph' = layer.model
-    return [l for l in model.graph.values() if layer.name in l.inputs]
+    return model.get_consumers(layer.name)
 
 
 def get_output_shape(layer: Layer) -> tuple[int, ...]:
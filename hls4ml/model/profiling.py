@@ -60,6 +60,179 @@ def get_unoptimized_hlsmodel(model):
     return convert_from_config(new_config), new_output_dir
 
 
+class QuantileSketch:
+    """Approximate quantiles of a stream of values, in bounded memory.
+
+    Nonzero values are counted in logarithmically spaced buckets of their magnitude, separately for positive and negative
+    values, such that the returned quantiles are within ``relative_accuracy`` of the exact ones (as in DDSketch). Zeros
+    are counted exactly. Non-finite values are ignored.
+
+    Args:
+        relative_accuracy (float, optional): Relative accuracy of the quantiles. Defaults to 0.01.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.count = 0
+        self.zeros = 0
+        self.positive = defaultdict(int)  # Bucket index -> count
+        self.negative = defaultdict(int)
+
+    def _add(self, buckets, x):
+        if x.size == 0:
+            return
+        keys, counts = np.unique(np.ceil(np.log(x) / np.log(self.gamma)).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            buckets[key] += count
+
+    def update(self, x):
+        """Add values to the sketch.
+
+        Args:
+            x (ndarray): The values, of any shape.
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        x = x[np.isfinite(x)]
+        self.count += x.size
+        self.zeros += int(np.count_nonzero(x == 0))
+        self._add(self.positive, x[x > 0])
+        self._add(self.negative, -x[x < 0])
+
+    def _bucket_value(self, keys):
+        # Bucket i holds the magnitudes in (gamma^(i-1), gamma^i], this value is within the relative accuracy of all of them
+        return 2 * self.gamma ** np.asarray(keys, dtype=np.float64) / (self.gamma + 1)
+
+    def quantile(self, q, magnitude=False):
+        """Get the approximate quantiles of the values added so far.
+
+        Args:
+            q (float or array-like): Quantiles to compute, between 0 and 1.
+            magnitude (bool, optional): If True, compute the quantiles of the magnitudes of the nonzero values instead.
+                Defaults to False.
+
+        Returns:
+            float or ndarray: The quantiles, or NaN if no values were added.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if magnitude:
+            magnitudes = defaultdict(int, self.positive)
+            for key, count in self.negative.items():
+                magnitudes[key] += count
+            keys = sorted(magnitudes)
+            values = self._bucket_value(keys)
+            counts = np.array([magnitudes[k] for k in keys], dtype=np.int64)
+        else:
+            neg_keys = sorted(self.negative, reverse=True)
+            pos_keys = sorted(self.positive)
+            values = np.concatenate([-self._bucket_value(neg_keys), [0.0], self._bucket_value(pos_keys)])
+            counts = np.array([self.negative[k] for k in neg_keys] + [self.zeros] + [self.positive[k] for k in pos_keys])
+
+        total = counts.sum()
+        if total == 0:
+            return np.full(q.shape, np.nan)[()]
+        rank = q * (total - 1)
+        idx = np.searchsorted(np.cumsum(counts), rank, side='right')
+        return values[np.minimum(idx, len(values) - 1)][()]
+
+
+class ActivationStatistics:
+    """Summary statistics of activations, accumulated over batches of data in bounded memory.
+
+    Besides the statistics of the values, the range and a histogram over power of 2 bins of the magnitudes of the nonzero
+    values are kept, from which ``to_summary()`` produces the same summaries as ``array_to_summary()``.
+
+    Args:
+        relative_accuracy (float, optional): Relative accuracy of the percentiles. Defaults to 0.01.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.min = np.inf
+        self.max = -np.inf
+        self.abs_min = np.inf  # Of the nonzero values
+        self.abs_max = 0.0
+        self.log2_counts = defaultdict(int)  # floor(log2(|x|)) -> count, for the nonzero values
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    @property
+    def count(self):
+        return self.sketch.count
+
+    @property
+    def zeros(self):
+        return self.sketch.zeros
+
+    def update(self, x):
+        """Add a batch of activations.
+
+        Args:
+            x (ndarray): The activations, of any shape.
+        """
+        x = np.asarray(x)
+        if x.size == 0:
+            return
+        self.min = min(self.min, float(np.nanmin(x)))
+        self.max = max(self.max, float(np.nanmax(x)))
+        self.sketch.update(x)
+
+        y = np.abs(x[np.isfinite(x) & (x != 0)])
+        if y.size == 0:
+            return
+        self.abs_min = min(self.abs_min, float(y.min()))
+        self.abs_max = max(self.abs_max, float(y.max()))
+        _, exponents = np.frexp(y)  # |x| = m * 2**e, with 0.5 <= m < 1
+        keys, counts = np.unique(exponents - 1, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.log2_counts[key] += count
+
+    def summary(self, percentiles=(1, 25, 50, 75, 99)):
+        """Get the accumulated statistics.
+
+        Args:
+            percentiles (tuple, optional): Percentiles to compute. Defaults to (1, 25, 50, 75, 99).
+
+        Returns:
+            dict: The minimum, maximum, number of values, number of zeros and a dictionary of the requested percentiles.
+        """
+        values = np.atleast_1d(self.sketch.quantile(np.array(percentiles, dtype=np.float64) / 100))
+        values = np.clip(values, self.min, self.max)
+        return {
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+            'zeros': self.zeros,
+            'percentiles': dict(zip(percentiles, values.tolist())),
+        }
+
+    def to_summary(self, fmt='boxplot'):
+        """Summarize the magnitudes of the nonzero activations, like ``array_to_summary()``.
+
+        The whiskers of the box plot and the histogram are exact, while the median and quartiles are approximate.
+
+        Args:
+            fmt (str, optional): 'boxplot' or 'histogram'. Defaults to 'boxplot'.
+
+        Returns:
+            dict: The summary, or None if all activations are zeros.
+        """
+        if not self.log2_counts:
+            return None
+        if fmt == 'boxplot':
+            q1, med, q3 = np.clip(self.sketch.quantile([0.25, 0.5, 0.75], magnitude=True), self.abs_min, self.abs_max)
+            y = {'med': med, 'q1': q1, 'q3': q3, 'whislo': self.abs_min, 'whishi': self.abs_max}
+        elif fmt == 'histogram':
+            # Power of 2 bins covering data range
+            high = np.ceil(np.log2(self.abs_max)) + 1
+            low = np.floor(np.log2(self.abs_min)) - 1
+            bits = np.arange(low, high, 1)
+            h = np.array([self.log2_counts.get(int(bit), 0) for bit in bits[:-1]])
+            # The last bin includes its upper edge, which can only be reached by the maximum
+            h[-1] += self.log2_counts.get(int(bits[-1]), 0)
+            h = h * 1.0 / float(sum(h))  # normalize
+            y = {'h': h, 'b': bits}
+        return y
+
+
 def array_to_summary(x, fmt='boxplot'):
     if fmt == 'boxplot':
         y = {'med': np.median(x), 'q1': np.percentile(x, 25), 'q3': np.percentile(x, 75), 'whislo': min(x), 'whishi': max(x)}
@@ -321,12 +494,29 @@ keras_process_layer_map = defaultdict(
 )
 
 
-def activations_hlsmodel(model, X, fmt='summary', plot='boxplot'):
+def activations_hlsmodel(model, X, fmt='summary', plot='boxplot', chunk_size=None):
+    """Profile the activations of the traced layers of a compiled ModelGraph.
+
+    Args:
+        model (ModelGraph): The ModelGraph, with tracing enabled for at least one layer.
+        X (ndarray): Input data.
+        fmt (str, optional): Only 'summary' is supported. Defaults to 'summary'.
+        plot (str, optional): The type of summary, 'boxplot' or 'histogram'. Defaults to 'boxplot'.
+        chunk_size (int, optional): If given, ``X`` is traced in chunks of this many samples and the statistics of the
+            activations are accumulated over the chunks, in memory independent of the number of samples. The median and
+            quartiles of box plots are then approximate. Defaults to None (trace all samples at once).
+
+    Returns:
+        list: The summary of the magnitudes of the nonzero activations of each traced layer.
+    """
     if fmt == 'longform':
         raise NotImplementedError
     elif fmt == 'summary':
         data = []
 
+    if chunk_size is not None:
+        return _activations_hlsmodel_streaming(model, X, plot, chunk_size)
+
     _, trace = model.trace(np.ascontiguousarray(X))
 
     if len(trace) == 0:
@@ -349,6 +539,30 @@ def activations_hlsmodel(model, X, fmt='summary', plot='boxplot'):
     return data
 
 
+def _activations_hlsmodel_streaming(model, X, plot, chunk_size):
+    # The model is compiled with tracing once, then each chunk is simulated with the loaded library
+    model._compile_trace()
+    statistics = {}
+    for start in range(0, len(X), chunk_size):
+        _, trace = model._trace_batch(np.ascontiguousarray(X[start : start + chunk_size]))
+        if len(trace) == 0:
+            raise RuntimeError('ModelGraph must have tracing on for at least 1 layer (this can be set in its config)')
+        for layer, y in trace.items():
+            statistics.setdefault(layer, ActivationStatistics()).update(y)
+
+    data = []
+    for layer, stats in statistics.items():
+        print(f'   {layer}')
+        summary = stats.to_summary(fmt=plot)
+        if summary is None:
+            print(f'Activations for {layer} are only zeros, ignoring.')
+            continue
+        data.append(summary)
+        data[-1]['weight'] = layer
+
+    return data
+
+
 def weights_keras(model, fmt='longform', plot='boxplot'):
     if fmt == 'longform':
         data = {'x': [], 'layer': [], 'weight': []}
@@ -451,7 +665,7 @@ def activations_torch(model, X, fmt='longform', plot='boxplot'):
     return data
 
 
-def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
+def numerical(model=None, hls_model=None, X=None, plot='boxplot', chunk_size=None):
     """Perform numerical profiling of a model.
 
     Args:
@@ -461,6 +675,8 @@ def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
             Must be formatted suitably for the ``model.predict(X)``. Defaults to None.
         plot (str, optional): The type of plot to produce. Options are: 'boxplot' (default), 'violinplot', 'histogram',
             'FacetGrid'. Defaults to 'boxplot'.
+        chunk_size (int, optional): If given, the activations of the ModelGraph are profiled by tracing ``X`` in chunks of
+            this many samples, see ``activations_hlsmodel()``. Defaults to None.
 
     Returns:
         tuple: The quadruple of produced figures. First weights and biases
@@ -543,7 +759,7 @@ def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
 
         if hls_model_present:
             print('Profiling activations' + after)
-            data = activations_hlsmodel(hls_model, X, fmt='summary', plot=plot)
+            data = activations_hlsmodel(hls_model, X, fmt='summary', plot=plot, chunk_size=chunk_size)
             aph = plots[plot](data, fmt='summary')
 
             t_data = activation_types_hlsmodel(hls_model)
@@ -575,42 +791,117 @@ def _get_outputs(layers, X, model_input):
     return y
 
 
-def get_ymodel_keras(keras_model, X):
+def _get_fused_activation(layer):
+    """The activation fused into the layer, or None if it has no such activation."""
+    if (
+        hasattr(layer, 'activation')
+        and layer.activation is not None
+        and not isinstance(layer, tuple(__keras_activations))
+        and layer.activation.__name__ != 'linear'
+    ):
+        return layer.activation
+    return None
+
+
+def _to_numpy(x):
+    if hasattr(keras, 'ops'):
+        return keras.ops.convert_to_numpy(x)
+    return np.asarray(x)
+
+
+def _n_samples(X):
+    return len(X[0]) if isinstance(X, (list, tuple)) else len(X)
+
+
+def _get_batch(X, start, stop):
+    if isinstance(X, (list, tuple)):
+        return [x[start:stop] for x in X]
+    return X[start:stop]
+
+
+def get_ymodel_keras(keras_model, X, batch_size=1024, summary=False):
     """Calculate each layer's ouput and put them into a dictionary.
 
+    The outputs of all layers, and the inputs of the layers with a fused activation, are captured by a single model in one
+    forward pass over each batch of ``X``. The output of a layer before its fused activation is then obtained by applying
+    the layer, with the activation disabled, to its captured input. The output before the activation is stored under the
+    name of the layer, and the output after the activation under ``<layer name>_<activation name>``.
+
     Args:
         keras_model (_type_): A keras Model
         X (ndarray): Test data on which to evaluate the model to profile activations.
             Must be formatted suitably for the ``model.predict(X)``.
+        batch_size (int, optional): Number of samples of ``X`` evaluated at once. Defaults to 1024.
+        summary (bool, optional): If True, only summary statistics of the outputs of each layer are accumulated over the
+            batches, instead of keeping the full outputs in memory. Defaults to False.
 
     Returns:
-        dict: A dictionary in the form {"layer_name": ouput array of layer}.
+        dict: A dictionary in the form {"layer_name": ouput array of layer}. If ``summary`` is True, the values are instead
+        dictionaries with the minimum, maximum, number of values, number of zeros and (approximate) percentiles of the
+        output, as returned by ``ActivationStatistics.summary()``.
     """
-    ymodel = {}
     traced_layers = []
     layer_names = []
+    fused_layers = []
     for layer in keras_model.layers:
         if _is_ignored_layer(layer):
             continue
         # If the layer has activation integrated then separate them
         # Note that if the layer is a standalone activation layer then skip this
         name = layer.name
-        if (
-            hasattr(layer, 'activation')
-            and layer.activation is not None
-            and not isinstance(layer, tuple(__keras_activations))
-            and layer.activation.__name__ != 'linear'
-        ):
-            tmp_activation = layer.activation
-            layer.activation = None
-            ymodel.update({layer.name: _get_outputs([layer], X, keras_model.input)})
-            layer.activation = tmp_activation
-            name = layer.name + f'_{tmp_activation.__name__}'
+        activation = _get_fused_activation(layer)
+        if activation is not None:
+            fused_layers.append(layer)
+            name = layer.name + f'_{activation.__name__}'
         traced_layers.append(layer)
         layer_names.append(name)
-    outputs = _get_outputs(traced_layers, X, keras_model.input)
-    for name, output in zip(layer_names, outputs):
-        ymodel[name] = output
+
+    capture_outputs = [layer.output for layer in traced_layers]
+    fused_inputs = []  # Slices of the captured outputs holding the inputs of each fused layer
+    for layer in fused_layers:
+        inputs = layer.input if isinstance(layer.input, (list, tuple)) else [layer.input]
+        fused_inputs.append((len(capture_outputs), len(inputs), isinstance(layer.input, (list, tuple))))
+        capture_outputs.extend(inputs)
+    capture_model = keras.models.Model(inputs=keras_model.input, outputs=capture_outputs)
+
+    names = [layer.name for layer in fused_layers] + layer_names
+    if summary:
+        ymodel = {name: ActivationStatistics() for name in names}
+    else:
+        ymodel = {name: [] for name in names}
+
+    n_samples = _n_samples(X)
+    activations = [layer.activation for layer in fused_layers]
+    try:
+        for start in range(0, n_samples, batch_size):
+            outputs = capture_model.predict_on_batch(_get_batch(X, start, start + batch_size))
+            if not isinstance(outputs, (list, tuple)):
+                outputs = [outputs]
+            outputs = [_to_numpy(y) for y in outputs]
+
+            batch_outputs = []
+            for layer, (first, n_inputs, is_list) in zip(fused_layers, fused_inputs):
+                inputs = outputs[first : first + n_inputs] if is_list else outputs[first]
+                layer.activation = None
+                batch_outputs.append(_to_numpy(layer(inputs)))
+            for layer, activation in zip(fused_layers, activations):
+                layer.activation = activation
+            batch_outputs.extend(outputs[: len(traced_layers)])
+
+            for name, y in zip(names, batch_outputs):
+                if summary:
+                    ymodel[name].update(y)
+                else:
+                    ymodel[name].append(y)
+    finally:
+        for layer, activation in zip(fused_layers, activations):
+            layer.activation = activation
+
+    if summary:
+        ymodel = {name: stats.summary() for name, stats in ymodel.items()}
+    else:
+        ymodel = {name: np.concatenate(ys) if ys else np.empty((0,)) for name, ys in ymodel.items()}
+
     print('Done taking outputs for Keras model.')
     return ymodel
 
@@ -5,6 +5,7 @@ The Precision types are given names for convenience (``NamedType``). Named types
 higher-dimensional tensors, which are defined as arrays or FIFO streams in the generated code.
 """
 
+import re
 from enum import Enum
 
 import numpy as np
@@ -676,6 +677,55 @@ class StructWrapperVariable(TensorVariable):
         return cls(tv)
 
 
+class WeightFormatter:
+    """Formats the values of a weight variable as elements of a C++ array initializer.
+
+    All elements are formatted with the same printf-style format (``element_fmt``), consuming one field of ``values`` per
+    conversion specifier. The values are formatted in bulk, a chunk at a time, instead of element by element. The
+    formatter only holds plain data, so it can be sent to other processes.
+
+    Args:
+        values (ndarray or list): Array of shape ``(n_elements,)`` or ``(n_elements, n_fields)``, or list of tuples with
+            the fields of each element.
+        element_fmt (str): printf-style format of a single element.
+    """
+
+    def __init__(self, values, element_fmt):
+        self.values = values
+        self.element_fmt = element_fmt
+
+    def __len__(self):
+        return len(self.values)
+
+    def format(self, chunk_size=2**16):
+        """Format the values in chunks.
+
+        Args:
+            chunk_size (int, optional): Number of elements formatted at once. Defaults to 65536.
+
+        Yields:
+            str: Comma-separated elements of each chunk.
+        """
+        for start in range(0, len(self.values), chunk_size):
+            chunk = self.values[start : start + chunk_size]
+            if isinstance(chunk, np.ndarray):
+                fields = chunk.ravel().tolist()
+            else:
+                fields = [field for value in chunk for field in value]
+            yield ', '.join([self.element_fmt] * len(chunk)) % tuple(fields)
+
+
+# Data types whose values are formatted the same by printf-style formatting as by str.format() on the numpy scalar
+_BULK_FORMAT_DTYPES = {np.dtype(t) for t in (np.float16, np.float32, np.float64)}
+
+
+def _printf_format(precision_fmt):
+    match = re.fullmatch(r'\{:(\.\d+f)\}', precision_fmt)
+    if match is None:
+        return None
+    return '%' + match.group(1)
+
+
 class WeightVariable(Variable):
     """Class representing a tensor containing the weights of a layer.
 
@@ -717,6 +767,31 @@ class WeightVariable(Variable):
 
     next = __next__
 
+    def get_formatter(self):
+        """Get the formatter of the values of the weights as C++ array elements.
+
+        The elements are the same as obtained by iterating over the variable.
+
+        Returns:
+            WeightFormatter: The formatter.
+        """
+        fmt = _printf_format(self.precision_fmt)
+        data = np.asarray(self.data)
+        if fmt is None or not (data.dtype.kind in 'biu' or data.dtype in _BULK_FORMAT_DTYPES):
+            return WeightFormatter([(value,) for value in self], '%s')
+        return WeightFormatter(data.ravel(order='C'), fmt)
+
+    def format_data(self, chunk_size=2**16):
+        """Format the values of the weights as C++ array elements, in chunks.
+
+        Args:
+            chunk_size (int, optional): Number of elements formatted at once. Defaults to 65536.
+
+        Yields:
+            str: Comma-separated elements of each chunk.
+        """
+        yield from self.get_formatter().format(chunk_size)
+
     def update_precision(self, new_precision):
         self.type.precision = new_precision
         if isinstance(new_precision, UnspecifiedPrecisionType):
@@ -809,6 +884,14 @@ class CompressedWeightVariable(WeightVariable):
 
     next = __next__
 
+    def get_formatter(self):
+        fmt = _printf_format(self.precision_fmt)
+        dtype = np.asarray(self.data[0][2]).dtype if len(self.data) > 0 else np.dtype(np.float64)
+        if fmt is None or not (dtype.kind in 'biu' or dtype in _BULK_FORMAT_DTYPES):
+            return WeightFormatter([(value,) for value in self], '%s')
+        values = [(row, col, value) for col, row, value in self.data]
+        return WeightFormatter(values, '{%d, %d, ' + fmt + '}')
+
 
 class ExponentWeightVariable(WeightVariable):
     """WeightVariable for Exponent aka power-of-2 data. The data should already by quantized by the quantizer.
@@ -847,6 +930,14 @@ class ExponentWeightVariable(WeightVariable):
 
     next = __next__
 
+    def get_formatter(self):
+        fmt = _printf_format(self.precision_fmt)
+        data = self._format()
+        if fmt is None or data.dtype not in _BULK_FORMAT_DTYPES:
+            return WeightFormatter([(value,) for value in self], '%s')
+        # The sign is written as the str() of the (floating point) value
+        return WeightFormatter(data.reshape(-1, 2), '{%s, ' + fmt + '}')
+
 
 # endregion
 
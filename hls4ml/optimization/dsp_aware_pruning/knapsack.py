@@ -117,34 +117,39 @@ def __solve_1d_knapsack_dp(values, weights, capacity):
     Furthermore, it has a high computational complexity and it is not suitable for highly-dimensional arrays
     NOTE: The weights and corresponding weight constraint need to be integers;
     If not, the they should be scaled and rounded beforehand
+
+    The look-up table is kept as a single row, K[w] = optimal value with total weight w, updated in-place for every item.
+    To recover the selected items, a bit per item and weight records whether the item was taken, packed into bytes;
+    therefore, the memory is O(N * capacity / 8) bytes.
     """
     assert len(weights.shape) == 1
 
-    # Build look-up table in bottom-up approach
     N = values.shape[0]
-    K = [[0 for w in range(capacity + 1)] for i in range(N + 1)]
-    for i in range(1, N + 1):
-        for w in range(1, capacity + 1):
-            if weights[i - 1] <= w:
-                K[i][w] = max(values[i - 1] + K[i - 1][w - weights[i - 1]], K[i - 1][w])
-            else:
-                K[i][w] = K[i - 1][w]
+    capacity = int(capacity)
+    weights = weights.astype(np.int64)
+    K = np.zeros(capacity + 1, dtype=np.result_type(values.dtype, np.int64))
+    taken = np.zeros((N, (capacity + 8) // 8), dtype=np.uint8)
+    take = np.zeros(capacity + 1, dtype=bool)
+    for i in range(N):
+        w_i = weights[i]
+        if w_i > capacity:
+            continue
+        # With item i, the optimal value for weight w is values[i] + K[w - w_i], computed from the previous row
+        with_item = K[: capacity + 1 - w_i] + values[i]
+        take[:w_i] = False
+        np.greater(with_item, K[w_i:], out=take[w_i:])
+        np.copyto(K[w_i:], with_item, where=take[w_i:])
+        taken[i] = np.packbits(take)
 
     # Reverse Knapsack to find selected groups
-    i = N
     w = capacity
-    res = K[N][capacity]
     selected = []
-    while i >= 0 and res > 0:
-        if res == K[i - 1][w]:
-            pass
-        else:
-            selected.append(i - 1)
-            res = res - values[i - 1]
-            w = w - weights[i - 1]
-        i = i - 1
+    for i in reversed(range(N)):
+        if (taken[i, w >> 3] >> (7 - (w & 7))) & 1:
+            selected.append(i)
+            w -= weights[i]
 
-    return K[N][capacity], selected
+    return K[capacity], selected
 
 
 def __solve_knapsack_greedy(values, weights, capacity):
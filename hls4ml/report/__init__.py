@@ -12,6 +12,7 @@ from hls4ml.report.quartus_report import (
     parse_quartus_report,  # noqa: F401
     read_quartus_report,  # noqa: F401
 )
+from hls4ml.report.report_database import ReportDatabase, parse_vivado_reports  # noqa: F401
 from hls4ml.report.vivado_report import (
     aggregate_graph_reports,  # noqa: F401
     parse_vivado_report,  # noqa: F401
@@ -0,0 +1,309 @@
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+from hls4ml.report.vivado_report import _find_solutions, _parse_project_script, parse_vivado_report
+
+# Columns of the summary of each report, along with the section and key of the report (or the config) they come from
+_REPORT_COLUMNS = {
+    'best_latency': ('CSynthesisReport', 'BestLatency'),
+    'worst_latency': ('CSynthesisReport', 'WorstLatency'),
+    'interval_min': ('CSynthesisReport', 'IntervalMin'),
+    'interval_max': ('CSynthesisReport', 'IntervalMax'),
+    'target_clock_period': ('CSynthesisReport', 'TargetClockPeriod'),
+    'estimated_clock_period': ('CSynthesisReport', 'EstimatedClockPeriod'),
+    'bram_18k': ('CSynthesisReport', 'BRAM_18K'),
+    'dsp': ('CSynthesisReport', 'DSP'),
+    'ff': ('CSynthesisReport', 'FF'),
+    'lut': ('CSynthesisReport', 'LUT'),
+    'uram': ('CSynthesisReport', 'URAM'),
+    'vsynth_bram_18k': ('VivadoSynthReport', 'BRAM_18K'),
+    'vsynth_dsp': ('VivadoSynthReport', 'DSP48E'),
+    'vsynth_ff': ('VivadoSynthReport', 'FF'),
+    'vsynth_lut': ('VivadoSynthReport', 'LUT'),
+    'vsynth_uram': ('VivadoSynthReport', 'URAM'),
+}
+
+_CONFIG_COLUMNS = {
+    'project_name': 'ProjectName',
+    'backend': 'Backend',
+    'part': 'Part',
+    'clock_period': 'ClockPeriod',
+    'io_type': 'IOType',
+    'strategy': 'Strategy',
+    'reuse_factor': 'ReuseFactor',
+    'precision': 'Precision',
+}
+
+_COLUMNS = list(_CONFIG_COLUMNS) + list(_REPORT_COLUMNS)
+
+
+class _ConfigLoader(getattr(yaml, 'CSafeLoader', yaml.SafeLoader)):
+    pass
+
+
+# The Keras model stored in the config is not needed for the report
+_ConfigLoader.add_multi_constructor('!keras_model', lambda loader, suffix, node: None)
+
+
+def _get_report_files(hls_dir):
+    """Paths of the files read by ``parse_vivado_report()`` for a project, whether they exist or not."""
+    files = [hls_dir + '/hls4ml_config.yml', hls_dir + '/project.tcl']
+    if not os.path.isfile(hls_dir + '/project.tcl'):
+        return files
+
+    prj_dir, top_func_name = _parse_project_script(hls_dir)
+    sln_dir = hls_dir + '/' + prj_dir
+    files += [sln_dir + '/vivado_hls.app', sln_dir + '/hls.app']
+    files += [hls_dir + '/tb_data/csim_results.log', hls_dir + '/tb_data/rtl_cosim_results.log']
+    files += [hls_dir + '/vivado_synth.rpt', hls_dir + '/util.rpt']
+    timing_report = '_vivado_accelerator/project_1.runs/impl_1/design_1_wrapper_timing_summary_routed.rpt'
+    files.append(hls_dir + '/' + prj_dir.split('_')[0] + timing_report)
+
+    solutions = _find_solutions(sln_dir) if os.path.isdir(sln_dir) else []
+    if solutions:
+        sln_path = sln_dir + '/' + solutions[0]
+        files.append(sln_path + f'/syn/report/{top_func_name}_csynth.xml')
+        files.append(sln_path + f'/sim/report/{top_func_name}_cosim.rpt')
+        files += sorted(glob.glob(sln_path + f'/sim/*/{top_func_name}.performance.result.transaction.xml'))
+
+    return files
+
+
+def _get_fingerprint(hls_dir):
+    """Fingerprint of the report files of a project, changing if any of them is created, modified or removed."""
+    state = []
+    for path in _get_report_files(hls_dir):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        state.append((os.path.relpath(path, hls_dir), st.st_mtime_ns, st.st_size))
+    return hashlib.sha1(json.dumps(state).encode()).hexdigest()
+
+
+def _to_number(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def _get_config_values(hls_dir):
+    config_path = hls_dir + '/hls4ml_config.yml'
+    if not os.path.isfile(config_path):
+        return {}
+    with open(config_path) as f:
+        config = yaml.load(f, Loader=_ConfigLoader) or {}
+    model_config = config.get('HLSConfig', {}).get('Model', {})
+
+    values = {}
+    for column, key in _CONFIG_COLUMNS.items():
+        value = config.get(key, model_config.get(key))
+        if isinstance(value, dict) and 'default' in value:
+            value = value['default']
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, sort_keys=True)
+        values[column] = value
+    return values
+
+
+def _parse_project(hls_dir, known_fingerprint):
+    """Parse the reports of a project (in a worker process) unless their fingerprint matches the known one."""
+    try:
+        fingerprint = _get_fingerprint(hls_dir)
+        if fingerprint == known_fingerprint:
+            return hls_dir, fingerprint, None, None, None
+        # Projects missing some of the reports are common in sweeps, the messages would flood the output
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = parse_vivado_report(hls_dir)
+        if report is None:
+            return hls_dir, fingerprint, None, None, 'No project found'
+        return hls_dir, fingerprint, report, _get_config_values(hls_dir), None
+    except Exception as e:
+        return hls_dir, None, None, None, f'{type(e).__name__}: {e}'
+
+
+class ReportDatabase:
+    """A database of the parsed reports of Vivado/Vitis HLS projects, stored in SQLite.
+
+    The reports of many projects (e.g., of a design-space sweep) are parsed in parallel with ``scan()``. The parsed
+    reports are cached in the database, together with a fingerprint of the modification times and sizes of the report
+    files, so scanning again only parses the projects whose reports changed. Projects whose reports can no longer be
+    parsed (e.g., removed projects) are removed from the database when scanned again. Along with the full report, the
+    latency, interval, clock period and resource estimates of each project are stored as columns that can be queried,
+    together with the main options of the configuration of the project (part, clock period, IO type, strategy, reuse
+    factor, precision).
+
+    Args:
+        path (str, optional): Path to the SQLite database file, created if it doesn't exist. Defaults to ':memory:',
+            using a database that only lives as long as the object.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        column_defs = ''.join(f', {column}' for column in _COLUMNS)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS reports '
+                f'(hls_dir TEXT PRIMARY KEY, fingerprint TEXT, parsed_at REAL, report TEXT{column_defs})'
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the connection to the database."""
+        self._conn.close()
+
+    def _store(self, hls_dir, fingerprint, report, config_values):
+        values = dict(config_values)
+        for column, (section, key) in _REPORT_COLUMNS.items():
+            values[column] = _to_number(report.get(section, {}).get(key))
+        row = [hls_dir, fingerprint, time.time(), json.dumps(report)] + [values.get(column) for column in _COLUMNS]
+        columns = ', '.join(['hls_dir', 'fingerprint', 'parsed_at', 'report'] + _COLUMNS)
+        placeholders = ', '.join('?' * len(row))
+        self._conn.execute(f'INSERT OR REPLACE INTO reports ({columns}) VALUES ({placeholders})', row)
+
+    def scan(self, hls_dirs, max_workers=None):
+        """Parse the reports of the given projects in parallel, skipping the projects whose reports didn't change.
+
+        Args:
+            hls_dirs (list): Output directories of the projects.
+            max_workers (int, optional): Maximum number of worker processes. Defaults to None, using the number of CPUs.
+                With ``max_workers=1``, the reports are parsed in the calling process.
+
+        Returns:
+            dict: Number of parsed and cached (unchanged) projects, and the projects that failed to be parsed, with the
+            reason. The failed projects are removed from the database, so their previous reports are not returned.
+        """
+        hls_dirs = list(dict.fromkeys(os.path.abspath(str(hls_dir)) for hls_dir in hls_dirs))
+        rows = self._conn.execute('SELECT hls_dir, fingerprint FROM reports')
+        known = {row['hls_dir']: row['fingerprint'] for row in rows}
+        args = [(hls_dir, known.get(hls_dir)) for hls_dir in hls_dirs]
+
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1 or len(args) <= 1:
+            results = [_parse_project(*arg) for arg in args]
+        else:
+            chunksize = max(1, len(args) // (4 * max_workers))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_parse_project, *zip(*args), chunksize=chunksize))
+
+        stats = {'parsed': 0, 'cached': 0, 'failed': {}}
+        with self._conn:
+            for hls_dir, fingerprint, report, config_values, error in results:
+                if error is not None:
+                    stats['failed'][hls_dir] = error
+                    self._conn.execute('DELETE FROM reports WHERE hls_dir = ?', (hls_dir,))
+                elif report is None:
+                    stats['cached'] += 1
+                else:
+                    self._store(hls_dir, fingerprint, report, config_values)
+                    stats['parsed'] += 1
+
+        return stats
+
+    def get_report(self, hls_dir):
+        """Get the full report of a project, as returned by ``parse_vivado_report()``.
+
+        Args:
+            hls_dir (str): Output directory of the project.
+
+        Returns:
+            dict: The report, or None if the project is not in the database.
+        """
+        hls_dir = os.path.abspath(str(hls_dir))
+        row = self._conn.execute('SELECT report FROM reports WHERE hls_dir = ?', (hls_dir,)).fetchone()
+        return json.loads(row['report']) if row is not None else None
+
+    def get_reports(self, hls_dirs=None):
+        """Get the full reports of the given projects, or of all projects in the database.
+
+        Args:
+            hls_dirs (list, optional): Output directories of the projects. Defaults to None, returning all projects.
+
+        Returns:
+            dict: Reports of the projects found in the database, keyed by the output directory of the project. Projects
+            not in the database are skipped.
+        """
+        if hls_dirs is None:
+            rows = self._conn.execute('SELECT hls_dir, report FROM reports ORDER BY rowid')
+            return {row['hls_dir']: json.loads(row['report']) for row in rows}
+
+        reports = {}
+        for hls_dir in hls_dirs:
+            report = self.get_report(hls_dir)
+            if report is not None:
+                reports[str(hls_dir)] = report
+        return reports
+
+    def query(self, where=None, params=(), order_by=None):
+        """Query the summary of the reports of the projects.
+
+        The available columns are ``hls_dir``, ``parsed_at``, the configuration columns (``project_name``, ``backend``,
+        ``part``, ``clock_period``, ``io_type``, ``strategy``, ``reuse_factor``, ``precision``), the C synthesis
+        estimates (``best_latency``, ``worst_latency``, ``interval_min``, ``interval_max``, ``target_clock_period``,
+        ``estimated_clock_period``, ``bram_18k``, ``dsp``, ``ff``, ``lut``, ``uram``) and the Vivado synthesis
+        results (``vsynth_bram_18k``, ``vsynth_dsp``, ``vsynth_ff``, ``vsynth_lut``, ``vsynth_uram``).
+
+        Example::
+
+            db.query('reuse_factor = ? AND dsp < ?', (4, 1000), order_by='worst_latency')
+
+        Args:
+            where (str, optional): SQL condition on the columns, with ``?`` placeholders. Defaults to None.
+            params (tuple, optional): Values of the placeholders. Defaults to ().
+            order_by (str, optional): SQL ordering of the results. Defaults to None.
+
+        Returns:
+            list: A dictionary of the columns for each matching project.
+        """
+        sql = f'SELECT hls_dir, parsed_at, {", ".join(_COLUMNS)} FROM reports'
+        if where:
+            sql += f' WHERE {where}'
+        if order_by:
+            sql += f' ORDER BY {order_by}'
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def remove(self, hls_dir):
+        """Remove a project from the database.
+
+        Args:
+            hls_dir (str): Output directory of the project.
+        """
+        with self._conn:
+            self._conn.execute('DELETE FROM reports WHERE hls_dir = ?', (os.path.abspath(str(hls_dir)),))
+
+
+def parse_vivado_reports(hls_dirs, db_path=':memory:', max_workers=None):
+    """Parse the reports of many Vivado/Vitis HLS projects in parallel, caching them in a report database.
+
+    Args:
+        hls_dirs (list): Output directories of the projects.
+        db_path (str, optional): Path to the SQLite database caching the reports. Defaults to ':memory:'.
+        max_workers (int, optional): Maximum number of worker processes. Defaults to None, using the number of CPUs.
+
+    Returns:
+        dict: Reports of the projects that could be parsed, keyed by the output directory of the project.
+    """
+    with ReportDatabase(db_path) as db:
+        db.scan(hls_dirs, max_workers=max_workers)
+        return db.get_reports(hls_dirs)
@@ -674,10 +674,22 @@ def _make_report_body(report_dict, make_table_template, make_header_template):
     return body
 
 
-def aggregate_graph_reports(graph_reports):
+def aggregate_graph_reports(graph_reports, hls_dirs=None):
     """
     Aggregate the build results of each subgraph into a single dictionary.
+
+    The reports can be given as a dictionary of the reports of the subgraphs, or as a ``ReportDatabase``, in which case
+    the reports of the projects of the subgraphs, given in ``hls_dirs``, are aggregated.
     """
+    from hls4ml.report.report_database import ReportDatabase
+
+    if isinstance(graph_reports, ReportDatabase):
+        if hls_dirs is None:
+            raise Exception('The output directories of the subgraphs (hls_dirs) are required to aggregate from a database')
+        graph_reports = graph_reports.get_reports(hls_dirs)
+        missing = [str(hls_dir) for hls_dir in hls_dirs if str(hls_dir) not in graph_reports]
+        if missing:
+            raise Exception(f'No reports of {", ".join(missing)} in the database (not scanned, or could not be parsed)')
 
     if graph_reports is None or len(graph_reports) == 0:
         return {}
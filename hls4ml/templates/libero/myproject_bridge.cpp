@@ -14,37 +14,51 @@ std::map<std::string, void *> *trace_outputs = NULL;
 size_t trace_type_size = sizeof(double);
 } // namespace nnet
 
+// Number of elements of each traced output per sample, and number of samples left to trace
+static std::map<std::string, size_t> trace_sizes;
+static size_t trace_samples_left = 0;
+
 extern "C" {
 
 struct trace_data {
     const char *name;
     void *data;
+    size_t size;
 };
 
-void allocate_trace_storage(size_t element_size) {
-    nnet::trace_enabled = true;
+// The outputs of the traced layers are written directly to the buffers supplied by the caller, each holding the output
+// of the layer (of the given size) for n_samples consecutive samples
+void allocate_trace_storage(size_t element_size, size_t n_samples, struct trace_data *c_trace_outputs, size_t n_traced) {
+    nnet::trace_enabled = n_samples > 0;
     nnet::trace_outputs = new std::map<std::string, void *>;
     nnet::trace_type_size = element_size;
-    // hls-fpga-machine-learning insert trace_outputs
+    for (size_t i = 0; i < n_traced; i++) {
+        nnet::trace_outputs->insert(std::pair<std::string, void *>(c_trace_outputs[i].name, c_trace_outputs[i].data));
+        trace_sizes[c_trace_outputs[i].name] = c_trace_outputs[i].size;
+    }
+    trace_samples_left = n_samples;
 }
 
 void free_trace_storage() {
-    for (std::map<std::string, void *>::iterator i = nnet::trace_outputs->begin(); i != nnet::trace_outputs->end(); i++) {
-        void *ptr = i->second;
-        free(ptr);
-    }
     nnet::trace_outputs->clear();
     delete nnet::trace_outputs;
     nnet::trace_outputs = NULL;
     nnet::trace_enabled = false;
+    trace_sizes.clear();
+    trace_samples_left = 0;
 }
 
-void collect_trace_output(struct trace_data *c_trace_outputs) {
-    int ii = 0;
+// Move the trace outputs to the next sample, disabling the tracing once all the samples are traced
+void advance_trace_storage() {
+    if (!nnet::trace_enabled) {
+        return;
+    }
+    if (--trace_samples_left == 0) {
+        nnet::trace_enabled = false;
+        return;
+    }
     for (std::map<std::string, void *>::iterator i = nnet::trace_outputs->begin(); i != nnet::trace_outputs->end(); i++) {
-        c_trace_outputs[ii].name = i->first.c_str();
-        c_trace_outputs[ii].data = i->second;
-        ii++;
+        i->second = (char *)i->second + trace_sizes[i->first] * nnet::trace_type_size;
     }
 }
 
@@ -76,6 +90,19 @@ void myproject_double(
 
     // hls-fpga-machine-learning unpack-struct
 }
+
+// Batched wrapper of top level function, processing n_samples consecutive samples in a single call
+void myproject_batch_float(
+    // hls-fpga-machine-learning insert batch header #float
+) {
+    // hls-fpga-machine-learning insert batch wrapper #float
+}
+
+void myproject_batch_double(
+    // hls-fpga-machine-learning insert batch header #double
+) {
+    // hls-fpga-machine-learning insert batch wrapper #double
+}
 }
 
 #endif
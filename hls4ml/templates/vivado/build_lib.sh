@@ -23,7 +23,65 @@ LIB_STAMP=mystamp
 BASEDIR="$(cd "$(dirname "$0")" && pwd)"
 WEIGHTS_DIR="\"${BASEDIR}/firmware/weights\""
 
-${CC} ${CFLAGS} ${INCFLAGS} -D WEIGHTS_DIR="${WEIGHTS_DIR}" -c firmware/${PROJECT}.cpp -o ${PROJECT}.o
-${CC} ${CFLAGS} ${INCFLAGS} -D WEIGHTS_DIR="${WEIGHTS_DIR}" -c ${PROJECT}_bridge.cpp -o ${PROJECT}_bridge.o
-${CC} ${CFLAGS} ${INCFLAGS} -shared ${PROJECT}.o ${PROJECT}_bridge.o -o firmware/${PROJECT}-${LIB_STAMP}.so
-rm -f *.o
+# Additional translation units of the network, compiled in parallel (set by the writer when CompileUnits > 1)
+UNITS=()
+# Number of parallel compile jobs
+JOBS=${HLS4ML_BUILD_JOBS:-$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 1)}
+# Objects are kept between builds and only recompiled if their preprocessed source (or the compiler) changed
+OBJDIR=obj
+
+DEFINES=(-D WEIGHTS_DIR="${WEIGHTS_DIR}")
+if [ ${#UNITS[@]} -gt 0 ]; then
+  DEFINES+=(-D HLS4ML_CSIM_UNITS)
+fi
+
+if command -v sha256sum &> /dev/null; then
+  HASH="sha256sum"
+elif command -v shasum &> /dev/null; then
+  HASH="shasum -a 256"
+else
+  HASH="cksum"
+fi
+
+CC_VERSION="$(${CC} --version 2>&1 | head -n 1)"
+
+signature() {
+  {
+    echo "${CC_VERSION}"
+    echo "${CC} ${CFLAGS} ${INCFLAGS} ${DEFINES[*]}"
+    ${CC} ${CFLAGS} ${INCFLAGS} "${DEFINES[@]}" -E "$1"
+  } | ${HASH} | cut -d ' ' -f 1
+}
+
+compile() {
+  local src=$1
+  local obj=${OBJDIR}/$(basename "${src%.*}").o
+  local sig
+  sig=$(signature "${src}")
+  if [ -f "${obj}" ] && [ -f "${obj%.o}.sig" ] && [ "${sig}" == "$(cat "${obj%.o}.sig")" ]; then
+    return 0
+  fi
+  rm -f "${obj%.o}.sig"
+  ${CC} ${CFLAGS} ${INCFLAGS} "${DEFINES[@]}" -c "${src}" -o "${obj}"
+  echo "${sig}" > "${obj%.o}.sig"
+}
+
+mkdir -p ${OBJDIR}
+
+SOURCES=(firmware/${PROJECT}.cpp ${PROJECT}_bridge.cpp "${UNITS[@]}")
+OBJECTS=()
+PIDS=()
+for src in "${SOURCES[@]}"; do
+  OBJECTS+=(${OBJDIR}/$(basename "${src%.*}").o)
+  compile "${src}" &
+  PIDS+=($!)
+  if [ ${#PIDS[@]} -ge ${JOBS} ]; then
+    wait ${PIDS[0]}
+    PIDS=("${PIDS[@]:1}")
+  fi
+done
+for pid in "${PIDS[@]}"; do
+  wait ${pid}
+done
+
+${CC} ${CFLAGS} ${INCFLAGS} -shared "${OBJECTS[@]}" -o firmware/${PROJECT}-${LIB_STAMP}.so
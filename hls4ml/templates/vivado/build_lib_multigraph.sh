@@ -21,18 +21,30 @@ WEIGHTS_DIR="\"${BASEDIR}/stitched/firmware/weights\""
 
 mkdir -p "${OUTPUT_DIR}"
 
-# Compile all graphs in parallel
+compile_graph() {
+    local g="$1"
+    ${CC} ${CFLAGS} "-I${BASEDIR}/${g}/firmware/ap_types/" -D WEIGHTS_DIR="${WEIGHTS_DIR}" \
+        -c "${BASEDIR}/${g}/firmware/${ORIGINAL_PROJECT}_${g}.cpp" -o "${ORIGINAL_PROJECT}_${g}.o"
+}
+
+# If graph names are given, only compile the objects of these graphs (used to compile the graphs in parallel from Python)
+if [ $# -gt 0 ]; then
+    for g in "$@"; do
+        compile_graph "${g}"
+    done
+    exit 0
+fi
+
+# Compile the graphs whose object is missing or older than their sources, in parallel
 OBJECT_FILES=()
 PIDS=()
 
 for g in "${graph_project_names[@]}"; do
-    SRC_FILE="${g}/firmware/${ORIGINAL_PROJECT}_${g}.cpp"
     OBJ_FILE="${ORIGINAL_PROJECT}_${g}.o"
-    AP_TYPES_PATH="-I${BASEDIR}/${g}/firmware/ap_types/"
-    (
-        ${CC} ${CFLAGS} ${AP_TYPES_PATH} -D WEIGHTS_DIR="${WEIGHTS_DIR}" -c "${BASEDIR}/${SRC_FILE}" -o "${OBJ_FILE}"
-    ) &
-    PIDS+=($!)
+    if [ ! -f "${OBJ_FILE}" ] || [ -n "$(find "${BASEDIR}/${g}/firmware" -newer "${OBJ_FILE}" -print -quit)" ]; then
+        compile_graph "${g}" &
+        PIDS+=($!)
+    fi
     OBJECT_FILES+=("${OBJ_FILE}")
     INCFLAGS+="-I${BASEDIR}/${g}/ "
 done
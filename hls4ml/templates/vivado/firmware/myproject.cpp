@@ -4,6 +4,7 @@
 #include "parameters.h"
 
 // hls-fpga-machine-learning insert namespace-start
+// hls-fpga-machine-learning insert compile-units
 
 void myproject(
     // hls-fpga-machine-learning insert header
@@ -11,6 +11,14 @@
 #include <stdlib.h>
 #include <vector>
 
+#if !defined(__SYNTHESIS__) && (defined(__unix__) || defined(__APPLE__))
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#define NNET_WEIGHTS_MMAP
+#endif
+
 namespace nnet {
 
 #ifndef __SYNTHESIS__
@@ -136,6 +144,103 @@ template <class T, size_t SIZE> void load_exponent_weights_from_txt(T *w, const
         }
     }
 }
+// Binary weight files hold the fields of the weights as consecutive little-endian doubles. The file is memory mapped
+// (if supported) and the values converted to the weight type, the same way as when parsed from text.
+class BinaryWeightsFile {
+  public:
+    BinaryWeightsFile(const char *fname, size_t n_values) : values_(NULL), n_bytes_(0), mapped_(false) {
+        std::string full_path = std::string(WEIGHTS_DIR) + "/" + std::string(fname);
+        size_t expected_bytes = n_values * sizeof(double);
+
+#ifdef NNET_WEIGHTS_MMAP
+        int fd = open(full_path.c_str(), O_RDONLY);
+        if (fd < 0) {
+            std::cerr << "ERROR: file " << full_path << " does not exist" << std::endl;
+            exit(1);
+        }
+        struct stat st;
+        if (fstat(fd, &st) == 0) {
+            n_bytes_ = st.st_size;
+        }
+        check_size(expected_bytes);
+        if (n_bytes_ > 0) {
+            void *addr = mmap(NULL, n_bytes_, PROT_READ, MAP_PRIVATE, fd, 0);
+            if (addr != MAP_FAILED) {
+                values_ = static_cast<const double *>(addr);
+                mapped_ = true;
+            }
+        }
+        close(fd);
+        if (mapped_) {
+            return;
+        }
+#endif
+
+        std::ifstream infile(full_path.c_str(), std::ios::binary | std::ios::ate);
+        if (infile.fail()) {
+            std::cerr << "ERROR: file " << full_path << " does not exist" << std::endl;
+            exit(1);
+        }
+        n_bytes_ = infile.tellg();
+        check_size(expected_bytes);
+        buffer_.resize(n_bytes_ / sizeof(double));
+        infile.seekg(0);
+        infile.read(reinterpret_cast<char *>(buffer_.data()), buffer_.size() * sizeof(double));
+        values_ = buffer_.data();
+    }
+
+    ~BinaryWeightsFile() {
+#ifdef NNET_WEIGHTS_MMAP
+        if (mapped_) {
+            munmap(const_cast<double *>(values_), n_bytes_);
+        }
+#endif
+    }
+
+    const double *values() const { return values_; }
+
+  private:
+    void check_size(size_t expected_bytes) {
+        if (n_bytes_ != expected_bytes) {
+            std::cerr << "ERROR: Expected " << expected_bytes / sizeof(double) << " values";
+            std::cerr << " but read " << n_bytes_ / sizeof(double) << " values" << std::endl;
+            exit(1);
+        }
+    }
+
+    const double *values_;
+    size_t n_bytes_;
+    bool mapped_;
+    std::vector<double> buffer_;
+};
+
+template <class T, size_t SIZE> void load_weights_from_bin(T *w, const char *fname) {
+    BinaryWeightsFile file(fname, SIZE);
+    const double *values = file.values();
+    for (size_t i = 0; i < SIZE; i++) {
+        w[i] = values[i];
+    }
+}
+
+template <class T, size_t SIZE> void load_compressed_weights_from_bin(T *w, const char *fname) {
+    BinaryWeightsFile file(fname, 3 * SIZE);
+    const double *values = file.values();
+    for (size_t i = 0; i < SIZE; i++) {
+        w[i].row_index = values[3 * i];
+        w[i].col_index = values[3 * i + 1];
+        w[i].weight = values[3 * i + 2];
+    }
+}
+
+template <class T, size_t SIZE> void load_exponent_weights_from_bin(T *w, const char *fname) {
+    BinaryWeightsFile file(fname, 2 * SIZE);
+    const double *values = file.values();
+    for (size_t i = 0; i < SIZE; i++) {
+        w[i].sign = values[2 * i];
+        w[i].weight = values[2 * i + 1];
+    }
+}
+
 template <class srcType, class dstType, size_t SIZE> void convert_data(srcType *src, dstType *dst) {
     for (size_t i = 0; i < SIZE; i++) {
         dst[i] = dstType(src[i]);
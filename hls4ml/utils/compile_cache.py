@@ -0,0 +1,206 @@
+"""Content-addressed cache of the C simulation libraries built by ``build_lib.sh``."""
+
+import functools
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+ENV_CACHE_DIR = 'HLS4ML_COMPILE_CACHE_DIR'
+ENV_CACHE_SIZE = 'HLS4ML_COMPILE_CACHE_SIZE'
+
+DEFAULT_MAX_SIZE = 2 * 1024**3  # 2 GB
+
+# Files of the generated project that can affect the compiled library
+_SOURCE_SUFFIXES = {'.bin', '.c', '.cc', '.cpp', '.h', '.hh', '.hpp', '.inc', '.sh', '.txt'}
+
+_UNSET = object()
+_compile_cache = _UNSET
+
+
+@functools.cache
+def _get_compiler_version(compiler):
+    try:
+        ret_val = subprocess.run([compiler, '--version'], text=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        return ret_val.stdout
+    except OSError:
+        return ''
+
+
+def _get_compiler(project_dir):
+    build_lib = Path(project_dir) / 'build_lib.sh'
+    if build_lib.exists():
+        match = re.search(r'^CC=(\S+)', build_lib.read_text(), flags=re.MULTILINE)
+        if match is not None:
+            return match.group(1)
+    return 'g++'
+
+
+class CompileCache:
+    """A cache of compiled C simulation libraries, keyed on the hash of the generated project.
+
+    The key covers the sources, headers, weights and build script of the project (and with it, the compiler flags), the
+    version of the compiler and the location of the project, as the compiled library refers to the weights in the
+    project directory. The unique stamp added to the generated code on every write is ignored, so rewriting an unchanged
+    model results in a cache hit. Least recently used libraries are evicted once the cache exceeds the maximum size.
+
+    Args:
+        cache_dir (str or Path): Directory where the compiled libraries are stored.
+        max_size (int, optional): Maximum size of the cache in bytes. Defaults to 2 GB.
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, project_dir, stamp=None):
+        """Compute the cache key of a generated project.
+
+        Args:
+            project_dir (str or Path): Output directory of the project.
+            stamp (str, optional): Unique stamp of the generated code, replaced by a placeholder before hashing.
+
+        Returns:
+            str: The key of the project.
+        """
+        project_dir = Path(project_dir).resolve()
+        files = [path for path in project_dir.iterdir() if path.is_file()]
+        if (project_dir / 'firmware').is_dir():
+            files += [path for path in (project_dir / 'firmware').rglob('*') if path.is_file()]
+        files = sorted(path for path in files if path.suffix in _SOURCE_SUFFIXES)
+
+        key_hash = hashlib.sha256()
+        key_hash.update(str(project_dir).encode())
+        key_hash.update(_get_compiler_version(_get_compiler(project_dir)).encode())
+        for path in files:
+            content = path.read_bytes()
+            if stamp:
+                content = content.replace(stamp.encode(), b'mystamp')
+            key_hash.update(str(path.relative_to(project_dir)).encode())
+            key_hash.update(len(content).to_bytes(8, 'little'))
+            key_hash.update(content)
+
+        return key_hash.hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f'{key}.so'
+
+    def get(self, key, lib_path):
+        """Copy the cached library to ``lib_path``, if one exists for the given key.
+
+        Args:
+            key (str): The key of the project.
+            lib_path (str or Path): Destination of the library.
+
+        Returns:
+            bool: True if the library was found in the cache, False otherwise.
+        """
+        entry = self._entry_path(key)
+        try:
+            shutil.copyfile(entry, lib_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+
+        os.utime(entry)  # Mark as recently used
+        self.hits += 1
+        return True
+
+    def put(self, key, lib_path):
+        """Store the library compiled for the given key and evict the least recently used entries if needed.
+
+        Args:
+            key (str): The key of the project.
+            lib_path (str or Path): The compiled library.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Copy under a temporary name first so that concurrent processes never see a partially written library
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(lib_path, tmp_path)
+        os.replace(tmp_path, self._entry_path(key))
+        self.evict()
+
+    def _entries(self):
+        if not self.cache_dir.is_dir():
+            return []
+        return [entry for entry in self.cache_dir.glob('*.so') if entry.is_file()]
+
+    def size(self):
+        """Total size of the cached libraries in bytes."""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self):
+        """Remove the least recently used libraries until the cache fits in the maximum size."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total_size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total_size <= self.max_size:
+                break
+            total_size -= entry.stat().st_size
+            entry.unlink(missing_ok=True)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all cached libraries."""
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def stats(self):
+        """Statistics of the cache use in the current process.
+
+        Returns:
+            dict: Number of hits, misses and evictions, along with the number of entries and the size of the cache.
+        """
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'size': sum(entry.stat().st_size for entry in entries),
+            'max_size': self.max_size,
+        }
+
+
+def set_compile_cache(cache_dir, max_size=DEFAULT_MAX_SIZE):
+    """Configure the cache of compiled libraries used by ``ModelGraph.compile()``.
+
+    Args:
+        cache_dir (str or Path): Directory where the compiled libraries are stored. If None, the cache is disabled.
+        max_size (int, optional): Maximum size of the cache in bytes. Defaults to 2 GB.
+
+    Returns:
+        CompileCache: The configured cache, or None if disabled.
+    """
+    global _compile_cache
+    if cache_dir is None:
+        _compile_cache = None
+    else:
+        _compile_cache = CompileCache(cache_dir, max_size=max_size)
+
+    return _compile_cache
+
+
+def get_compile_cache():
+    """Get the cache of compiled libraries.
+
+    Unless configured with ``set_compile_cache()``, the cache is enabled by setting the ``HLS4ML_COMPILE_CACHE_DIR``
+    environment variable to the cache directory. The maximum size (in bytes) can be set with
+    ``HLS4ML_COMPILE_CACHE_SIZE``.
+
+    Returns:
+        CompileCache: The cache, or None if caching is disabled.
+    """
+    if _compile_cache is _UNSET:
+        cache_dir = os.environ.get(ENV_CACHE_DIR, None)
+        max_size = int(os.environ.get(ENV_CACHE_SIZE, DEFAULT_MAX_SIZE))
+        set_compile_cache(cache_dir or None, max_size=max_size)
+
+    return _compile_cache
@@ -1,9 +1,189 @@
+import contextlib
+import copy
+import ctypes
+import functools
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 import yaml
 
-from hls4ml.model.graph import HLSConfig, ModelGraph
+from hls4ml.model.graph import HLSConfig, ModelGraph, _dlclose
+from hls4ml.utils.compile_cache import _SOURCE_SUFFIXES
+
+ENV_POOL_SIZE = 'HLS4ML_LIBRARY_POOL_SIZE'
+
+DEFAULT_POOL_SIZE = 16
+
+_library_pool = None
+
+
+class LibraryPool:
+    """A process-wide pool of loaded C simulation libraries of linked projects.
+
+    Libraries are loaded once and shared by all ``FilesystemModelGraph`` instances of the same project. Once the pool
+    holds more than the maximum number of libraries, the least recently used ones are unloaded with ``dlclose``.
+    Libraries used by a running ``predict()`` are never unloaded. A library that changed on disk (e.g., after being
+    rebuilt) is unloaded and loaded again.
+
+    Args:
+        max_size (int, optional): Maximum number of loaded libraries. Defaults to 16.
+    """
+
+    def __init__(self, max_size=DEFAULT_POOL_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._libs = OrderedDict()  # Path -> (file identity, library handle)
+        self._in_use = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _file_id(lib_path):
+        st = os.stat(lib_path)
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _unload(self, lib_path):
+        _, lib = self._libs.pop(lib_path)
+        _dlclose(lib)
+
+    def get(self, lib_path):
+        """Get the handle of a library, loading it if it is not in the pool or changed on disk.
+
+        Args:
+            lib_path (str or Path): Path to the library.
+
+        Returns:
+            ctypes.CDLL: The loaded library.
+        """
+        lib_path = str(Path(lib_path).resolve())
+        with self._lock:
+            file_id = self._file_id(lib_path)
+            if lib_path in self._libs:
+                loaded_id, lib = self._libs[lib_path]
+                if loaded_id == file_id:
+                    self._libs.move_to_end(lib_path)
+                    self.hits += 1
+                    return lib
+                # The dynamic loader would return the stale library for the same path, so it has to be unloaded first
+                if self._in_use.get(lib_path, 0) > 0:
+                    raise Exception(f'Cannot reload "{lib_path}" while it is in use')
+                self._unload(lib_path)
+
+            lib = ctypes.cdll.LoadLibrary(lib_path)
+            self._libs[lib_path] = (file_id, lib)
+            self.misses += 1
+            self.evict()
+            return lib
+
+    @contextlib.contextmanager
+    def use(self, lib_path):
+        """Get the handle of a library, preventing it from being unloaded for the duration of the context.
+
+        Args:
+            lib_path (str or Path): Path to the library.
+
+        Yields:
+            ctypes.CDLL: The loaded library.
+        """
+        lib_path = str(Path(lib_path).resolve())
+        with self._lock:
+            lib = self.get(lib_path)
+            self._in_use[lib_path] = self._in_use.get(lib_path, 0) + 1
+        try:
+            yield lib
+        finally:
+            with self._lock:
+                self._in_use[lib_path] -= 1
+                if self._in_use[lib_path] == 0:
+                    del self._in_use[lib_path]
+                self.evict()
+
+    def evict(self):
+        """Unload the least recently used libraries until the pool fits in the maximum size.
+
+        The most recently used library is kept, as it is about to be used by the caller of ``get()``.
+        """
+        with self._lock:
+            for lib_path in list(self._libs)[:-1]:
+                if len(self._libs) <= self.max_size:
+                    break
+                if lib_path not in self._in_use:
+                    self._unload(lib_path)
+                    self.evictions += 1
+
+    def discard(self, lib_path):
+        """Unload a library, if it is loaded and not in use.
+
+        Args:
+            lib_path (str or Path): Path to the library.
+        """
+        lib_path = str(Path(lib_path).resolve())
+        with self._lock:
+            if lib_path in self._libs and lib_path not in self._in_use:
+                self._unload(lib_path)
+
+    def clear(self):
+        """Unload all libraries that are not in use."""
+        with self._lock:
+            for lib_path in list(self._libs):
+                self.discard(lib_path)
+
+    def stats(self):
+        """Statistics of the pool.
+
+        Returns:
+            dict: Number of hits, misses and evictions, along with the number of loaded libraries.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._libs),
+                'max_size': self.max_size,
+            }
+
+
+def set_library_pool(max_size=DEFAULT_POOL_SIZE):
+    """Configure the pool of libraries loaded by linked projects, unloading the libraries of the previous pool.
+
+    Args:
+        max_size (int, optional): Maximum number of loaded libraries. Defaults to 16.
+
+    Returns:
+        LibraryPool: The configured pool.
+    """
+    global _library_pool
+    if _library_pool is not None:
+        _library_pool.clear()
+    _library_pool = LibraryPool(max_size=max_size)
+
+    return _library_pool
+
+
+def get_library_pool():
+    """Get the pool of libraries loaded by linked projects.
+
+    Unless configured with ``set_library_pool()``, the maximum number of loaded libraries can be set with the
+    ``HLS4ML_LIBRARY_POOL_SIZE`` environment variable.
+
+    Returns:
+        LibraryPool: The pool.
+    """
+    if _library_pool is None:
+        set_library_pool(int(os.environ.get(ENV_POOL_SIZE, DEFAULT_POOL_SIZE)))
+
+    return _library_pool
+
+
+@functools.lru_cache(maxsize=128)
+def _load_config(config_path, mtime_ns):
+    yaml.add_multi_constructor('!keras_model', lambda loader, suffix, node: None, Loader=yaml.SafeLoader)
+    with open(config_path) as config_file:
+        return yaml.safe_load(config_file)
 
 
 class FilesystemModelGraph(ModelGraph):
@@ -12,6 +192,9 @@ class FilesystemModelGraph(ModelGraph):
 
     This allows the user to call `compile()`, `predict()` and `build()` functions.
     All other methods are disabled and will raise an exception if accessed.
+
+    If the project was already compiled, and the library is newer than the sources of the project, it is used directly
+    without calling `compile()`. The libraries are loaded through a process-wide pool (see `get_library_pool()`).
     """
 
     def __init__(self, project_dir: str | Path):
@@ -28,10 +211,17 @@ class FilesystemModelGraph(ModelGraph):
         if not os.path.exists(project_dir / 'hls4ml_config.yml'):
             raise Exception(f'Cannot find hls4ml_config.yml in the directory {project_dir}.')
 
-        self._allowed_methods = {'compile', 'predict', 'build', 'get_input_variables', 'get_output_variables'}
+        self._allowed_methods = {
+            'compile',
+            'predict',
+            'predict_iter',
+            'build',
+            'get_input_variables',
+            'get_output_variables',
+        }
 
-        yaml.add_multi_constructor('!keras_model', lambda loader, suffix, node: None, Loader=yaml.SafeLoader)
-        config = yaml.safe_load(open(project_dir / 'hls4ml_config.yml'))
+        config_path = (project_dir / 'hls4ml_config.yml').resolve()
+        config = copy.deepcopy(_load_config(str(config_path), os.stat(config_path).st_mtime_ns))
 
         self.in_vars = []
         self.out_vars = []
@@ -43,7 +233,14 @@ class FilesystemModelGraph(ModelGraph):
             self.out_vars.append(var)
 
         self.config = HLSConfig(config)
-        self._top_function_lib = None
+        self._project_dir = project_dir
+        self._worker_libs = []
+        self._pinned_lib = None
+        self._pin_count = 0
+        self._pin_lock = threading.Lock()
+        self._lib_path = None
+        if self._is_library_up_to_date():
+            self._lib_path = self._get_library_path()
 
     def __getattribute__(self, name):
         # Allow access to private attributes and explicitly allowed methods
@@ -54,17 +251,79 @@ class FilesystemModelGraph(ModelGraph):
             raise Exception(f'The method "{name}" should not be invoked on FilesystemModelGraph.')
         return object.__getattribute__(self, name)
 
+    @property
+    def _top_function_lib(self):
+        if self._pinned_lib is not None:
+            return self._pinned_lib
+        if self._lib_path is None:
+            return None
+        return get_library_pool().get(self._lib_path)
+
+    def _get_library_path(self):
+        stamp = self.config.get_config_value('Stamp')
+        return self._project_dir / 'firmware' / f'{self.config.get_project_name()}-{stamp}.so'
+
+    def _is_library_up_to_date(self):
+        """Check if the compiled library of the project exists and is newer than all the sources of the project."""
+        if self.config.get_config_value('Stamp') is None:
+            return False
+        lib_path = self._get_library_path()
+        if not lib_path.is_file():
+            return False
+        lib_mtime = lib_path.stat().st_mtime_ns
+
+        files = [path for path in self._project_dir.iterdir() if path.is_file()]
+        if (self._project_dir / 'firmware').is_dir():
+            files += [path for path in (self._project_dir / 'firmware').rglob('*') if path.is_file()]
+        return all(path.stat().st_mtime_ns <= lib_mtime for path in files if path.suffix in _SOURCE_SUFFIXES)
+
+    @contextlib.contextmanager
+    def _use_library(self):
+        # Every call holds its own reference in the pool, so the library stays loaded until the last running call ends
+        if self._lib_path is None:
+            yield
+            return
+        with get_library_pool().use(self._lib_path) as lib:
+            with self._pin_lock:
+                self._pin_count += 1
+                self._pinned_lib = lib
+            try:
+                yield
+            finally:
+                with self._pin_lock:
+                    self._pin_count -= 1
+                    if self._pin_count == 0:
+                        self._pinned_lib = None
+
     def get_input_variables(self):
         return self.in_vars
 
     def get_output_variables(self):
         return self.out_vars
 
-    def compile(self):
-        return super()._compile()
+    def compile(self, force=False):
+        """Compile the project, unless the compiled library is up to date, and load the library.
+
+        Args:
+            force (bool, optional): Compile the project even if the library is up to date. Defaults to False.
+        """
+        if force or not self._is_library_up_to_date():
+            lib_path = self.config.backend.compile(self)
+        else:
+            lib_path = self._get_library_path()
+        for worker_lib in self._worker_libs:
+            _dlclose(worker_lib)
+        self._worker_libs = []
+        self._lib_path = lib_path
+        get_library_pool().get(lib_path)
+
+    def predict(self, x, n_workers=1, out=None, chunk_size=None):
+        with self._use_library():
+            return super().predict(x, n_workers=n_workers, out=out, chunk_size=chunk_size)
 
-    def predict(self, x):
-        return super().predict(x)
+    def predict_iter(self, x, chunk_size=1024, n_workers=1):
+        with self._use_library():
+            yield from super().predict_iter(x, chunk_size=chunk_size, n_workers=n_workers)
 
     def build(self, **kwargs):
         return self.config.backend.build(self, **kwargs)
@@ -12,21 +12,32 @@ from hls4ml.model.optimizer import optimize_model
 
 from .._version import version
 
+_BINARY_MAGIC = b'HLS4MLFM'
+_BINARY_ALIGNMENT = 64
 
-def serialize_model(model, file_path):
+
+def serialize_model(model, file_path, fmt='tar'):
     """
-    Serializes an hls4ml model into a compressed file format (.fml).
+    Serializes an hls4ml model into a file (.fml).
 
     This function saves the model's architecture, configuration, internal state,
-    and version information into a temporary directory. It then compresses the
-    directory into a `.fml` file (a tar.gz archive with a custom extension) at
-    the specified file path.
+    and version information into a single file at the specified file path. Two
+    formats are supported:
+
+    - ``'tar'``: The architecture, configuration and state are saved as JSON files
+      and the arrays as separate `.npy` files in a temporary directory, which is then
+      compressed into a tar.gz archive (with a custom extension).
+    - ``'binary'``: An uncompressed container holding a single JSON header followed by
+      the data of all arrays, each aligned to 64 bytes. Saving and loading is much faster
+      than with the ``'tar'`` format and the arrays are loaded lazily on first access.
 
     Args:
         model (ModelGraph): The hls4ml model to be serialized.
         file_path (str or pathlib.Path): The path where the serialized model
             will be saved. If the file extension is not `.fml`, it will be
             automatically appended.
+        fmt (str, optional): The format of the file, ``'tar'`` or ``'binary'``.
+            Defaults to ``'tar'``.
 
     Raises:
         OSError: If the file cannot be written or an I/O error occurs.
@@ -37,6 +48,9 @@ def serialize_model(model, file_path):
           the model configuration.
         - Existing files at the specified path will be overwritten.
     """
+    if fmt not in ('tar', 'binary'):
+        raise Exception(f'Unknown serialization format "{fmt}", expected "tar" or "binary"')
+
     arch_dict = {}
     for name, layer in model.graph.items():
         arch_dict[name] = layer.serialize()
@@ -44,10 +58,50 @@ def serialize_model(model, file_path):
     config_dict = model.config.serialize()
     graph_state_dict = model.serialize()
 
+    version_dict = {
+        'hls4ml': version,
+        'model_graph': '1',
+        # Leave space for versioning other things in the future (like layers)
+    }
+
+    if isinstance(file_path, str):
+        if not file_path.endswith('.fml'):
+            file_path += '.fml'
+        fml_path = Path(file_path)
+    elif isinstance(file_path, Path):
+        fml_path = file_path.with_suffix('.fml')
+
+    tb_files = {}
+    if config_dict.get('InputData', None) is not None:
+        tb_files['input_data_tb' + Path(config_dict['InputData']).suffix] = Path(config_dict['InputData'])
+    if config_dict.get('OutputPredictions', None) is not None:
+        tb_files['output_data_tb' + Path(config_dict['OutputPredictions']).suffix] = Path(config_dict['OutputPredictions'])
+
+    if fmt == 'binary':
+        arrays = {}
+
+        def store_array(arr, arr_name):
+            arrays[arr_name] = arr
+            return '@ndarray:' + arr_name
+
+        for layer_name, layer_dict in arch_dict.items():
+            _serialize_array_attrs(layer_dict, layer_name, store_array)
+
+        header = {
+            'version': version_dict,
+            'config': config_dict,
+            'graph_state': graph_state_dict,
+            'model_arch': arch_dict,
+        }
+        _write_binary(fml_path, header, arrays, tb_files)
+        return
+
     with tempfile.TemporaryDirectory(prefix='hls4ml_model_') as tmpdir:
         dest_path = Path(tmpdir)
         for layer_name, layer_dict in arch_dict.items():
-            _serialize_array_attrs(layer_dict, layer_name, dest_path)
+            _serialize_array_attrs(
+                layer_dict, layer_name, lambda arr, arr_name: _serialize_ndarray(arr, arr_name, dest_path)
+            )
 
         # Save the model architecture (ModelGraph.graph)
         arch_path = dest_path / 'model_arch.json'
@@ -59,14 +113,8 @@ def serialize_model(model, file_path):
         with open(config_path, 'w') as config_file:
             json.dump(config_dict, config_file, indent=4)
 
-        if config_dict.get('InputData', None) is not None:
-            tb_data_src_path = Path(config_dict['InputData'])
-            tb_data_dst_path = dest_path / ('input_data_tb' + tb_data_src_path.suffix)
-            tb_data_dst_path.write_bytes(tb_data_src_path.read_bytes())
-        if config_dict.get('OutputPredictions', None) is not None:
-            tb_data_src_path = Path(config_dict['OutputPredictions'])
-            tb_data_dst_path = dest_path / ('output_data_tb' + tb_data_src_path.suffix)
-            tb_data_dst_path.write_bytes(tb_data_src_path.read_bytes())
+        for tb_data_name, tb_data_src_path in tb_files.items():
+            (dest_path / tb_data_name).write_bytes(tb_data_src_path.read_bytes())
 
         # Save internal state (ModelGraph.inputs, .outputs, ._applied_flows)
         state_path = dest_path / 'graph_state.json'
@@ -76,33 +124,24 @@ def serialize_model(model, file_path):
         # Save version (hls4ml.version)
         version_path = dest_path / 'version.json'
         with open(version_path, 'w') as version_file:
-            version_dict = {
-                'hls4ml': version,
-                'model_graph': '1',
-                # Leave space for versioning other things in the future (like layers)
-            }
             json.dump(version_dict, version_file, indent=4)
 
         # Pack it all in a tar.gz but with a .fml extension
-        if isinstance(file_path, str):
-            if not file_path.endswith('.fml'):
-                file_path += '.fml'
-            tar_path = Path(file_path)
-        elif isinstance(file_path, Path):
-            tar_path = file_path.with_suffix('.fml')
-
-        if tar_path.exists():
-            os.remove(tar_path)
-        with tarfile.open(tar_path, mode='w:gz') as archive:
+        if fml_path.exists():
+            os.remove(fml_path)
+        with tarfile.open(fml_path, mode='w:gz') as archive:
             archive.add(dest_path, recursive=True, arcname='')
 
 
 def deserialize_model(file_path, output_dir=None):
     """
-    Deserializes an hls4ml model from a compressed file format (.fml).
+    Deserializes an hls4ml model from a file (.fml).
 
     This function extracts the model's architecture, configuration, internal state,
     and version information from the provided `.fml` file and returns a new instance of ModelGraph.
+    The format of the file (see `serialize_model`) is detected automatically. Models saved in the
+    ``'binary'`` format are read without a temporary directory, and their arrays are memory-mapped
+    (copy-on-write) from the file and only read on first access.
     If testbench data was provided during the serialization, it will be restored to the specified output directory.
 
     Args:
@@ -131,50 +170,42 @@ def deserialize_model(file_path, output_dir=None):
         output_dir = file_path.parent
     if isinstance(output_dir, str):
         output_dir = Path(output_dir)
-    with tempfile.TemporaryDirectory(prefix='hls4ml_model_') as tmpdir:
-        with tarfile.open(file_path, mode='r:gz') as archive:
-            archive.extractall(tmpdir)  # TODO For safety, we should only extract relevant files
-
-        src_path = Path(tmpdir)
-
-        # Load the model config (ModelGraph.config)
-        config_path = src_path / 'config.json'
-        with open(config_path) as config_file:
-            config_state = json.load(config_file)
-
-        config_dict = config_state['config']
-        if config_dict.get('InputData', None) is not None:
-            tb_data_src_path = src_path / ('input_data_tb' + Path(config_dict['InputData']).suffix)
-            tb_data_dst_path = output_dir / ('input_data_tb' + Path(config_dict['InputData']).suffix)
-            tb_data_dst_path.write_bytes(tb_data_src_path.read_bytes())
-            config_dict['InputData'] = str(tb_data_dst_path)
-        if config_dict.get('OutputPredictions', None) is not None:
-            tb_data_src_path = src_path / ('output_data_tb' + Path(config_dict['OutputPredictions']).suffix)
-            tb_data_dst_path = output_dir / ('output_data_tb' + Path(config_dict['OutputPredictions']).suffix)
-            tb_data_dst_path.write_bytes(tb_data_src_path.read_bytes())
-            config_dict['OutputPredictions'] = str(tb_data_dst_path)
-
-        config = HLSConfig.deserialize(config_state)
-
-        # Load internal state (ModelGraph.inputs, .outputs, ._applied_flows)
-        state_path = src_path / 'graph_state.json'
-        with open(state_path) as state_file:
-            graph_state_dict = json.load(state_file)
-
-        model = ModelGraph.from_saved_state(config, graph_state_dict)
-
-        # Load the model architecture (ModelGraph.graph)
-        arch_path = src_path / 'model_arch.json'
-        with open(arch_path) as arch_file:
-            arch_dict = json.load(arch_file)
-            for layer_name, layer_state in arch_dict.items():
-                _deserialize_array_attrs(src_path, layer_state)
-                kind = _deserialize_class_name(layer_state['class_name'])
-                attributes = _deserialize_layer_attrs(layer_state['state']['attributes'])
-                inputs = layer_state['state']['inputs']
-                outputs = layer_state['state']['outputs']
-                node = model.make_node(kind, layer_name, attributes, inputs, outputs, initialize=False)
-                model.graph[layer_name] = node
+
+    with open(file_path, 'rb') as fml_file:
+        is_binary = fml_file.read(len(_BINARY_MAGIC)) == _BINARY_MAGIC
+
+    if is_binary:
+        header, load_array, read_file = _open_binary(file_path)
+        model = _build_model(
+            header['config'], header['graph_state'], header['model_arch'], load_array, read_file, output_dir
+        )
+    else:
+        with tempfile.TemporaryDirectory(prefix='hls4ml_model_') as tmpdir:
+            with tarfile.open(file_path, mode='r:gz') as archive:
+                archive.extractall(tmpdir)  # TODO For safety, we should only extract relevant files
+
+            src_path = Path(tmpdir)
+
+            # Load the model config (ModelGraph.config)
+            with open(src_path / 'config.json') as config_file:
+                config_state = json.load(config_file)
+
+            # Load internal state (ModelGraph.inputs, .outputs, ._applied_flows)
+            with open(src_path / 'graph_state.json') as state_file:
+                graph_state_dict = json.load(state_file)
+
+            # Load the model architecture (ModelGraph.graph)
+            with open(src_path / 'model_arch.json') as arch_file:
+                arch_dict = json.load(arch_file)
+
+            model = _build_model(
+                config_state,
+                graph_state_dict,
+                arch_dict,
+                lambda arr_name: _deserialize_ndarray(src_path, arr_name),
+                lambda file_name: (src_path / file_name).read_bytes(),
+                output_dir,
+            )
 
     # This is a temporary hack until we restructure so we can apply the type transformation flow more intuitively
     _reapply_type_conversion_flow(model)
@@ -182,17 +213,123 @@ def deserialize_model(file_path, output_dir=None):
     return model
 
 
-def _serialize_array_attrs(attr_dict, layer_name, dest_dir):
+def _build_model(config_state, graph_state_dict, arch_dict, load_array, read_file, output_dir):
+    config_dict = config_state['config']
+    if config_dict.get('InputData', None) is not None:
+        tb_data_name = 'input_data_tb' + Path(config_dict['InputData']).suffix
+        tb_data_dst_path = output_dir / tb_data_name
+        tb_data_dst_path.write_bytes(read_file(tb_data_name))
+        config_dict['InputData'] = str(tb_data_dst_path)
+    if config_dict.get('OutputPredictions', None) is not None:
+        tb_data_name = 'output_data_tb' + Path(config_dict['OutputPredictions']).suffix
+        tb_data_dst_path = output_dir / tb_data_name
+        tb_data_dst_path.write_bytes(read_file(tb_data_name))
+        config_dict['OutputPredictions'] = str(tb_data_dst_path)
+
+    config = HLSConfig.deserialize(config_state)
+
+    model = ModelGraph.from_saved_state(config, graph_state_dict)
+
+    for layer_name, layer_state in arch_dict.items():
+        _deserialize_array_attrs(layer_state, load_array)
+        kind = _deserialize_class_name(layer_state['class_name'])
+        attributes = _deserialize_layer_attrs(layer_state['state']['attributes'])
+        inputs = layer_state['state']['inputs']
+        outputs = layer_state['state']['outputs']
+        node = model.make_node(kind, layer_name, attributes, inputs, outputs, initialize=False)
+        model.graph[layer_name] = node
+
+    return model
+
+
+def _align(offset):
+    return -(-offset // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+
+
+def _write_binary(file_path, header, arrays, files):
+    """Write the binary container: magic, header length, JSON header and the aligned data of the arrays and files."""
+    blobs = []
+    offset = 0
+
+    header['arrays'] = {}
+    for arr_name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        if arr.dtype.hasobject:
+            raise Exception(f'Cannot serialize array "{arr_name}" of object dtype')
+        header['arrays'][arr_name] = {
+            'descr': np.lib.format.dtype_to_descr(arr.dtype),
+            'shape': list(arr.shape),
+            'offset': offset,
+        }
+        blobs.append(arr)
+        offset = _align(offset + arr.nbytes)
+
+    header['files'] = {}
+    for file_name, src_path in files.items():
+        data = Path(src_path).read_bytes()
+        header['files'][file_name] = {'offset': offset, 'size': len(data)}
+        blobs.append(data)
+        offset = _align(offset + len(data))
+
+    header_bytes = json.dumps(header).encode()
+    data_start = _align(len(_BINARY_MAGIC) + 8 + len(header_bytes))
+
+    # Remove rather than overwrite, arrays of previously loaded models may still be mapped
+    if file_path.exists():
+        os.remove(file_path)
+    with open(file_path, 'wb') as fml_file:
+        fml_file.write(_BINARY_MAGIC)
+        fml_file.write(len(header_bytes).to_bytes(8, 'little'))
+        fml_file.write(header_bytes)
+        for blob in blobs:
+            fml_file.write(bytes(_align(fml_file.tell()) - fml_file.tell()))
+            fml_file.write(blob)
+        if fml_file.tell() < data_start:
+            fml_file.write(bytes(data_start - fml_file.tell()))
+
+
+def _open_binary(file_path):
+    """Read the header of the binary container and map its data, returning the header and functions to access it."""
+    with open(file_path, 'rb') as fml_file:
+        fml_file.seek(len(_BINARY_MAGIC))
+        header_size = int.from_bytes(fml_file.read(8), 'little')
+        header = json.loads(fml_file.read(header_size))
+    data_start = _align(len(_BINARY_MAGIC) + 8 + header_size)
+
+    # A single copy-on-write mapping of the whole data, the arrays are views into it that are read on first access
+    if os.path.getsize(file_path) > data_start:
+        data = np.memmap(file_path, dtype=np.uint8, mode='c', offset=data_start)
+    else:
+        data = np.zeros(0, dtype=np.uint8)
+
+    def load_array(arr_name):
+        arr_info = header['arrays'][arr_name.replace('@ndarray:', '')]
+        dtype = np.lib.format.descr_to_dtype(arr_info['descr'])
+        shape = tuple(arr_info['shape'])
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        if nbytes == 0:
+            return np.zeros(shape, dtype=dtype)
+        offset = arr_info['offset']
+        return data[offset : offset + nbytes].view(dtype).reshape(shape)
+
+    def read_file(file_name):
+        file_info = header['files'][file_name]
+        return data[file_info['offset'] : file_info['offset'] + file_info['size']].tobytes()
+
+    return header, load_array, read_file
+
+
+def _serialize_array_attrs(attr_dict, layer_name, store_array):
     for attr_name, attr_val in attr_dict.items():
         if isinstance(attr_val, dict):
-            _serialize_array_attrs(attr_val, layer_name, dest_dir)
+            _serialize_array_attrs(attr_val, layer_name, store_array)
         if isinstance(attr_val, np.ndarray):
             # arr_name ensures a nicer name for the data of weight variables and avoids name-clashing
             arr_name = layer_name
             if 'name' in attr_dict and attr_dict['name'] != layer_name:
                 arr_name += '_' + attr_dict['name']
             arr_name += '_' + attr_name
-            serialized_name = _serialize_ndarray(attr_val, arr_name, dest_dir)
+            serialized_name = store_array(attr_val, arr_name)
             attr_dict[attr_name] = serialized_name
         if isinstance(attr_val, np.integer):
             attr_dict[attr_name] = int(attr_val)
@@ -217,12 +354,12 @@ def _deserialize_layer_attrs(layer_attrs):
     return deserialized_attrs
 
 
-def _deserialize_array_attrs(src_dir, attr_dict):
+def _deserialize_array_attrs(attr_dict, load_array):
     for attr_name, attr_val in attr_dict.items():
         if isinstance(attr_val, dict):
-            _deserialize_array_attrs(src_dir, attr_val)
+            _deserialize_array_attrs(attr_val, load_array)
         if isinstance(attr_val, str) and attr_val.startswith('@ndarray:'):
-            arr = _deserialize_ndarray(src_dir, attr_val)
+            arr = load_array(attr_val)
             attr_dict[attr_name] = arr
 
 
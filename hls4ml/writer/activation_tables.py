@@ -0,0 +1,284 @@
+"""Lookup tables of the activation functions used by the Quartus and oneAPI backends.
+
+The tables are computed with NumPy and cached per (table, table size, precision), so writing many projects (or the same
+project many times) only computes each distinct table once. Only the tables used by the layers of the model are
+generated, the remaining tables are written as stubs that fail to compile if they are ever used.
+"""
+
+import functools
+import math
+import os
+import sys
+
+import numpy as np
+
+from hls4ml.utils.fixed_point_utils import FixedPointEmulator, ceil_log2, uint_to_binary
+
+DEFAULT_TABLE_SIZE = 1024
+
+# Default fixed point precision (width, integer bits, signed) of the inputs of the softmax tables, used if the precision
+# cannot be extracted from the layer attributes
+DEFAULT_EXP_PRECISION = (16, 6, True)
+DEFAULT_INV_PRECISION = (18, 8, True)
+
+# Tables used by each activation function
+ACTIVATION_TABLES = {
+    'elu': ['elu_table'],
+    'sigmoid': ['sigmoid_table'],
+    'tanh': ['tanh_table'],
+    'softplus': ['softplus_table'],
+    'softsign': ['softsign_table'],
+    'selu': ['selu_table'],
+}
+
+# Tables used by each implementation of softmax
+SOFTMAX_TABLES = {
+    'stable': ['exp_table', 'invert_table'],
+    'latency': ['exp_table_latency', 'invert_table_latency'],
+    'legacy': ['exp_table_legacy', 'invert_table_legacy'],
+    'argmax': [],
+}
+
+# Activation whose layers set the size of each table
+TABLE_ACTIVATIONS = {name: activation for activation, tables in ACTIVATION_TABLES.items() for name in tables}
+TABLE_ACTIVATIONS.update({name: 'softmax' for tables in SOFTMAX_TABLES.values() for name in tables})
+
+TABLE_NAMES = list(TABLE_ACTIVATIONS)
+
+
+def _centered_inputs(table_size, max_value):
+    # Inputs of the tables of functions symmetric around 0, sampled in the middle of each bin of [0, max_value)
+    i = np.arange(table_size, dtype=np.float64)
+    return i * max_value / float(table_size) + max_value / (float(table_size) * 2)
+
+
+def _fixed_point_inputs(table_size, precision, leading_bit):
+    """Values of the fixed point numbers whose top bits are set to the (binary) index of the table entry.
+
+    Vectorised equivalent of setting the most significant bits of a ``FixedPointEmulator`` to ``uint_to_binary(i, N)``,
+    with ``leading_bit`` (None, 'zero' or 'nonzero') controlling the extra bit inserted in front of the index.
+    """
+    fp_bits, fp_integer, fp_signed = precision
+    if not (0 < fp_integer <= fp_bits <= 53):
+        return None  # Not representable exactly as float64, use the emulator
+
+    N = ceil_log2(table_size)
+    i = np.arange(table_size, dtype=np.int64)
+    n_bits = np.where(i >= (1 << N), N + 1, N)  # uint_to_binary() uses more than N bits if the index doesn't fit
+    bits = i
+    if leading_bit is not None:
+        if leading_bit == 'nonzero':
+            bits = bits | ((i != 0).astype(np.int64) << n_bits)
+        n_bits = n_bits + 1
+
+    # Bits beyond the width of the fixed point number are dropped
+    shift = fp_bits - n_bits
+    word = (bits << np.maximum(shift, 0)) >> np.maximum(-shift, 0)
+    if fp_signed:
+        word = np.where(word >= (1 << (fp_bits - 1)), word - (1 << fp_bits), word)
+
+    return np.ldexp(word.astype(np.float64), fp_integer - fp_bits)
+
+
+def _emulated_inputs(table_size, precision, leading_bit):
+    fp_bits, fp_integer, fp_signed = precision
+    N = ceil_log2(table_size)
+    values = []
+    for i in range(table_size):
+        f = FixedPointEmulator(fp_bits, fp_integer, signed=fp_signed)
+        b = uint_to_binary(i, N)
+        if leading_bit is not None:
+            b.insert(0, 1 if leading_bit == 'nonzero' and i != 0 else 0)
+        f.set_msb_bits(b)
+        values.append(f.to_float())
+    return values
+
+
+def _exp_values(table_size, precision, leading_bit):
+    inputs = _fixed_point_inputs(table_size, precision, leading_bit)
+    inputs = inputs.tolist() if inputs is not None else _emulated_inputs(table_size, precision, leading_bit)
+    values = []
+    for x in inputs:
+        try:
+            values.append(round(math.exp(x), 12))
+        except OverflowError:
+            values.append(round(sys.float_info.max, 12))
+    return values
+
+
+def _inv_values(table_size, precision, leading_bit):
+    inputs = _fixed_point_inputs(table_size, precision, leading_bit)
+    inputs = inputs.tolist() if inputs is not None else _emulated_inputs(table_size, precision, leading_bit)
+    return [round(1.0 / x, 12) if x != 0 else round(sys.float_info.max, 12) for x in inputs]
+
+
+@functools.lru_cache(maxsize=256)
+def get_table_values(table_name, table_size, precision=None):
+    """Compute the values of a lookup table.
+
+    Args:
+        table_name (str): Name of the table, one of ``TABLE_NAMES``.
+        table_size (int): Number of entries of the table.
+        precision (tuple, optional): Fixed point precision (width, integer bits, signed) of the input of the exp and
+            invert tables of softmax. Defaults to None, using the default precision of the table.
+
+    Returns:
+        str: Comma-separated values of the table.
+    """
+    table_size = int(table_size)
+    if table_name in ['exp_table', 'exp_table_latency']:
+        leading_bit = 'nonzero' if table_name == 'exp_table' else None
+        values = _exp_values(table_size, precision or DEFAULT_EXP_PRECISION, leading_bit)
+    elif table_name in ['invert_table', 'invert_table_latency']:
+        leading_bit = 'zero' if table_name == 'invert_table' else None
+        values = _inv_values(table_size, precision or DEFAULT_INV_PRECISION, leading_bit)
+    elif table_name == 'invert_table_legacy':
+        i = np.arange(1, table_size, dtype=np.float64)
+        values = [0] + (1.0 / (64.0 * i / float(table_size))).tolist()
+    else:
+        if table_name in ['elu_table', 'selu_table']:
+            x = -8.0 * np.arange(table_size, dtype=np.float64) / float(table_size)
+        elif table_name in ['softplus_table', 'exp_table_legacy']:
+            x = 2 * 8.0 * (np.arange(table_size, dtype=np.float64) - float(table_size) / 2.0) / float(table_size)
+        elif table_name in ['sigmoid_table', 'softsign_table']:
+            x = _centered_inputs(table_size, 8)
+        elif table_name == 'tanh_table':
+            x = _centered_inputs(table_size, 4)
+        else:
+            raise Exception(f'Unknown activation table: {table_name}')
+
+        if table_name == 'elu_table':
+            values = np.exp(x) - 1.0
+        elif table_name == 'selu_table':
+            values = 1.0507009873554804934193349852946 * (1.6732632423543772848170429916717 * (np.exp(x) - 1.0))
+        elif table_name == 'softplus_table':
+            values = np.log(np.exp(x) + 1.0)
+        elif table_name == 'exp_table_legacy':
+            values = np.exp(x)
+        elif table_name == 'sigmoid_table':
+            values = 1.0 / (1 + np.exp(-x))
+            values = values[values >= 0.5]
+        elif table_name == 'tanh_table':
+            values = np.tanh(x)
+            values = values[values >= 0]
+        else:
+            values = x / (np.fabs(x) + 1.0)
+            values = values[values >= 0]
+        values = values.tolist()
+
+    return ', '.join(str(v) for v in values)
+
+
+def get_table_size(model, activation):
+    """Size of the table of an activation, taken from the first layer using it that specifies it."""
+    for layer in model.get_layers():
+        if (
+            layer.get_attr('activation') == activation or layer.get_attr('recurrent_activation') == activation
+        ) and layer.get_attr('table_size') is not None:
+            return int(layer.get_attr('table_size'))
+    return DEFAULT_TABLE_SIZE
+
+
+def _get_precision(ac_type, default):
+    if ac_type is None:
+        return default
+    try:
+        precision = ac_type.precision
+        return (precision.integer + precision.fractional, precision.integer, precision.signed)
+    except Exception:
+        # FixedPrecisionType wasn't correctly stored in layer attributes, use default values
+        return default
+
+
+def get_softmax_precisions(model):
+    """Precisions of the inputs of the exp and invert tables of softmax.
+
+    As in the Vivado code, the exp table uses the precision of the input of the softmax layer and the invert table uses
+    the precision of the exp table.
+
+    Returns:
+        tuple: Precisions (width, integer bits, signed) of the inputs of the exp and invert tables.
+    """
+    exp_precision, inv_precision = DEFAULT_EXP_PRECISION, DEFAULT_INV_PRECISION
+    for layer in model.get_layers():
+        if layer.name == 'softmax':
+            exp_precision = _get_precision(layer.get_input_variable().type, exp_precision)
+            inv_precision = _get_precision(layer.get_attr('exp_table_t'), inv_precision)
+    return exp_precision, inv_precision
+
+
+def get_used_tables(model):
+    """Names of the tables used by the layers of the model.
+
+    Args:
+        model (ModelGraph): the hls4ml model.
+
+    Returns:
+        set: Names of the used tables.
+    """
+    used_tables = set()
+    for layer in model.get_layers():
+        for attr in ['activation', 'recurrent_activation']:
+            activation = layer.get_attr(attr)
+            if not isinstance(activation, str):
+                continue
+            activation = activation.lower()
+            if activation == 'softmax':
+                implementation = str(layer.get_attr('implementation', 'stable')).lower()
+                used_tables.update(SOFTMAX_TABLES.get(implementation, SOFTMAX_TABLES['stable']))
+            else:
+                used_tables.update(ACTIVATION_TABLES.get(activation, []))
+    return used_tables
+
+
+def _get_stub(table_name):
+    # All implementations of softmax are instantiated by the dispatching function, so the stubs of its tables must compile
+    stub = f'// {table_name} is not used by the model\n'
+    if TABLE_ACTIVATIONS[table_name] != 'softmax':
+        stub += f'static_assert(sizeof(CONFIG_T) == 0, "{table_name} was not generated for this model");\n'
+    stub += f'static const typename CONFIG_T::table_t {table_name}[CONFIG_T::table_size] = {{}};\n'
+    return stub
+
+
+def _write_if_changed(file_path, content):
+    # Keeping the unchanged tables preserves their modification time, so they don't trigger a rebuild
+    if os.path.isfile(file_path):
+        with open(file_path) as f:
+            if f.read() == content:
+                return
+    with open(file_path, 'w') as f:
+        f.write(content)
+
+
+def write_activation_tables(model, path, table_prefix=''):
+    """Write the lookup tables of the activation functions used by the model as ``.tb`` files.
+
+    Args:
+        model (ModelGraph): the hls4ml model.
+        path (str): Directory to write the tables to.
+        table_prefix (str, optional): Code placed before the declaration of each table. Defaults to ''.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    used_tables = get_used_tables(model)
+    exp_precision, inv_precision = get_softmax_precisions(model)
+    if 'exp_table' in used_tables and exp_precision[2] is False:
+        raise Exception('Softmax types need to be signed')
+    if 'invert_table' in used_tables and inv_precision[2] is False:
+        raise Exception('Softmax types need to be signed')
+
+    for table_name in TABLE_NAMES:
+        if table_name not in used_tables:
+            _write_if_changed(f'{path}/{table_name}.tb', _get_stub(table_name))
+            continue
+
+        table_size = get_table_size(model, TABLE_ACTIVATIONS[table_name])
+        precision = None
+        if table_name in ['exp_table', 'exp_table_latency']:
+            precision = exp_precision
+        elif table_name in ['invert_table', 'invert_table_latency']:
+            precision = inv_precision
+
+        content = table_prefix + f'static const typename CONFIG_T::table_t {table_name}[{table_size}] = {{'
+        content += get_table_values(table_name, table_size, precision) + '};\n'
+        _write_if_changed(f'{path}/{table_name}.tb', content)
@@ -8,7 +8,7 @@ from shutil import copyfile
 import numpy as np
 import yaml
 
-from hls4ml.writer.writers import Writer
+from hls4ml.writer.writers import Writer, write_tb_data
 
 config_filename = 'hls4ml_config.yml'
 
@@ -52,10 +52,10 @@ class LiberoWriter(Writer):
         # fill c++ array.
         # not including internal brackets for multidimensional case
         sep = ''
-        for x in var:
-            h_file.write(sep + x)
+        for chunk in var.format_data():
+            h_file.write(sep + chunk)
             if write_txt_file:
-                txt_file.write(sep + x)
+                txt_file.write(sep + chunk)
             sep = ', '
         h_file.write('};\n\n')
 
@@ -460,32 +460,6 @@ class LiberoWriter(Writer):
                     weights, model.config.get_output_dir(), namespace=namespace, write_txt_file=write_txt
                 )
 
-    def __make_dat_file(self, original_path, project_path):
-        """
-        Convert other input/output data types into a dat file, which is
-        a text file with the flattened matrix printed out. Note that ' ' is
-        assumed to be the delimiter.
-        """
-
-        # Take in data from current supported data files
-        if original_path[-3:] == 'npy':
-            data = np.load(original_path)
-        else:
-            raise Exception('Unsupported input/output data files.')
-
-        # Flatten data, just keep first dimension
-        data = data.reshape(data.shape[0], -1)
-
-        def print_data(f):
-            for i in range(data.shape[0]):
-                for j in range(data.shape[1]):
-                    f.write(str(data[i][j]) + ' ')
-                f.write('\n')
-
-        # Print out in dat file
-        with open(project_path, 'w') as f:
-            print_data(f)
-
     def write_test_bench(self, model):
         """Write the testbench files (myproject_test.cpp and input/output .dat files)
 
@@ -504,16 +478,10 @@ class LiberoWriter(Writer):
         output_predictions = model.config.get_config_value('OutputPredictions')
 
         if input_data:
-            if input_data[-3:] == 'dat':
-                copyfile(input_data, f'{out_dir}/tb_data/tb_input_features.dat')
-            else:
-                self.__make_dat_file(input_data, f'{out_dir}/tb_data/tb_input_features.dat')
+            write_tb_data(input_data, f'{out_dir}/tb_data/tb_input_features.dat')
 
         if output_predictions:
-            if output_predictions[-3:] == 'dat':
-                copyfile(output_predictions, f'{out_dir}/tb_data/tb_output_predictions.dat')
-            else:
-                self.__make_dat_file(output_predictions, f'{out_dir}/tb_data/tb_output_predictions.dat')
+            write_tb_data(output_predictions, f'{out_dir}/tb_data/tb_output_predictions.dat')
 
         tb_src = (filedir / '../templates/libero/myproject_test.cpp').resolve()
         tb_dst = Path(f'{out_dir}/{prj_name}_test.cpp').resolve()
@@ -717,18 +685,20 @@ class LiberoWriter(Writer):
                     top_level = indent + f'{prj_name}({all_vars});\n'
                     newline += top_level
 
-                elif '// hls-fpga-machine-learning insert trace_outputs' in line:
-                    newline = ''
-                    for layer in model.get_layers():
-                        func = layer.get_attr('function_cpp', None)
-                        if func and model.config.trace_output and layer.get_attr('trace', False):
-                            vars = layer.get_variables()
-                            for var in vars:
-                                newline += (
-                                    indent
-                                    + 'nnet::trace_outputs->insert(std::pair<std::string, void *>('
-                                    + f'"{layer.name}", (void *) malloc({var.size_cpp()} * element_size)));\n'
-                                )
+                elif '// hls-fpga-machine-learning insert batch header' in line:
+                    dtype = line.split('#', 1)[1].strip()
+                    newline = self._make_batch_bridge_header(
+                        dtype, [i.name for i in model_inputs], [o.name for o in model_outputs]
+                    )
+
+                elif '// hls-fpga-machine-learning insert batch wrapper' in line:
+                    dtype = line.split('#', 1)[1].strip()
+                    newline = self._make_batch_bridge_wrapper(
+                        f'{prj_name}_{dtype}',
+                        dtype,
+                        [(i.name, i.size_cpp()) for i in model_inputs],
+                        [(o.name, o.size_cpp()) for o in model_outputs],
+                    )
 
                 elif '// hls-fpga-machine-learning insert namespace' in line:
                     newline = ''
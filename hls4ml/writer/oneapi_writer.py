@@ -8,40 +8,14 @@ import numpy as np
 import yaml
 
 from hls4ml.backends import get_backend
-from hls4ml.utils.fixed_point_utils import FixedPointEmulator, ceil_log2, uint_to_binary
 from hls4ml.utils.string_utils import convert_to_pascal_case
-from hls4ml.writer.writers import Writer
+from hls4ml.writer import activation_tables
+from hls4ml.writer.writers import Writer, write_tb_data
 
 config_filename = 'hls4ml_config.yml'
 
 
 class OneAPIWriter(Writer):
-    def __make_dat_file(self, original_path, project_path):
-        """
-        Convert other input/output data types into a dat file, which is
-        a text file with the falttened matrix printed out. Note that ' ' is
-        assumed to be the delimiter.
-        """
-
-        # Take in data from current supported data files
-        if original_path[-3:] == 'npy':
-            data = np.load(original_path)
-        else:
-            raise Exception('Unsupported input/output data files.')
-
-        # Faltten data, just keep first dimension
-        data = data.reshape(data.shape[0], -1)
-
-        def print_data(f):
-            for i in range(data.shape[0]):
-                for j in range(data.shape[1]):
-                    f.write(str(data[i][j]) + ' ')
-                f.write('\n')
-
-        # Print out in dat file
-        with open(project_path, 'w') as f:
-            print_data(f)
-
     def get_max_reuse_factor(self, model):
         max_rf = 0
         for layer in model.get_layers():
@@ -77,8 +51,8 @@ class OneAPIWriter(Writer):
             # fill c++ array.
             # not including internal brackets for multidimensional case
             sep = ''
-            for x in var:
-                h_file.write(sep + x)
+            for chunk in var.format_data():
+                h_file.write(sep + chunk)
                 sep = ', '
             h_file.write('}};\n')
             h_file.write('\n#endif\n')
@@ -350,18 +324,10 @@ class OneAPIWriter(Writer):
         output_predictions = model.config.get_config_value('OutputPredictions')
 
         if input_data:
-            if input_data[-3:] == 'dat':
-                copyfile(input_data, f'{model.config.get_output_dir()}/tb_data/tb_input_features.dat')
-            else:
-                self.__make_dat_file(input_data, f'{model.config.get_output_dir()}/tb_data/tb_input_features.dat')
+            write_tb_data(input_data, f'{model.config.get_output_dir()}/tb_data/tb_input_features.dat')
 
         if output_predictions:
-            if output_predictions[-3:] == 'dat':
-                copyfile(output_predictions, f'{model.config.get_output_dir()}/tb_data/tb_output_predictions.dat')
-            else:
-                self.__make_dat_file(
-                    output_predictions, f'{model.config.get_output_dir()}/tb_data/tb_output_predictions.dat'
-                )
+            write_tb_data(output_predictions, f'{model.config.get_output_dir()}/tb_data/tb_output_predictions.dat')
 
         with (
             open(os.path.join(filedir, '../templates/oneapi/myproject_test.cpp')) as f,
@@ -473,18 +439,20 @@ class OneAPIWriter(Writer):
                     newline += '\n'
                     newline += indent + 'q.wait();\n'
 
-                elif '// hls-fpga-machine-learning insert trace_outputs' in line:
-                    newline = ''
-                    for layer in model.get_layers():
-                        func = layer.get_attr('function_cpp')
-                        if func and model.config.trace_output and layer.get_attr('trace', False):
-                            vars = layer.get_variables()
-                            for var in vars:
-                                newline += (
-                                    indent
-                                    + 'nnet::trace_outputs->insert(std::pair<std::string, void *>('
-                                    + f'"{layer.name}", (void *) malloc({var.size_cpp()} * element_size)));\n'
-                                )
+                elif '// hls-fpga-machine-learning insert batch header' in line:
+                    dtype = line.split('#', 1)[1].strip()
+                    newline = self._make_batch_bridge_header(
+                        dtype, [i.name for i in model_inputs], [o.name for o in model_outputs]
+                    )
+
+                elif '// hls-fpga-machine-learning insert batch wrapper' in line:
+                    dtype = line.split('#', 1)[1].strip()
+                    newline = self._make_batch_bridge_wrapper(
+                        f'{project_name}_{dtype}',
+                        dtype,
+                        [(i.name, i.size_cpp()) for i in model_inputs],
+                        [(o.name, o.size_cpp()) for o in model_outputs],
+                    )
 
                 else:
                     newline = line
@@ -549,372 +517,14 @@ class OneAPIWriter(Writer):
             dstpath = f'{model.config.get_output_dir()}/src/firmware/{dst}'
             copyfile(srcpath, dstpath)
 
-    def __get_table_size(self, model, activation):
-        for layer in model.get_layers():
-            if (
-                layer.get_attr('activation') == activation or layer.get_attr('recurrent_activation') == activation
-            ) and layer.get_attr('table_size') is not None:
-                return int(layer.get_attr('table_size'))
-        return 1024
-
-    def __get_table_header(self, table_name, table_size):
-        table_header = f'static const typename CONFIG_T::table_t {table_name}[{table_size}] = {{'
-        return table_header
-
-    def __write_elu_table(self, model, path):
-        table_name = 'elu_table'
-        table_size = self.__get_table_size(model, 'elu')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        sep = ''
-        for i in range(table_size):
-            in_val = -8.0 * i / float(table_size)
-            real_val = np.exp(in_val) - 1.0
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_sigmoid_table(self, model, path):
-        MAX_VALUE = 8
-        MIN_VALUE = 0
-
-        table_name = 'sigmoid_table'
-        table_size = self.__get_table_size(model, 'sigmoid')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        sep = ''
-        for i in range(int(table_size)):
-            in_val = (
-                i * (MAX_VALUE - MIN_VALUE) / float(table_size)
-                + (MAX_VALUE - MIN_VALUE) / (float(table_size) * 2)
-                + MIN_VALUE
-            )
-            real_val = 1.0 / (1 + np.exp(-in_val))
-            if real_val >= 0.5:
-                h_file.write(sep + str(real_val))
-                sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_tanh_table(self, model, path):
-        MAX_VALUE = 4
-        MIN_VALUE = 0
-
-        table_name = 'tanh_table'
-        table_size = self.__get_table_size(model, 'tanh')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        sep = ''
-        for i in range(table_size):
-            in_val = (
-                i * (MAX_VALUE - MIN_VALUE) / float(table_size)
-                + (MAX_VALUE - MIN_VALUE) / (float(table_size) * 2)
-                + MIN_VALUE
-            )
-            real_val = np.tanh(in_val)
-            if real_val >= 0:
-                h_file.write(sep + str(real_val))
-                sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_softplus_table(self, model, path):
-        table_name = 'softplus_table'
-        table_size = self.__get_table_size(model, 'softplus')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        sep = ''
-        for i in range(table_size):
-            in_val = 2 * 8.0 * (i - float(table_size) / 2.0) / float(table_size)
-            real_val = np.log(np.exp(in_val) + 1.0)
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_softsign_table(self, model, path):
-        MAX_VALUE = 8
-        MIN_VALUE = 0
-        table_name = 'softsign_table'
-        table_size = self.__get_table_size(model, 'softsign')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        sep = ''
-        for i in range(table_size):
-            in_val = (
-                i * (MAX_VALUE - MIN_VALUE) / float(table_size)
-                + (MAX_VALUE - MIN_VALUE) / (float(table_size) * 2)
-                + MIN_VALUE
-            )
-
-            real_val = in_val / (np.fabs(in_val) + 1.0)
-            if real_val >= 0:
-                h_file.write(sep + str(real_val))
-                sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_selu_table(self, model, path):
-        table_name = 'selu_table'
-        table_size = self.__get_table_size(model, 'selu')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        sep = ''
-        for i in range(table_size):
-            in_val = -8.0 * i / float(table_size)
-            real_val = 1.0507009873554804934193349852946 * (1.6732632423543772848170429916717 * (np.exp(in_val) - 1.0))
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_exp_table(self, model, path):
-        table_name = 'exp_table'
-        table_size = self.__get_table_size(model, 'softmax')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        # Default fixed point precision
-        # 6 bits for integer part, 10 bits for decimal - total, 16
-        fp_bits = 16
-        fp_integer = 6
-        fp_signed = True
-
-        # Exp table should use the same precision as exp_table, as seen in Vivado code
-        # init_exp_table<data_T, CONFIG_T>(exp_table);
-        for layer in model.get_layers():
-            if layer.name == 'softmax':
-                ac_type = layer.get_input_variable().type
-                if ac_type is not None:
-                    try:
-                        fp_bits = ac_type.precision.integer + ac_type.precision.fractional
-                        fp_integer = ac_type.precision.integer
-                        fp_signed = ac_type.precision.signed
-                    except Exception:
-                        # FixedPrecisionType wasn't correctly stored in layer attributes, use default values
-                        pass
-                    if fp_signed is False:
-                        raise Exception('Softmax types need to be signed')
-
-        sep = ''
-        N = ceil_log2(table_size)
-        for i in range(table_size):
-            f = FixedPointEmulator(fp_bits, fp_integer, signed=fp_signed)
-            b = uint_to_binary(i, N)
-            if i == 0:
-                b.insert(0, 0)
-            else:
-                b.insert(0, 1)
-            f.set_msb_bits(b)
-            real_val = f.exp_float()
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_invert_table(self, model, path):
-        table_name = 'invert_table'
-        table_size = self.__get_table_size(model, 'softmax')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        # Default fixed point precision, in case values from layer attributes cannot be extracted
-        # 8 bits for integer part, 10 bits for decimal - total, 18
-        fp_bits = 18
-        fp_integer = 8
-        fp_signed = True
-
-        # Invert table should use the same precision as exp_table, as seen in Vivado code
-        # init_invert_table<typename CONFIG_T::exp_table_t, CONFIG_T>(invert_table);
-        for layer in model.get_layers():
-            if layer.name == 'softmax':
-                ac_type = layer.get_attr('exp_table_t')
-                if ac_type is not None:
-                    try:
-                        fp_bits = ac_type.precision.integer + ac_type.precision.fractional
-                        fp_integer = ac_type.precision.integer
-                        fp_signed = ac_type.precision.signed
-                    except Exception:
-                        # FixedPrecisionType wasn't correctly stored in layer attributes, use default values
-                        pass
-                    if fp_signed is False:
-                        raise Exception('Softmax types need to be signed')
-
-        sep = ''
-        N = ceil_log2(table_size)
-        for i in range(table_size):
-            f = FixedPointEmulator(fp_bits, fp_integer, signed=fp_signed)
-            b = uint_to_binary(i, N)
-            b.insert(0, 0)
-            f.set_msb_bits(b)
-            real_val = f.inv_float()
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_exp_table_latency(self, model, path):
-        table_name = 'exp_table_latency'
-        table_size = self.__get_table_size(model, 'softmax')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        # Default fixed point precision
-        # 6 bits for integer part, 10 bits for decimal - total, 16
-        fp_bits = 16
-        fp_integer = 6
-        fp_signed = True
-
-        # Exp table should use the same precision as exp_table, as seen in Vivado code
-        # init_exp_table<data_T, CONFIG_T>(exp_table);
-        for layer in model.get_layers():
-            if layer.name == 'softmax':
-                ac_type = layer.get_input_variable().type
-                if ac_type is not None:
-                    try:
-                        fp_bits = ac_type.precision.integer + ac_type.precision.fractional
-                        fp_integer = ac_type.precision.integer
-                        fp_signed = ac_type.precision.signed
-                    except Exception:
-                        # FixedPrecisionType wasn't correctly stored in layer attributes, use default values
-                        pass
-
-        sep = ''
-        N = ceil_log2(table_size)
-        for i in range(table_size):
-            f = FixedPointEmulator(fp_bits, fp_integer, signed=fp_signed)
-            f.set_msb_bits(uint_to_binary(i, N))
-            real_val = f.exp_float()
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_invert_table_latency(self, model, path):
-        table_name = 'invert_table_latency'
-        table_size = self.__get_table_size(model, 'softmax')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        # Default fixed point precision, in case values from layer attributes cannot be extracted
-        # 8 bits for integer part, 10 bits for decimal - total, 18
-        fp_bits = 18
-        fp_integer = 8
-        fp_signed = True
-
-        # Invert table should use the same precision as exp_table, as seen in Vivado code
-        # init_invert_table<typename CONFIG_T::exp_table_t, CONFIG_T>(invert_table);
-        for layer in model.get_layers():
-            if layer.name == 'softmax':
-                ac_type = layer.get_attr('exp_table_t')
-                if ac_type is not None:
-                    try:
-                        fp_bits = ac_type.precision.integer + ac_type.precision.fractional
-                        fp_integer = ac_type.precision.integer
-                        fp_signed = ac_type.precision.signed
-                    except Exception:
-                        # FixedPrecisionType wasn't correctly stored in layer attributes, use default values
-                        pass
-
-        sep = ''
-        N = ceil_log2(table_size)
-        for i in range(table_size):
-            f = FixedPointEmulator(fp_bits, fp_integer, signed=fp_signed)
-            f.set_msb_bits(uint_to_binary(i, N))
-            real_val = f.inv_float()
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_exp_table_legacy(self, model, path):
-        table_name = 'exp_table_legacy'
-        table_size = self.__get_table_size(model, 'softmax')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        sep = ''
-        for i in range(table_size):
-            in_val = 2 * 8.0 * (i - float(table_size) / 2.0) / float(table_size)
-            real_val = np.exp(in_val)
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
-    def __write_invert_table_legacy(self, model, path):
-        table_name = 'invert_table_legacy'
-        table_size = self.__get_table_size(model, 'softmax')
-
-        h_file = open(f'{path}/{table_name}.tb', 'w')
-        h_file.write(self.__get_table_header(table_name, table_size))
-
-        sep = ''
-        for i in range(table_size):
-            real_val = 0
-            in_val = 64.0 * i / float(table_size)
-            if in_val > 0.0:
-                real_val = 1.0 / in_val
-            h_file.write(sep + str(real_val))
-            sep = ', '
-
-        h_file.write('};\n')
-        h_file.close()
-
     def write_activation_tables(self, model):
-        """Write the lookup tables for activation functions
+        """Write the lookup tables for activation functions used by the model
 
         Args:
             model (ModelGraph): the hls4ml model.
         """
-        # Output path
         dstpath = f'{model.config.get_output_dir()}/src/firmware/nnet_utils/activation_tables'
-        if not os.path.exists(dstpath):
-            os.mkdir(dstpath)
-
-        # Tables
-        # TODO - Only write tables needed by model, not all of them
-        self.__write_elu_table(model, dstpath)
-        self.__write_sigmoid_table(model, dstpath)
-        self.__write_tanh_table(model, dstpath)
-        self.__write_softplus_table(model, dstpath)
-        self.__write_softsign_table(model, dstpath)
-        self.__write_selu_table(model, dstpath)
-        self.__write_exp_table(model, dstpath)
-        self.__write_invert_table(model, dstpath)
-        self.__write_exp_table_latency(model, dstpath)
-        self.__write_invert_table_latency(model, dstpath)
-        self.__write_exp_table_legacy(model, dstpath)
-        self.__write_invert_table_legacy(model, dstpath)
+        activation_tables.write_activation_tables(model, dstpath)
 
     def write_generated_code(self, model):
         """Write the generated code (nnet_code_gen.h)
@@ -1,74 +1,80 @@
 import glob
 import os
+import re
 import stat
 import tarfile
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from shutil import copyfile, copytree, rmtree
 
 import numpy as np
 import yaml
 
-from hls4ml.writer.writers import Writer
+from hls4ml.model.types import InplaceTensorVariable
+from hls4ml.writer.writers import Writer, get_writer_processes, write_array_files, write_tb_data
 
 config_filename = 'hls4ml_config.yml'
 
 
 class VivadoWriter(Writer):
-    def print_array_to_cpp(self, var, odir, namespace=None, write_txt_file=True):
+    def print_array_to_cpp(self, var, odir, namespace=None, write_txt_file=True, weights_format='txt', executor=None):
         """Write a weights array to C++ header files.
 
         Args:
             var (WeightVariable): Weight to write
             odir (str): Output directory
             namespace (str, optional): Writes a namespace for the weights to avoid clashes with global variables.
-            write_txt_file (bool, optional): Write txt files in addition to .h files. Defaults to True.
+            write_txt_file (bool, optional): Write weight files loaded by the C simulation in addition to .h files.
+                Defaults to True.
+            weights_format (str, optional): Format of the weight files, 'txt' (text) or 'bin' (binary). Defaults to 'txt'.
+            executor (Executor, optional): If given, the files are written by the executor. Defaults to None.
+
+        Returns:
+            Future: The future of the write if an executor is given, None otherwise.
         """
 
-        h_file = open(f'{odir}/firmware/weights/{var.name}.h', 'w')
-        if write_txt_file:
-            txt_file = open(f'{odir}/firmware/weights/{var.name}.txt', 'w')
+        h_path = f'{odir}/firmware/weights/{var.name}.h'
+        txt_path = f'{odir}/firmware/weights/{var.name}.txt' if write_txt_file and weights_format == 'txt' else None
+        bin_path = f'{odir}/firmware/weights/{var.name}.bin' if write_txt_file and weights_format == 'bin' else None
 
         # meta data
-        h_file.write(f'//Numpy array shape {var.shape}\n')
-        h_file.write(f'//Min {np.min(var.min):.12f}\n')
-        h_file.write(f'//Max {np.max(var.max):.12f}\n')
-        h_file.write(f'//Number of zeros {var.nzeros}\n')
-        h_file.write('\n')
+        h_prefix = f'//Numpy array shape {var.shape}\n'
+        h_prefix += f'//Min {np.min(var.min):.12f}\n'
+        h_prefix += f'//Max {np.max(var.max):.12f}\n'
+        h_prefix += f'//Number of zeros {var.nzeros}\n'
+        h_prefix += '\n'
 
-        h_file.write(f'#ifndef {var.name.upper()}_H_\n')
-        h_file.write(f'#define {var.name.upper()}_H_\n')
-        h_file.write('\n')
+        h_prefix += f'#ifndef {var.name.upper()}_H_\n'
+        h_prefix += f'#define {var.name.upper()}_H_\n'
+        h_prefix += '\n'
 
         if namespace is not None:
-            h_file.write(f'namespace {namespace} {{\n\n')
+            h_prefix += f'namespace {namespace} {{\n\n'
 
         if write_txt_file:
-            h_file.write('#ifndef __SYNTHESIS__\n')
-            h_file.write(var.definition_cpp() + ';\n')
-            h_file.write('#else\n')
+            h_prefix += '#ifndef __SYNTHESIS__\n'
+            h_prefix += var.definition_cpp() + ';\n'
+            h_prefix += '#else\n'
 
-        h_file.write(var.definition_cpp() + ' = {')
+        h_prefix += var.definition_cpp() + ' = {'
 
         # fill c++ array.
         # not including internal brackets for multidimensional case
-        sep = ''
-        for x in var:
-            h_file.write(sep + x)
-            if write_txt_file:
-                txt_file.write(sep + x)
-            sep = ', '
-        h_file.write('};\n\n')
+        h_suffix = '};\n\n'
 
         if write_txt_file:
-            h_file.write('#endif\n')
-            txt_file.close()
+            h_suffix += '#endif\n'
 
         if namespace is not None:
-            h_file.write('}\n\n')
+            h_suffix += '}\n\n'
+
+        h_suffix += '\n#endif\n'
 
-        h_file.write('\n#endif\n')
-        h_file.close()
+        args = (h_path, txt_path, h_prefix, h_suffix, var.get_formatter(), bin_path)
+        if executor is not None:
+            return executor.submit(write_array_files, *args)
+        write_array_files(*args)
 
     def write_project_dir(self, model):
         """Write the base project directory
@@ -113,6 +119,223 @@ class VivadoWriter(Writer):
         elif mode == 'stream':
             return f'#pragma HLS STREAM variable={variable.name} depth={depth}'
 
+    @staticmethod
+    def _get_weights_format(model):
+        weights_format = model.config.get_writer_config().get('WeightsFormat', 'txt')
+        if weights_format not in ('txt', 'bin'):
+            raise Exception(f'Unsupported weights format "{weights_format}", expected "txt" or "bin"')
+        return weights_format
+
+    def _make_load_weights(self, weights, weights_format='txt'):
+        indent = '    '
+
+        newline = ''
+        newline += '    static bool loaded_weights = false;\n'
+        newline += '    if (!loaded_weights) {\n'
+
+        for w in weights:
+            if w.weight_class == 'CompressedWeightVariable':
+                newline += indent + '    nnet::load_compressed_weights_from_{}<{}, {}>({}, "{}.{}");\n'.format(
+                    weights_format, w.type.name, w.nonzeros, w.name, w.name, weights_format
+                )
+            elif w.weight_class == 'ExponentWeightVariable':
+                newline += indent + '    nnet::load_exponent_weights_from_{}<{}, {}>({}, "{}.{}");\n'.format(
+                    weights_format, w.type.name, w.data_length, w.name, w.name, weights_format
+                )
+            else:
+                newline += indent + '    nnet::load_weights_from_{}<{}, {}>({}, "{}.{}");\n'.format(
+                    weights_format, w.type.name, w.data_length, w.name, w.name, weights_format
+                )
+
+        newline += '        loaded_weights = true;'
+        newline += '    }\n'
+        newline += '#endif'
+
+        return newline
+
+    def _make_layer_call(self, model, layer):
+        func = layer.get_attr('function_cpp', None)
+        if not func:
+            return ''
+
+        newline = ''
+        if not isinstance(func, (list, set)):
+            func = [func]
+        if len(func) == 1:
+            newline += '    ' + func[0] + ' // ' + layer.name + '\n'
+        else:
+            newline += '    // ' + layer.name + '\n'
+            for line in func:
+                newline += '    ' + line + '\n'
+        if model.config.trace_output and layer.get_attr('trace', False):
+            vars = layer.get_variables()
+            newline += '#ifndef __SYNTHESIS__\n'
+            for var in vars:
+                newline += '    nnet::save_layer_output<{}>({}, "{}", {});\n'.format(
+                    var.type.name, var.name, layer.name, var.size_cpp()
+                )
+            newline += '#endif\n'
+        newline += '\n'
+
+        return newline
+
+    def _get_compile_units(self, model):
+        """Partition the layers of the model into the translation units of the C simulation library.
+
+        The number of units is set with the ``CompileUnits`` option of the writer config. Each unit is a function
+        (``myproject_unit<N>``) calling a contiguous group of layers, written to its own source file so that the units
+        are compiled in parallel and only the units that changed are recompiled. The variables passed between units are
+        declared in the top function, the weights and configs of each layer are only visible to the unit calling it.
+        Groups that would share weights or in-place variables are merged. The units are only used by ``build_lib.sh``
+        (by defining ``HLS4ML_CSIM_UNITS``), the top function used for synthesis is unchanged.
+
+        Args:
+            model (ModelGraph): the hls4ml model.
+
+        Returns:
+            dict: Unit name mapped to the layers and the local, shared and parameter variables of the unit, or None
+                if the model is compiled as a single translation unit.
+        """
+        n_units = model.config.get_writer_config().get('CompileUnits', 1)
+        if n_units is None or n_units <= 1:
+            return None
+
+        model_io = list(model.get_input_variables()) + list(model.get_output_variables())
+        weights = model.get_weight_variables()
+        if any(w.storage.lower() == 'bram' for w in weights) or any(isinstance(v, InplaceTensorVariable) for v in model_io):
+            return None
+
+        layers = list(model.get_layers())
+        n_calls = sum(1 for layer in layers if layer.get_attr('function_cpp', None))
+        n_units = min(n_units, n_calls)
+        if n_units <= 1:
+            return None
+
+        # Contiguous groups with a similar number of layer calls, layers without a call go with the next call
+        groups = []
+        i_call = 0
+        for layer in layers:
+            i_unit = i_call * n_units // n_calls
+            if i_unit >= len(groups):
+                groups.append([])
+            groups[-1].append(layer)
+            if layer.get_attr('function_cpp', None):
+                i_call += 1
+
+        io_names = {v.name for v in model_io}
+        variables = OrderedDict((v.name, v) for v in model.get_input_variables())
+        for layer in layers:
+            for v in layer.get_variables():
+                if v.name not in io_names:
+                    variables.setdefault(v.name, v)
+        variables.update((v.name, v) for v in model.get_output_variables())
+        weight_names = {w.name for w in weights}
+
+        def referenced_names(group):
+            code = ''
+            for layer in group:
+                code += self._make_layer_call(model, layer)
+                for v in layer.get_variables():
+                    if v.name not in io_names and v.definition_cpp() is not None:
+                        code += v.definition_cpp() + ';\n'
+            return set(re.findall(r'\w+', code)) & (variables.keys() | weight_names)
+
+        while True:
+            group_names = [referenced_names(group) for group in groups]
+            users = {}
+            for i_group, names in enumerate(group_names):
+                for name in names:
+                    users.setdefault(name, []).append(i_group)
+
+            # Weights and in-place variables can't be passed between units
+            conflict = None
+            for name, used_by in users.items():
+                if len(used_by) > 1 and (name in weight_names or isinstance(variables[name], InplaceTensorVariable)):
+                    conflict = (min(used_by), max(used_by))
+                    break
+            if conflict is None:
+                break
+            first, last = conflict
+            groups[first : last + 1] = [sum(groups[first : last + 1], [])]
+
+        if len(groups) <= 1:
+            return None
+
+        compile_units = OrderedDict()
+        for i_group, (group, names) in enumerate(zip(groups, group_names)):
+            unit = {'layers': group}
+            unit['params'] = [
+                v for name, v in variables.items() if name in names and (name in io_names or len(users[name]) > 1)
+            ]
+            unit['shared'] = [v for v in unit['params'] if v.name not in io_names]
+            unit['locals'] = [
+                v
+                for layer in group
+                for v in layer.get_variables()
+                if v.name not in io_names and len(users.get(v.name, [])) <= 1
+            ]
+            compile_units[f'{model.config.get_project_name()}_unit{i_group}'] = unit
+
+        return compile_units
+
+    def _make_compile_unit_guard(self, i_unit):
+        return f'#if !defined(HLS4ML_CSIM_UNITS) || (defined(HLS4ML_CSIM_UNIT) && HLS4ML_CSIM_UNIT == {i_unit})\n'
+
+    def _make_compile_unit_prototype(self, unit_name, unit):
+        params = ', '.join(v.definition_cpp(as_reference=True) for v in unit['params'])
+        return f'void {unit_name}({params})'
+
+    def write_compile_units(self, model):
+        """Write the translation units of the C simulation library (myproject_unit<N>.cpp)
+
+        See ``_get_compile_units()`` for details.
+
+        Args:
+            model (ModelGraph): the hls4ml model.
+        """
+        firmware_dir = f'{model.config.get_output_dir()}/firmware'
+        for old_unit in glob.glob(f'{firmware_dir}/{model.config.get_project_name()}_unit*.cpp'):
+            os.remove(old_unit)
+
+        compile_units = self._get_compile_units(model)
+        if compile_units is None:
+            return
+
+        namespace = model.config.get_writer_config().get('Namespace', None)
+        indent = '    '
+
+        for i_unit, (unit_name, unit) in enumerate(compile_units.items()):
+            with open(f'{firmware_dir}/{unit_name}.cpp', 'w') as fout:
+                fout.write(f'#define HLS4ML_CSIM_UNIT {i_unit}\n\n')
+                fout.write(f'#include "{model.config.get_project_name()}.h"\n')
+                fout.write('#include "parameters.h"\n')
+                fout.write('\n')
+
+                if namespace is not None:
+                    fout.write(f'namespace {namespace} {{\n\n')
+
+                fout.write(self._make_compile_unit_prototype(unit_name, unit) + ' {\n')
+
+                weights = [w for layer in unit['layers'] for w in layer.get_weights()]
+                if model.config.get_writer_config()['WriteWeightsTxt'] and len(weights) > 0:
+                    fout.write('#ifndef __SYNTHESIS__\n')
+                    weights_format = self._get_weights_format(model)
+                    fout.write(self._make_load_weights(weights, weights_format) + '\n\n')
+
+                for var in unit['locals']:
+                    def_cpp = var.definition_cpp()
+                    if def_cpp is not None:
+                        fout.write(indent + def_cpp + ';\n')
+                fout.write('\n')
+
+                for layer in unit['layers']:
+                    fout.write(self._make_layer_call(model, layer))
+
+                fout.write('}\n')
+
+                if namespace is not None:
+                    fout.write('\n}\n')
+
     def write_project_cpp(self, model):
         """Write the main architecture source file (myproject.cpp)
 
@@ -128,6 +351,7 @@ class VivadoWriter(Writer):
         model_inputs = model.get_input_variables()
         model_outputs = model.get_output_variables()
         model_brams = [var for var in model.get_weight_variables() if var.storage.lower() == 'bram']
+        compile_units = self._get_compile_units(model)
 
         indent = '    '
 
@@ -165,34 +389,13 @@ class VivadoWriter(Writer):
             elif '// hls-fpga-machine-learning insert load weights' in line:
                 newline = line
                 if model.config.get_writer_config()['WriteWeightsTxt']:
-                    newline += '#ifndef __SYNTHESIS__\n'
-                    newline += '    static bool loaded_weights = false;\n'
-                    newline += '    if (!loaded_weights) {\n'
-
-                    for layer in model.get_layers():
-                        for w in layer.get_weights():
-                            if w.weight_class == 'CompressedWeightVariable':
-                                newline += (
-                                    indent
-                                    + '    nnet::load_compressed_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
-                                        w.type.name, w.nonzeros, w.name, w.name
-                                    )
-                                )
-                            elif w.weight_class == 'ExponentWeightVariable':
-                                newline += (
-                                    indent
-                                    + '    nnet::load_exponent_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
-                                        w.type.name, w.data_length, w.name, w.name
-                                    )
-                                )
-                            else:
-                                newline += indent + '    nnet::load_weights_from_txt<{}, {}>({}, "{}.txt");\n'.format(
-                                    w.type.name, w.data_length, w.name, w.name
-                                )
-
-                    newline += '        loaded_weights = true;'
-                    newline += '    }\n'
-                    newline += '#endif'
+                    if compile_units is None:
+                        newline += '#ifndef __SYNTHESIS__\n'
+                    else:
+                        # Each translation unit of the C simulation library loads the weights of its own layers
+                        newline += '#if !defined(__SYNTHESIS__) && !defined(HLS4ML_CSIM_UNITS)\n'
+                    weights_format = self._get_weights_format(model)
+                    newline += self._make_load_weights(model.get_weight_variables(), weights_format)
 
             # Add input/output type
             elif '// hls-fpga-machine-learning insert IO' in line:
@@ -230,8 +433,24 @@ class VivadoWriter(Writer):
                         newline += indent + '#pragma HLS INTERFACE bram port={} \n'.format(','.join(all_brams))
                     newline += pipeline_pragma
 
+            elif '// hls-fpga-machine-learning insert compile-units' in line:
+                newline = ''
+                if compile_units is not None:
+                    newline += '\n#ifdef HLS4ML_CSIM_UNITS\n'
+                    for unit_name, unit in compile_units.items():
+                        newline += self._make_compile_unit_prototype(unit_name, unit) + ';\n'
+                    newline += '#endif\n'
+
             elif '// hls-fpga-machine-learning insert layers' in line:
                 newline = line + '\n'
+                if compile_units is not None:
+                    newline += '#ifdef HLS4ML_CSIM_UNITS\n'
+                    shared_vars = {var.name: var for unit in compile_units.values() for var in unit['shared']}
+                    for var in shared_vars.values():
+                        newline += indent + var.definition_cpp() + ';\n'
+                    for unit_name, unit in compile_units.items():
+                        newline += indent + '{}({});\n'.format(unit_name, ', '.join(var.name for var in unit['params']))
+                    newline += '#else\n'
                 for layer in model.get_layers():
                     vars = layer.get_variables()
                     for var in vars:
@@ -242,25 +461,9 @@ class VivadoWriter(Writer):
                                 if var.pragma:
                                     newline += '    ' + self._make_array_pragma(var) + '\n\n'
                 for layer in model.get_layers():
-                    func = layer.get_attr('function_cpp', None)
-                    if func:
-                        if not isinstance(func, (list, set)):
-                            func = [func]
-                        if len(func) == 1:
-                            newline += '    ' + func[0] + ' // ' + layer.name + '\n'
-                        else:
-                            newline += '    // ' + layer.name + '\n'
-                            for line in func:
-                                newline += '    ' + line + '\n'
-                        if model.config.trace_output and layer.get_attr('trace', False):
-                            vars = layer.get_variables()
-                            newline += '#ifndef __SYNTHESIS__\n'
-                            for var in vars:
-                                newline += '    nnet::save_layer_output<{}>({}, "{}", {});\n'.format(
-                                    var.type.name, var.name, layer.name, var.size_cpp()
-                                )
-                            newline += '#endif\n'
-                        newline += '\n'
+                    newline += self._make_layer_call(model, layer)
+                if compile_units is not None:
+                    newline += '#endif\n'
 
             # Just copy line
             else:
@@ -442,6 +645,13 @@ class VivadoWriter(Writer):
         f = open(os.path.join(filedir, '../templates/vivado/firmware/parameters.h'))
         fout = open(f'{model.config.get_output_dir()}/firmware/parameters.h', 'w')
 
+        # With multiple translation units, each unit only sees the weights and configs of its own layers
+        compile_units = self._get_compile_units(model)
+        if compile_units is None:
+            unit_layers = [model.get_layers()]
+        else:
+            unit_layers = [unit['layers'] for unit in compile_units.values()]
+
         for line in f.readlines():
             if '// hls-fpga-machine-learning insert includes' in line:
                 newline = line
@@ -450,18 +660,28 @@ class VivadoWriter(Writer):
 
             elif '// hls-fpga-machine-learning insert weights' in line:
                 newline = line
-                for layer in model.get_layers():
-                    for w in layer.get_weights():
-                        if w.storage.lower() != 'bram':
-                            newline += f'#include "weights/{w.name}.h"\n'
+                for i_unit, layers in enumerate(unit_layers):
+                    if compile_units is not None:
+                        newline += self._make_compile_unit_guard(i_unit)
+                    for layer in layers:
+                        for w in layer.get_weights():
+                            if w.storage.lower() != 'bram':
+                                newline += f'#include "weights/{w.name}.h"\n'
+                    if compile_units is not None:
+                        newline += '#endif\n'
 
             elif '// hls-fpga-machine-learning insert layer-config' in line:
                 newline = line
-                for layer in model.get_layers():
-                    config = layer.get_attr('config_cpp', None)
-                    if config:
-                        newline += '// ' + layer.name + '\n'
-                        newline += config + '\n'
+                for i_unit, layers in enumerate(unit_layers):
+                    if compile_units is not None:
+                        newline += self._make_compile_unit_guard(i_unit)
+                    for layer in layers:
+                        config = layer.get_attr('config_cpp', None)
+                        if config:
+                            newline += '// ' + layer.name + '\n'
+                            newline += config + '\n'
+                    if compile_units is not None:
+                        newline += '#endif\n'
 
             elif '// hls-fpga-machine-learning insert namespace-start' in line:
                 newline = ''
@@ -491,11 +711,11 @@ class VivadoWriter(Writer):
         """
         namespace = model.config.get_writer_config().get('Namespace', None)
         write_txt = model.config.get_writer_config().get('WriteWeightsTxt', True)
-        for layer in model.get_layers():
-            for weights in layer.get_weights():
-                self.print_array_to_cpp(
-                    weights, model.config.get_output_dir(), namespace=namespace, write_txt_file=write_txt
-                )
+        weights_format = self._get_weights_format(model)
+        weights = [w for layer in model.get_layers() for w in layer.get_weights()]
+        self._print_arrays_to_cpp(
+            weights, model.config.get_output_dir(), namespace, write_txt_file=write_txt, weights_format=weights_format
+        )
 
     def write_multigraph_weights(self, model):
         """Write the weights into header files
@@ -505,38 +725,27 @@ class VivadoWriter(Writer):
         """
         namespace = model.config.get_writer_config().get('Namespace', None)
         write_txt = model.config.get_writer_config().get('WriteWeightsTxt', True)
-        for g in model.graphs:
-            for layer in g.get_layers():
-                for weights in layer.get_weights():
-                    self.print_array_to_cpp(
-                        weights, model.config.get_output_dir(), namespace=namespace, write_txt_file=write_txt
-                    )
-
-    def __make_dat_file(self, original_path, project_path):
-        """
-        Convert other input/output data types into a dat file, which is
-        a text file with the falttened matrix printed out. Note that ' ' is
-        assumed to be the delimiter.
-        """
-
-        # Take in data from current supported data files
-        if original_path[-3:] == 'npy':
-            data = np.load(original_path)
-        else:
-            raise Exception('Unsupported input/output data files.')
-
-        # Faltten data, just keep first dimension
-        data = data.reshape(data.shape[0], -1)
-
-        def print_data(f):
-            for i in range(data.shape[0]):
-                for j in range(data.shape[1]):
-                    f.write(str(data[i][j]) + ' ')
-                f.write('\n')
-
-        # Print out in dat file
-        with open(project_path, 'w') as f:
-            print_data(f)
+        weights_format = self._get_weights_format(model)
+        weights = [w for g in model.graphs for layer in g.get_layers() for w in layer.get_weights()]
+        self._print_arrays_to_cpp(
+            weights, model.config.get_output_dir(), namespace, write_txt_file=write_txt, weights_format=weights_format
+        )
+
+    def _print_arrays_to_cpp(self, weights, odir, namespace=None, write_txt_file=True, weights_format='txt'):
+        # Large models spend most of the write formatting the weights, which can be spread over several processes
+        n_processes = min(get_writer_processes(), len(weights))
+        if n_processes <= 1:
+            for var in weights:
+                self.print_array_to_cpp(var, odir, namespace, write_txt_file, weights_format)
+            return
+
+        with ProcessPoolExecutor(max_workers=n_processes) as executor:
+            futures = [
+                self.print_array_to_cpp(var, odir, namespace, write_txt_file, weights_format, executor=executor)
+                for var in weights
+            ]
+            for future in futures:
+                future.result()
 
     def write_test_bench(self, model):
         """Write the testbench files (myproject_test.cpp and input/output .dat files)
@@ -554,18 +763,10 @@ class VivadoWriter(Writer):
         output_predictions = model.config.get_config_value('OutputPredictions')
 
         if input_data:
-            if input_data[-3:] == 'dat':
-                copyfile(input_data, f'{model.config.get_output_dir()}/tb_data/tb_input_features.dat')
-            else:
-                self.__make_dat_file(input_data, f'{model.config.get_output_dir()}/tb_data/tb_input_features.dat')
+            write_tb_data(input_data, f'{model.config.get_output_dir()}/tb_data/tb_input_features.dat')
 
         if output_predictions:
-            if output_predictions[-3:] == 'dat':
-                copyfile(output_predictions, f'{model.config.get_output_dir()}/tb_data/tb_output_predictions.dat')
-            else:
-                self.__make_dat_file(
-                    output_predictions, f'{model.config.get_output_dir()}/tb_data/tb_output_predictions.dat'
-                )
+            write_tb_data(output_predictions, f'{model.config.get_output_dir()}/tb_data/tb_output_predictions.dat')
 
         f = open(os.path.join(filedir, '../templates/vivado/myproject_test.cpp'))
         fout = open(f'{model.config.get_output_dir()}/{model.config.get_project_name()}_test.cpp', 'w')
@@ -733,18 +934,20 @@ class VivadoWriter(Writer):
                         o.type.name, dtype, o.size_cpp(), o.name, o.name
                     )
 
-            elif '// hls-fpga-machine-learning insert trace_outputs' in line:
-                newline = ''
-                for layer in model.get_layers():
-                    func = layer.get_attr('function_cpp', None)
-                    if func and model.config.trace_output and layer.get_attr('trace', False):
-                        vars = layer.get_variables()
-                        for var in vars:
-                            newline += (
-                                indent
-                                + 'nnet::trace_outputs->insert(std::pair<std::string, void *>('
-                                + f'"{layer.name}", (void *) malloc({var.size_cpp()} * element_size)));\n'
-                            )
+            elif '// hls-fpga-machine-learning insert batch header' in line:
+                dtype = line.split('#', 1)[1].strip()
+                newline = self._make_batch_bridge_header(
+                    dtype, [i.name for i in model_inputs], [o.name for o in model_outputs]
+                )
+
+            elif '// hls-fpga-machine-learning insert batch wrapper' in line:
+                dtype = line.split('#', 1)[1].strip()
+                newline = self._make_batch_bridge_wrapper(
+                    f'{model.config.get_project_name()}_{dtype}',
+                    dtype,
+                    [(i.name, i.size_cpp()) for i in model_inputs],
+                    [(o.name, o.size_cpp()) for o in model_outputs],
+                )
 
             elif '// hls-fpga-machine-learning insert namespace' in line:
                 newline = ''
@@ -862,18 +1065,20 @@ class VivadoWriter(Writer):
                             o.type.name, dtype, o.size_cpp(), o.name, o.name
                         )
 
-            elif '// hls-fpga-machine-learning insert trace_outputs' in line:
-                newline = ''
-                for layer in model.get_layers():
-                    func = layer.get_attr('function_cpp', None)
-                    if func and model.config.trace_output and layer.get_attr('trace', False):
-                        vars = layer.get_variables()
-                        for var in vars:
-                            newline += (
-                                indent
-                                + 'nnet::trace_outputs->insert(std::pair<std::string, void *>('
-                                + f'"{layer.name}", (void *) malloc({var.size_cpp()} * element_size)));\n'
-                            )
+            elif '// hls-fpga-machine-learning insert batch header' in line:
+                dtype = line.split('#', 1)[1].strip()
+                newline = self._make_batch_bridge_header(
+                    dtype, [i.name for i in model_inputs], [o.name for o in model_outputs]
+                )
+
+            elif '// hls-fpga-machine-learning insert batch wrapper' in line:
+                dtype = line.split('#', 1)[1].strip()
+                newline = self._make_batch_bridge_wrapper(
+                    f'{model.config.get_project_name()}_{dtype}',
+                    dtype,
+                    [(i.name, i.size_cpp()) for i in model_inputs],
+                    [(o.name, o.size_cpp()) for o in model_outputs],
+                )
 
             elif '// hls-fpga-machine-learning insert namespace' in line:
                 newline = ''
@@ -987,8 +1192,11 @@ class VivadoWriter(Writer):
         # build_lib.sh
         build_lib_src = (filedir / '../templates/vivado/build_lib.sh').resolve()
         build_lib_dst = Path(f'{model.config.get_output_dir()}/build_lib.sh').resolve()
+        compile_units = self._get_compile_units(model)
         with open(build_lib_src) as src, open(build_lib_dst, 'w') as dst:
             for line in src.readlines():
+                if line.startswith('UNITS=') and compile_units is not None:
+                    line = 'UNITS=({})\n'.format(' '.join(f'firmware/{unit_name}.cpp' for unit_name in compile_units))
                 line = line.replace('myproject', model.config.get_project_name())
                 line = line.replace('mystamp', model.config.get_config_value('Stamp'))
 
@@ -1125,6 +1333,7 @@ class VivadoWriter(Writer):
         if not is_multigraph:
             self.write_project_dir(model)
             self.write_project_cpp(model)
+            self.write_compile_units(model)
             self.write_project_header(model)
             self.write_weights(model)
             self.write_defines(model)
@@ -1,3 +1,110 @@
+import contextlib
+import json
+import os
+from shutil import copyfile
+
+import numpy as np
+
+ENV_WRITER_PROCESSES = 'HLS4ML_WRITER_PROCESSES'
+
+
+def get_writer_processes():
+    """Number of processes used to write the weights, set with the ``HLS4ML_WRITER_PROCESSES`` environment variable.
+
+    Returns:
+        int: The number of processes, 1 (the default) if the weights are written in the current process.
+    """
+    return max(1, int(os.environ.get(ENV_WRITER_PROCESSES, 1)))
+
+
+def write_array_files(h_path, txt_path, h_prefix, h_suffix, formatter, bin_path=None, chunk_size=2**16):
+    """Write the values of a weight array to a C++ header file, and optionally to a text and/or a binary file.
+
+    The values are formatted and written in chunks, placed in the header between ``h_prefix`` and ``h_suffix``. The binary
+    file holds the fields of the elements as consecutive little-endian doubles. They are parsed back from the formatted
+    values, so the C simulation loads the same values as when reading the text file or compiling the header.
+
+    Args:
+        h_path (str): Path of the header file.
+        txt_path (str): Path of the text file, or None to not write it.
+        h_prefix (str): Contents of the header before the values.
+        h_suffix (str): Contents of the header after the values.
+        formatter (WeightFormatter): Formatter of the values.
+        bin_path (str, optional): Path of the binary file, or None to not write it. Defaults to None.
+        chunk_size (int, optional): Number of values formatted and written at once. Defaults to 65536.
+    """
+    with contextlib.ExitStack() as stack:
+        h_file = stack.enter_context(open(h_path, 'w'))
+        txt_file = stack.enter_context(open(txt_path, 'w')) if txt_path is not None else None
+        bin_file = stack.enter_context(open(bin_path, 'wb')) if bin_path is not None else None
+        h_file.write(h_prefix)
+        sep = ''
+        for chunk in formatter.format(chunk_size):
+            h_file.write(sep + chunk)
+            if txt_file is not None:
+                txt_file.write(sep + chunk)
+            if bin_file is not None:
+                fields = np.fromstring(chunk.replace('{', '').replace('}', ''), dtype='<f8', sep=',')
+                bin_file.write(fields.tobytes())
+            sep = ', '
+        h_file.write(h_suffix)
+
+
+def write_tb_data(src_path, dst_path, chunk_size=4096):
+    """Write the input or output data of the testbench to a ``.dat`` file.
+
+    The ``.dat`` file is a text file with the flattened values of each sample on one line, followed by ' '. A ``.npy``
+    file is converted in chunks of samples, formatting the floating-point values with enough digits to be parsed back
+    to the same value. A ``.dat`` file is copied as is. The file is not written again if it is up to date, i.e., if it was
+    written from a source with the same path, size and modification time, as recorded in a ``.source`` file next to it.
+
+    Args:
+        src_path (str): Path of the data file (``.npy`` or ``.dat``).
+        dst_path (str): Path of the ``.dat`` file to write.
+        chunk_size (int, optional): Number of samples formatted and written at once. Defaults to 4096.
+    """
+    src_path = str(src_path)
+    src_stat = os.stat(src_path)
+    source = {'path': os.path.abspath(src_path), 'size': src_stat.st_size, 'mtime_ns': src_stat.st_mtime_ns}
+    source_path = f'{dst_path}.source'
+    if os.path.exists(dst_path) and os.path.exists(source_path):
+        with open(source_path) as source_file:
+            try:
+                if json.load(source_file) == source:
+                    return
+            except ValueError:
+                pass  # Unreadable record, write the file again
+
+    # The record is only written once the file is complete, so an interrupted write is not mistaken for an up to date file
+    if os.path.exists(source_path):
+        os.remove(source_path)
+
+    if src_path[-3:] == 'dat':
+        copyfile(src_path, dst_path)
+    elif src_path[-3:] == 'npy':
+        data = np.load(src_path, mmap_mode='r')
+        # Flatten data, just keep first dimension
+        data = data.reshape(data.shape[0], -1)
+        if np.issubdtype(data.dtype, np.floating):
+            # Enough significant digits for the values to round-trip
+            digits = int(np.ceil(1 + (np.finfo(data.dtype).nmant + 1) * np.log10(2)))
+            fmt = f'%.{digits}g '
+        elif np.issubdtype(data.dtype, np.integer) or data.dtype == bool:
+            fmt = '%d '
+        else:
+            raise Exception(f'Unsupported data type of testbench data: {data.dtype}')
+        row_fmt = fmt * data.shape[1] + '\n'
+        with open(dst_path, 'w') as dst_file:
+            for start in range(0, data.shape[0], chunk_size):
+                chunk = data[start : start + chunk_size]
+                dst_file.write((row_fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+    else:
+        raise Exception('Unsupported input/output data files.')
+
+    with open(source_path, 'w') as source_file:
+        json.dump(source, source_file)
+
+
 class Writer:
     def __init__(self):
         pass
@@ -5,6 +112,59 @@ class Writer:
     def write_hls(self, model):
         raise NotImplementedError
 
+    def _make_batch_bridge_header(self, dtype, input_names, output_names, indent='    '):
+        """Generate the parameter list of the batched bridge entry point (``myproject_batch_<dtype>``).
+
+        Args:
+            dtype (str): The C type of the arrays exchanged with Python (``float`` or ``double``).
+            input_names (list): Names of the input arrays.
+            output_names (list): Names of the output arrays.
+            indent (str, optional): Indentation prepended to each line. Defaults to four spaces.
+
+        Returns:
+            str: The parameter list, one group per line.
+        """
+        inputs_str = ', '.join([f'const {dtype} *{name}' for name in input_names])
+        outputs_str = ', '.join([f'{dtype} *{name}' for name in output_names])
+
+        newline = ''
+        newline += indent + inputs_str + ',\n'
+        newline += indent + outputs_str + ',\n'
+        newline += indent + 'size_t n_samples\n'
+
+        return newline
+
+    def _make_batch_bridge_wrapper(self, top_function, dtype, inputs, outputs, extra_args=None, indent='    '):
+        """Generate the body of the batched bridge entry point.
+
+        The generated loop calls the single-sample wrapper ``top_function`` on consecutive slices of the flat,
+        C-contiguous input and output buffers, so that the whole batch is processed with a single call from Python. When
+        tracing, the trace outputs are moved to the next sample after each call.
+
+        Args:
+            top_function (str): Name of the single-sample wrapper (e.g., ``myproject_float``).
+            dtype (str): The C type of the arrays exchanged with Python (``float`` or ``double``).
+            inputs (list): Tuples of (name, size) of the inputs, with size as a C++ expression.
+            outputs (list): Tuples of (name, size) of the outputs, with size as a C++ expression.
+            extra_args (list, optional): Additional arguments appended to the call. Defaults to None.
+            indent (str, optional): Base indentation. Defaults to four spaces.
+
+        Returns:
+            str: The loop over the samples in the batch.
+        """
+        args = [f'const_cast<{dtype} *>({name} + i * {size})' for name, size in inputs]
+        args += [f'{name} + i * {size}' for name, size in outputs]
+        if extra_args is not None:
+            args += extra_args
+
+        newline = ''
+        newline += indent + 'for (size_t i = 0; i < n_samples; i++) {\n'
+        newline += indent * 2 + f'{top_function}({", ".join(args)});\n'
+        newline += indent * 2 + 'advance_trace_storage();\n'
+        newline += indent + '}\n'
+
+        return newline
+
 
 writer_map = {}
 
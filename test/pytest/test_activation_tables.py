@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Activation, Dense
+from tensorflow.keras.models import Sequential
+
+import hls4ml
+from hls4ml.utils.fixed_point_utils import FixedPointEmulator, ceil_log2, uint_to_binary
+from hls4ml.writer.activation_tables import get_table_values
+
+test_root_path = Path(__file__).parent
+
+
+def _reference_values(table_name, table_size, precision):
+    # Per-entry computation of the tables of softmax with the fixed point emulator
+    fp_bits, fp_integer, fp_signed = precision
+    N = ceil_log2(table_size)
+    values = []
+    for i in range(table_size):
+        f = FixedPointEmulator(fp_bits, fp_integer, signed=fp_signed)
+        b = uint_to_binary(i, N)
+        if table_name == 'exp_table':
+            b.insert(0, 0 if i == 0 else 1)
+        elif table_name == 'invert_table':
+            b.insert(0, 0)
+        f.set_msb_bits(b)
+        values.append(f.exp_float() if table_name.startswith('exp') else f.inv_float())
+    return ', '.join(str(v) for v in values)
+
+
+@pytest.mark.parametrize('table_name', ['exp_table', 'invert_table', 'exp_table_latency', 'invert_table_latency'])
+@pytest.mark.parametrize('table_size', [1024, 1000, 64])
+@pytest.mark.parametrize('precision', [(16, 6, True), (18, 8, True), (10, 10, True), (12, 3, False)])
+def test_softmax_table_values(table_name, table_size, precision):
+    assert get_table_values(table_name, table_size, precision) == _reference_values(table_name, table_size, precision)
+
+
+def test_sigmoid_table_values():
+    values = np.array([float(v) for v in get_table_values('sigmoid_table', 1024).split(', ')])
+    x = np.arange(1024) * 8 / 1024 + 8 / 2048
+    np.testing.assert_allclose(values, 1 / (1 + np.exp(-x)))
+
+
+@pytest.mark.parametrize('backend', ['Quartus', 'oneAPI'])
+def test_write_used_tables(test_case_id, backend):
+    model = Sequential()
+    model.add(Dense(8, input_shape=(4,)))
+    model.add(Activation('sigmoid'))
+    model.add(Dense(4))
+    model.add(Activation('softmax', name='softmax'))
+    model.compile()
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend=backend)
+    config['LayerName']['softmax']['Implementation'] = 'latency'
+    output_dir = str(test_root_path / test_case_id)
+    hls_model = hls4ml.converters.convert_from_keras_model(model, hls_config=config, output_dir=output_dir, backend=backend)
+    hls_model.write()
+
+    table_dir = Path(output_dir) / ('src' if backend == 'oneAPI' else '') / 'firmware/nnet_utils/activation_tables'
+    for table_name in ['sigmoid_table', 'exp_table_latency', 'invert_table_latency']:
+        assert 'not used by the model' not in (table_dir / f'{table_name}.tb').read_text()
+    for table_name in ['tanh_table', 'elu_table', 'exp_table', 'invert_table_legacy']:
+        assert 'not used by the model' in (table_dir / f'{table_name}.tb').read_text()
+
+    # Unchanged tables are not written again
+    mtime = os.stat(table_dir / 'sigmoid_table.tb').st_mtime_ns
+    hls_model.write()
+    assert os.stat(table_dir / 'sigmoid_table.tb').st_mtime_ns == mtime
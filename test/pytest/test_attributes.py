@@ -0,0 +1,58 @@
+import numpy as np
+
+import hls4ml
+from hls4ml.model.types import NamedType, Source, TensorVariable, WeightVariable
+
+
+def _dense_model():
+    w = np.ones((2, 2))
+    b = np.ones(2)
+    layers = [
+        {'class_name': 'Input', 'name': 'layer0_input', 'input_shape': [2]},
+        {'class_name': 'Dense', 'name': 'layer0', 'n_in': 2, 'n_out': 2, 'weight_data': w, 'bias_data': b},
+    ]
+    config = {'HLSConfig': {'Model': {'Precision': 'ap_fixed<16,6>', 'ReuseFactor': 1}, 'Flows': []}}
+    config['OutputDir'] = 'hls4mlprj_attributes'
+    config['ProjectName'] = 'myprj'
+    config['IOType'] = 'io_parallel'
+    config['Backend'] = 'Vivado'
+    return hls4ml.model.ModelGraph.from_layer_list(config, layers)
+
+
+def test_attribute_views():
+    layer = _dense_model().graph['layer0']
+    attributes = layer.attributes
+
+    def check_views():
+        # The indexed views must agree with a scan of all attributes
+        for view, clazz in [
+            (layer.weights, WeightVariable),
+            (layer.variables, TensorVariable),
+            (layer.types, NamedType),
+            (layer.code, Source),
+        ]:
+            keys = [k.replace('__hls4ml_reserved_out_', '') for k, v in attributes.items() if isinstance(v, clazz)]
+            assert list(view) == keys
+            assert len(view) == len(keys)
+
+    check_views()
+    assert list(layer.weights) == ['weight', 'bias']
+
+    layer.set_attr('some_code', Source('int x;'))
+    assert list(layer.code) == ['some_code']
+    check_views()
+
+    # A key changing the class of its value keeps its position
+    layer.set_attr('n_in', NamedType('n_in_t', layer.types['result_t'].precision))
+    assert 'n_in' in list(layer.types)
+    check_views()
+
+    layer.set_attr('n_in', 2)
+    assert 'n_in' not in list(layer.types)
+    check_views()
+
+    del layer.attributes['some_code']
+    del layer.attributes['bias']
+    assert len(layer.code) == 0
+    assert list(layer.weights) == ['weight']
+    check_views()
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+
+import pytest
+
+from hls4ml.backends import backend as backend_registry
+from hls4ml.backends import get_available_backends, get_backend, register_backend
+
+
+def test_lazy_builtin_backends():
+    # Run in a fresh interpreter, as other tests may have already instantiated the backends
+    code = """
+import sys
+
+import hls4ml
+from hls4ml.backends.backend import backend_map
+from hls4ml.model.flow import get_flow
+
+
+def instantiated():
+    return sorted(name for name, backend in backend_map.items() if isinstance(backend, hls4ml.backends.Backend))
+
+
+assert not any(module.startswith('hls4ml.backends.vivado') for module in sys.modules)
+assert 'vitis' in hls4ml.backends.get_available_backends()
+assert instantiated() == []
+
+hls4ml.backends.get_backend('Vitis')
+assert instantiated() == ['vitis', 'vivado']
+
+get_flow('quartus:ip')
+assert instantiated() == ['quartus', 'vitis', 'vivado']
+
+from hls4ml.backends import VivadoAcceleratorBackend
+assert VivadoAcceleratorBackend.__name__ == 'VivadoAcceleratorBackend'
+"""
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_register_backend():
+    instances = []
+
+    class DummyBackend:
+        def __init__(self):
+            instances.append(self)
+
+    register_backend('DummyLazy', DummyBackend)
+    try:
+        assert 'dummylazy' in get_available_backends()
+        assert len(instances) == 0
+
+        backend = get_backend('DummyLazy')
+        assert instances == [backend]
+        assert get_backend('dummylazy') is backend
+        assert len(instances) == 1
+
+        with pytest.raises(Exception, match='already registered'):
+            register_backend('DummyLazy', DummyBackend)
+    finally:
+        backend_registry.backend_map.pop('dummylazy', None)
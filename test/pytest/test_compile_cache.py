@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import hls4ml
+from hls4ml.utils.compile_cache import set_compile_cache
+
+test_root_path = Path(__file__).parent
+
+
+def dense_model(output_dir, precision):
+    layers = [
+        {'class_name': 'Input', 'name': 'layer0_input', 'input_shape': [4]},
+        {
+            'class_name': 'Dense',
+            'name': 'layer0',
+            'n_in': 4,
+            'n_out': 2,
+            'weight_data': np.arange(8).reshape(4, 2) / 8,
+            'bias_data': np.ones(2),
+        },
+    ]
+    config = {'HLSConfig': {'Model': {'Precision': precision, 'ReuseFactor': 1}}}
+    config['OutputDir'] = output_dir
+    config['ProjectName'] = 'myprj'
+    config['IOType'] = 'io_parallel'
+    config['Backend'] = 'Vivado'
+    return hls4ml.model.ModelGraph.from_layer_list(config, layers)
+
+
+@pytest.fixture
+def compile_cache(test_case_id):
+    cache = set_compile_cache(test_root_path / test_case_id / 'cache')
+    cache.clear()
+    yield cache
+    set_compile_cache(None)
+
+
+def test_compile_cache(test_case_id, compile_cache):
+    odir = str(test_root_path / test_case_id / 'hls4mlprj')
+    X = np.random.rand(10, 4)
+
+    model = dense_model(odir, 'ap_fixed<16,6>')
+    model.compile()
+    y = model.predict(X)
+    assert compile_cache.stats()['misses'] == 1
+    assert compile_cache.stats()['entries'] == 1
+
+    # Rewriting the same model only changes the stamp
+    model = dense_model(odir, 'ap_fixed<16,6>')
+    model.compile()
+    np.testing.assert_array_equal(model.predict(X), y)
+    assert compile_cache.stats()['hits'] == 1
+
+    model = dense_model(odir, 'ap_fixed<8,3>')
+    model.compile()
+    assert compile_cache.stats()['misses'] == 2
+    assert compile_cache.stats()['entries'] == 2
+
+
+def test_compile_cache_eviction(test_case_id, compile_cache):
+    lib_size = 1024
+    compile_cache.max_size = 2 * lib_size
+    lib_path = test_root_path / test_case_id / 'lib.so'
+    lib_path.parent.mkdir(parents=True, exist_ok=True)
+    lib_path.write_bytes(bytes(lib_size))
+
+    for i, key in enumerate(['a', 'b', 'c']):
+        compile_cache.put(key, lib_path)
+        # Make the order of use explicit, regardless of the resolution of the file system timestamps
+        os.utime(compile_cache.cache_dir / f'{key}.so', (i, i))
+
+    assert compile_cache.stats()['entries'] == 2
+    assert compile_cache.stats()['evictions'] == 1
+    assert not compile_cache.get('a', lib_path)
+    assert compile_cache.get('c', lib_path)
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 import hls4ml
@@ -119,3 +121,45 @@ def test_flows(tester):
     expected = tester.expected_pass_order
     observed = tester.observed_pass_order
     assert success, f'Tester {i} fails: expected ({expected}), observed ({observed})'
+
+
+def test_flow_profiler(tmp_path):
+    model = dummy_flow_model()
+    model.flow_profiler.clear()
+    model.apply_flow('CReqBReqA')
+
+    report = model.flow_profiler.report()
+    assert [flow['name'] for flow in report] == ['CReqBReqA', 'BReqA', 'A']
+    for flow in report:
+        assert flow['time'] >= flow['self_time'] >= 0
+        assert flow['nodes_before'] == flow['nodes_after'] == 1
+        assert len(flow['passes']) == 1
+        pass_stats = flow['passes'][0]
+        assert pass_stats['name'] == flow['name'][0]
+        assert pass_stats['matches'] == pass_stats['transforms'] == 1
+        assert pass_stats['nodes_before'] == pass_stats['nodes_after'] == 1
+
+    summary = model.flow_profiler.pass_summary()
+    assert sorted(pass_stats['name'] for pass_stats in summary) == ['A', 'B', 'C']
+
+    model.flow_profiler.to_json(tmp_path / 'profile.json')
+    with open(tmp_path / 'profile.json') as f:
+        assert json.load(f) == report
+
+    model.flow_profiler.to_chrome_trace(tmp_path / 'trace.json')
+    with open(tmp_path / 'trace.json') as f:
+        events = json.load(f)['traceEvents']
+    assert sorted((event['cat'], event['name']) for event in events) == [
+        ('flow', 'A'),
+        ('flow', 'BReqA'),
+        ('flow', 'CReqBReqA'),
+        ('pass', 'A'),
+        ('pass', 'B'),
+        ('pass', 'C'),
+    ]
+    # Required flows are nested in the flows requiring them
+    flow_events = {event['name']: event for event in events if event['cat'] == 'flow'}
+    assert flow_events['CReqBReqA']['ts'] <= flow_events['BReqA']['ts'] <= flow_events['A']['ts']
+    assert (
+        flow_events['A']['ts'] + flow_events['A']['dur'] <= flow_events['CReqBReqA']['ts'] + flow_events['CReqBReqA']['dur']
+    )
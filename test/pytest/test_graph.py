@@ -1,3 +1,4 @@
+import ctypes
 from pathlib import Path
 
 import numpy as np
@@ -226,3 +227,155 @@ def test_multiple_outputs(test_case_id, batch):
     for y_i, y_hls_i in zip(y, y_hls):
         y_hls_i = y_hls_i.reshape(y_i.shape)
         np.testing.assert_allclose(y_i, y_hls_i, rtol=0)
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Quartus'])
+def test_batched_predict(test_case_id, backend):
+    """Test that the batched bridge entry point gives the same result as calling the model one sample at a time"""
+    input1 = tf.keras.layers.Input(shape=(8,))
+    input2 = tf.keras.layers.Input(shape=(4,))
+    x = tf.keras.layers.Dense(6, activation='relu')(input1)
+    x = tf.keras.layers.Concatenate()([x, input2])
+    output1 = tf.keras.layers.Dense(3)(x)
+    output2 = tf.keras.layers.Dense(2)(x)
+    model = tf.keras.models.Model(inputs=[input1, input2], outputs=[output1, output2])
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='model', default_precision='ap_fixed<32,16>')
+    odir = str(test_root_path / test_case_id)
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, output_dir=odir, backend=backend, io_type='io_parallel', hls_config=config
+    )
+    hls_model.compile()
+    assert hls_model._get_batch_function(ctypes.c_float) is not None
+
+    X1 = np.random.rand(50, 8).astype(np.float32)
+    X2 = np.random.rand(50, 4).astype(np.float32)
+    y_hls = hls_model.predict([X1, X2])
+    for i in range(X1.shape[0]):
+        y_hls_i = hls_model.predict([X1[i], X2[i]])
+        for y_j, y_hls_i_j in zip(y_hls, y_hls_i):
+            np.testing.assert_array_equal(y_j[i], y_hls_i_j)
+
+
+@pytest.mark.parametrize('iotype', ['io_parallel', 'io_stream'])
+def test_predict_n_workers(test_case_id, iotype):
+    """Test that splitting the batch across multiple threads gives the same result as the single-threaded predict"""
+    inputs = tf.keras.layers.Input(shape=(16, 3))
+    x = tf.keras.layers.Conv1D(4, 3, activation='relu')(inputs)
+    x = tf.keras.layers.Flatten()(x)
+    outputs = tf.keras.layers.Dense(5)(x)
+    model = tf.keras.models.Model(inputs=inputs, outputs=outputs)
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='model', default_precision='ap_fixed<32,16>')
+    odir = str(test_root_path / test_case_id)
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, output_dir=odir, backend='Vivado', io_type=iotype, hls_config=config
+    )
+    hls_model.compile()
+
+    X = np.random.rand(101, 16, 3)
+    y_hls = hls_model.predict(X)
+    y_hls_mt = hls_model.predict(X, n_workers=4)
+    np.testing.assert_array_equal(y_hls, y_hls_mt)
+    assert len(hls_model._worker_libs) == 3
+
+
+def test_predict_chunks(test_case_id, tmp_path):
+    """Test that chunked predictions, into a caller-owned buffer or from a generator, match the predict of the batch"""
+    input1 = tf.keras.layers.Input(shape=(8,))
+    input2 = tf.keras.layers.Input(shape=(4,))
+    x = tf.keras.layers.Concatenate()([input1, input2])
+    output1 = tf.keras.layers.Dense(3)(x)
+    output2 = tf.keras.layers.Dense(2)(x)
+    model = tf.keras.models.Model(inputs=[input1, input2], outputs=[output1, output2])
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='model', default_precision='ap_fixed<32,16>')
+    odir = str(test_root_path / test_case_id)
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, output_dir=odir, backend='Vivado', io_type='io_parallel', hls_config=config
+    )
+    hls_model.compile()
+
+    X1 = np.random.rand(103, 8).astype(np.float32)
+    X2 = np.random.rand(103, 4).astype(np.float32)
+    np.save(tmp_path / 'X1.npy', X1)
+    X1_mmap = np.load(tmp_path / 'X1.npy', mmap_mode='r')
+    y_hls = hls_model.predict([X1, X2])
+
+    y_chunked = hls_model.predict([X1_mmap, X2], chunk_size=10, n_workers=3)
+    for y_j, y_chunked_j in zip(y_hls, y_chunked):
+        np.testing.assert_array_equal(y_j, y_chunked_j)
+
+    out = [np.lib.format.open_memmap(tmp_path / 'y1.npy', mode='w+', dtype=np.float32, shape=(103, 3)), np.zeros((103, 2))]
+    assert hls_model.predict([X1_mmap, X2], out=out, chunk_size=16) is out
+    for y_j, out_j in zip(y_hls, out):
+        np.testing.assert_array_equal(y_j, out_j)
+
+    chunks = list(hls_model.predict_iter([X1_mmap, X2], chunk_size=25))
+    assert [len(chunk[0]) for chunk in chunks] == [25, 25, 25, 25, 3]
+    for j, y_j in enumerate(y_hls):
+        np.testing.assert_array_equal(y_j, np.concatenate([chunk[j] for chunk in chunks]))
+
+    with pytest.raises(Exception, match='Output size mismatch'):
+        hls_model.predict([X1, X2], out=[np.zeros((100, 3)), np.zeros((103, 2))])
+
+
+def test_graph_index():
+    model = branch_model('graph_index_model')
+
+    def names(nodes):
+        return [node.name for node in nodes]
+
+    def check_index():
+        # The index must agree with a scan of the graph
+        for node in model.get_layers():
+            for inp in node.inputs:
+                producers = [x for x in model.get_layers() if inp in x.outputs]
+                assert model.get_producer(inp) is (producers[0] if producers else None)
+            for out in node.outputs:
+                assert names(model.get_consumers(out)) == [x.name for x in model.get_layers() if out in x.inputs]
+
+    assert model.get_producer('layer0_input1').name == 'layer0_input1'
+    assert names(model.get_consumers('layer0_input1')) == ['layer0', 'layer1']
+    assert model.get_producer('missing') is None
+    assert model.get_consumers('missing') == []
+    assert names(model.graph.get_tensor_nodes(['layer0_input1', 'missing'])) == ['layer0_input1', 'layer0', 'layer1']
+    assert names(model.graph.get_consumers_of(['layer0', 'layer0_input1', 'missing'])) == ['layer0', 'layer1']
+    check_index()
+
+    # Direct changes to the inputs of a node are picked up
+    layer2 = model.graph['layer2']
+    layer2.inputs[0] = 'layer0_input1'
+    assert names(model.get_consumers('layer0_input1')) == ['layer0', 'layer1', 'layer2']
+    assert names(model.get_consumers('layer0_input0')) == ['layer0']
+    layer2.inputs = ['layer0_input0', 'layer1']
+    check_index()
+
+    attrs = {'n_in': 1, 'n_out': 1, 'weight_data': w, 'bias_data': b}
+    new_node = model.make_node('Dense', 'dense', attrs, ['layer0'])
+    model.insert_node(new_node, before=model.graph['layer1'], input_idx=1)
+    assert names(model.get_layers()) == ['layer0_input0', 'layer0_input1', 'layer0', 'dense', 'layer1', 'layer2']
+    assert names(model.get_consumers('dense')) == ['layer1']
+    assert names(model.get_consumers('layer0')) == ['dense']
+    check_index()
+
+    new_node = model.make_node('Dense', 'dense_new', attrs, ['layer0'])
+    model.replace_node(model.graph['dense'], new_node)
+    assert names(model.get_layers()) == ['layer0_input0', 'layer0_input1', 'layer0', 'dense_new', 'layer1', 'layer2']
+    assert model.get_producer('dense_new') is new_node
+    assert model.get_producer('dense') is None
+    check_index()
+
+    new_node1 = model.make_node('Dense', 'dense1', attrs, ['layer0'])
+    new_node2 = model.make_node('Dense', 'dense2', attrs, ['dense1'])
+    model.split_node(model.graph['dense_new'], new_node1, new_node2)
+    assert names(model.get_layers()) == ['layer0_input0', 'layer0_input1', 'layer0', 'dense1', 'dense2', 'layer1', 'layer2']
+    assert names(model.get_consumers('dense2')) == ['layer1']
+    check_index()
+
+    model.remove_node(new_node2)
+    model.remove_node(new_node1)
+    assert names(model.get_layers()) == ['layer0_input0', 'layer0_input1', 'layer0', 'layer1', 'layer2']
+    assert names(model.get_consumers('layer0')) == ['layer1']
+    assert model.get_producer('dense1') is None
+    check_index()
@@ -5,6 +5,7 @@ import pytest
 import tensorflow as tf
 
 import hls4ml
+from hls4ml.converters.keras_v2_to_hls import get_model_arch, parse_keras_model
 
 test_root_path = Path(__file__).parent
 
@@ -38,3 +39,28 @@ def test_keras_h5_loader(test_case_id, backend):
     data = np.random.rand(1000, 10).astype(np.float32)
     pred = hls_model.predict(data)
     np.testing.assert_allclose(pred, model.predict(data), rtol=5e-3, atol=5e-3)
+
+
+def test_keras_h5_nested_reader(tmp_path):
+    inner = tf.keras.models.Sequential(
+        [tf.keras.layers.Dense(4, input_shape=(8,), name='inner_dense'), tf.keras.layers.Activation('relu')], name='inner'
+    )
+    inp = tf.keras.layers.Input(shape=(6,))
+    x = tf.keras.layers.Dense(8, name='outer_dense')(inp)
+    x = inner(x)
+    model = tf.keras.models.Model(inputs=inp, outputs=x)
+    model.save(tmp_path / 'model.h5')
+
+    model_arch, reader = get_model_arch({'KerasH5': str(tmp_path / 'model.h5')})
+    layer_list, _, _, _ = parse_keras_model(model_arch, reader)
+
+    inner_layer = next(layer for layer in layer_list if layer['name'] == 'inner')
+    inner_dense = next(layer for layer in inner_layer['layer_list'] if layer['name'] == 'inner_dense')
+    inner_kernel = model.get_layer('inner').get_layer('inner_dense').get_weights()[0]
+    np.testing.assert_array_equal(inner_dense['weight_data'], inner_kernel)
+
+    # The nested reader shares the file of the top-level reader
+    stats = reader.stats()
+    assert stats['opens'] == 1
+    assert stats['readers'] == 2
+    assert stats['datasets_read'] == 4
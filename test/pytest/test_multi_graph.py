@@ -58,11 +58,13 @@ def test_multimodelgraph_predict(test_case_id, split_layers, io_type, strategy,
 
     # --- Multi-model conversion with split ---
     hls_model_multi = hls4ml.model.to_multi_model_graph(hls_model_mono, list(split_layers))
-    hls_model_multi.compile()
+    hls_model_multi.compile(max_workers=2)
     pred_multi = hls_model_multi.predict(X_input)
 
     assert hasattr(hls_model_multi, 'graphs'), "Multi-model graph missing 'graphs' attribute."
     assert len(hls_model_multi.graphs) == 3, f'Expected 3 subgraphs, got {len(hls_model_multi.graphs)}'
+    for task in ['write', 'compile']:
+        assert sorted(hls_model_multi.graph_timings[task]) == ['graph1', 'graph2', 'graph3']
 
     for mono_out, multi_out in zip(pred_mono, pred_multi):
         np.testing.assert_allclose(multi_out, mono_out, rtol=0, atol=1e-5)
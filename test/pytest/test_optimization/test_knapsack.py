@@ -50,3 +50,37 @@ def test_knapsack_all_elements_fit():
     optimal, selected = solve_knapsack(values, weights, capacity)
     assert optimal == 33
     assert selected == list(range(0, values.shape[0]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_knapsack_dynamic_exhaustive(seed):
+    # Compare the dynamic programming solution to an exhaustive search on small instances
+    rng = np.random.default_rng(seed)
+    n = 12
+    values = rng.random(n)
+    weights = rng.integers(0, 10, size=(1, n))
+    capacity = np.array([25])
+
+    optimal, selected = solve_knapsack(values, weights, capacity, implementation='dynamic')
+    assert np.sum(weights[0, selected]) <= capacity[0]
+    assert np.isclose(np.sum(values[selected]), optimal)
+
+    masks = (np.arange(2**n)[:, np.newaxis] >> np.arange(n)) & 1
+    feasible = masks @ weights[0] <= capacity[0]
+    assert np.isclose(optimal, np.max(masks[feasible] @ values))
+
+
+@pytest.mark.parametrize('implementation', ['branch_bound', 'CBC_MIP'])
+def test_knapsack_dynamic_synthetic(implementation):
+    # Synthetic instance of the size of a pruning problem, with integer values so all solvers are exact
+    rng = np.random.default_rng(0)
+    n = 500
+    values = rng.integers(1, 1000, size=n)
+    weights = rng.integers(1, 64, size=(1, n))
+    capacity = np.array([np.sum(weights) // 3])
+
+    optimal_dp, selected_dp = solve_knapsack(values, weights, capacity, implementation='dynamic')
+    optimal, _ = solve_knapsack(values, weights, capacity, implementation=implementation, time_limit=60)
+    assert np.sum(weights[0, selected_dp]) <= capacity[0]
+    assert np.sum(values[selected_dp]) == optimal_dp
+    assert optimal_dp >= optimal
@@ -0,0 +1,168 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import (
+    Activation,
+    Add,
+    BatchNormalization,
+    Concatenate,
+    Conv1D,
+    Conv2D,
+    Dense,
+    Flatten,
+    Input,
+    MaxPooling2D,
+    ReLU,
+    Reshape,
+)
+from tensorflow.keras.models import Model, Sequential
+
+import hls4ml
+import hls4ml.model.graph
+from hls4ml.model.optimizer import OptimizerPass, get_optimizer, optimize_model, register_pass
+from hls4ml.model.optimizer.optimizer import ModelOptimizerPass, optimizer_map
+from hls4ml.model.types import NamedType, PrecisionType, Variable
+
+test_root_path = Path(__file__).parent
+
+
+def restart_optimize_model(model, passes, profile=None):
+    """Reference implementation, trying all passes on all nodes again after every change to the graph"""
+    optimizers = {opt_pass: get_optimizer(opt_pass) for opt_pass in passes}
+    applied_passes = set()
+    optimization_done = False
+    while not optimization_done:
+        for opt_name, opt in optimizers.items():
+            if isinstance(opt, ModelOptimizerPass):
+                if opt_name not in applied_passes:
+                    res = opt.transform(model)
+                    if res:
+                        applied_passes.add(opt_name)
+                continue
+            for node in model.graph.values():
+                if opt.match(node):
+                    res = opt.transform(model, node)
+                    applied_passes.add(opt_name)
+                    if res:
+                        break
+            else:
+                continue
+            break
+        else:
+            optimization_done = True
+
+    return applied_passes
+
+
+def _summarize_value(value):
+    if isinstance(value, Variable):
+        return (type(value).__name__, value.name, _summarize_value(value.type))
+    if isinstance(value, NamedType):
+        return (type(value).__name__, value.name, str(value.precision))
+    if isinstance(value, PrecisionType):
+        return str(value)
+    if isinstance(value, np.ndarray):
+        return (value.shape, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(_summarize_value(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, _summarize_value(v)) for k, v in value.items())
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    return type(value).__name__
+
+
+def summarize_graph(hls_model):
+    summary = []
+    for layer in hls_model.get_layers():
+        attrs = tuple((k, _summarize_value(v)) for k, v in sorted(layer.attributes.items()))
+        summary.append((layer.name, type(layer).__name__, tuple(layer.inputs), tuple(layer.outputs), attrs))
+    return summary, tuple(hls_model.inputs), tuple(hls_model.outputs)
+
+
+def keras_model():
+    inp = Input(shape=(8, 8, 3))
+    x = Conv2D(4, 3, padding='same')(inp)
+    x = BatchNormalization()(x)
+    x = ReLU()(x)
+    x = MaxPooling2D()(x)
+    y = Conv2D(4, 1)(x)
+    x = Add()([x, y])
+    x = Reshape((16, 4))(x)
+    x = Conv1D(4, 3, activation='relu')(x)
+    x = Flatten()(x)
+    a = Dense(16)(x)
+    a = BatchNormalization()(a)
+    a = Activation('relu')(a)
+    b = Dense(16, activation='tanh')(x)
+    x = Concatenate()([a, b])
+    x = Dense(5, activation='softmax')(x)
+    return Model(inputs=inp, outputs=x)
+
+
+@pytest.mark.parametrize(
+    'backend, io_type',
+    [
+        ('Vivado', 'io_parallel'),
+        ('Vivado', 'io_stream'),
+        ('Vitis', 'io_stream'),
+        ('Quartus', 'io_parallel'),
+        ('Catapult', 'io_stream'),
+    ],
+)
+def test_optimize_model_equivalence(test_case_id, monkeypatch, backend, io_type):
+    """Test that the optimization with tracking of changed nodes matches trying all passes on all nodes"""
+    model = keras_model()
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend=backend)
+    output_dir = str(test_root_path / test_case_id)
+
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, backend=backend, io_type=io_type
+    )
+    monkeypatch.setattr(hls4ml.model.graph, 'optimize_model', restart_optimize_model)
+    ref_hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=output_dir, backend=backend, io_type=io_type
+    )
+
+    assert summarize_graph(hls_model) == summarize_graph(ref_hls_model)
+    assert hls_model._applied_flows == ref_hls_model._applied_flows
+
+
+class FlagLastDense(OptimizerPass):
+    def match(self, node):
+        return node.name == 'dense_0' and not node.get_attr('flagged_last', False)
+
+    def transform(self, model, node):
+        node.set_attr('flagged_last', True)
+        # The last layer is further than two edges away, only its attributes change
+        model.graph['dense_4'].set_attr('flag', True)
+        return True
+
+
+class ApplyFlag(OptimizerPass):
+    def match(self, node):
+        return node.get_attr('flag', False) and not node.get_attr('flag_applied', False)
+
+    def transform(self, model, node):
+        node.set_attr('flag_applied', True)
+        return False
+
+
+def test_optimize_model_attribute_change(test_case_id):
+    """Test that a failed match is retried after the attributes of the node are changed by a transform elsewhere"""
+    model = Sequential([Dense(4, input_shape=(4,), name='dense_0')] + [Dense(4, name=f'dense_{i}') for i in range(1, 5)])
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend='Vivado')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=str(test_root_path / test_case_id), backend='Vivado'
+    )
+
+    passes = [register_pass('test_apply_flag', ApplyFlag), register_pass('test_flag_last_dense', FlagLastDense)]
+    try:
+        applied_passes = optimize_model(hls_model, passes)
+    finally:
+        for opt_pass in passes:
+            optimizer_map.pop(opt_pass)
+
+    assert applied_passes == set(passes)
+    assert hls_model.graph['dense_4'].get_attr('flag_applied', False)
@@ -547,3 +547,46 @@ def test_bnn(test_case_id, request, model_name, io_type, backend, strategy):
         # note, y_hls4ml returns xnor type, so let's interpret it
         y_hls4ml_logical = 2 * y_hls4ml - 1
         np.testing.assert_array_equal(y_qonnx.ravel(), y_hls4ml_logical.ravel())
+
+
+def test_onnx_graph_index():
+    from onnx import TensorProto, helper, numpy_helper
+
+    from hls4ml.converters.onnx_to_hls import OnnxGraphIndex, get_constant_value, get_input_shape
+
+    w = np.arange(12, dtype=np.float32).reshape(3, 4)
+    graph = helper.make_graph(
+        [
+            helper.make_node('MatMul', ['x', 'w'], ['y'], name='matmul'),
+            helper.make_node('Relu', ['y'], ['z'], name='relu'),
+            helper.make_node('Add', ['y', 'z'], ['out'], name='add'),
+        ],
+        'index_test',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, [1, 3])],
+        [helper.make_tensor_value_info('out', TensorProto.FLOAT, [1, 4])],
+        initializer=[numpy_helper.from_array(w, name='w')],
+        value_info=[
+            helper.make_tensor_value_info('y', TensorProto.FLOAT, [1, 4]),
+            helper.make_tensor_value_info('z', TensorProto.FLOAT, [1, 4]),
+        ],
+    )
+    index = OnnxGraphIndex(graph)
+
+    assert index.get_shape('y') == [1, 4]
+    assert index.get_shape('out') == [1, 4]
+    assert index.get_shape('missing') is None
+    assert index.get_global_input_shape('x') == [1, 3]
+    assert index.is_initializer('w') and not index.is_initializer('x')
+    assert index.get_producer('y').name == 'matmul'
+    assert index.get_producer('x') is None
+    assert [node.name for node in index.get_consumers('y')] == ['relu', 'add']
+
+    # Initializers are converted once, on first access
+    assert not index._constants
+    np.testing.assert_array_equal(index.get_constant_value('w'), w)
+    assert index.get_constant_value('w') is index.get_constant_value('w')
+
+    # Attributes of the graph and the helpers taking the graph still work
+    assert [node.name for node in index.node] == ['matmul', 'relu', 'add']
+    assert get_input_shape(index, graph.node[2]) == get_input_shape(graph, graph.node[2]) == [[1, 4], [1, 4]]
+    np.testing.assert_array_equal(get_constant_value(graph, 'w'), w)
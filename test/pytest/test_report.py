@@ -148,3 +148,57 @@ def test_report(hls_model_setup, capsys):
     captured = capsys.readouterr()  # capture again to test
 
     assert captured.out == backend_config['expected_outcome']
+
+
+@pytest.mark.parametrize('hls_model_setup', ['Vivado'], indirect=True)
+def test_report_database(hls_model_setup, tmp_path):
+    """Tests the parallel parsing of the reports of several projects and their caching in the report database."""
+    output_dir, _ = hls_model_setup
+    hls_dirs = [output_dir]
+    for i in range(3):
+        hls_dirs.append(str(tmp_path / f'sweep_{i}'))
+        shutil.copytree(output_dir, hls_dirs[-1])
+    hls_dirs.append(str(tmp_path / 'missing'))
+
+    db_path = str(tmp_path / 'reports.db')
+    with hls4ml.report.ReportDatabase(db_path) as db:
+        stats = db.scan(hls_dirs, max_workers=2)
+        assert stats['parsed'] == 4
+        assert list(stats['failed']) == [str(tmp_path / 'missing')]
+
+        report = db.get_report(output_dir)
+        assert report == hls4ml.report.parse_vivado_report(output_dir)
+
+        rows = db.query('dsp > ? AND io_type = ?', (70, 'io_stream'), order_by='hls_dir')
+        assert len(rows) == 4
+        assert rows[0]['dsp'] == 73
+        assert rows[0]['lut'] == 2532
+        assert rows[0]['vsynth_dsp'] == 66
+        assert rows[0]['worst_latency'] == 10
+        assert rows[0]['part'] == 'xc7z020clg400-1'
+
+        graph_reports = {hls_dir: hls4ml.report.parse_vivado_report(hls_dir) for hls_dir in hls_dirs[:2]}
+        aggregated = hls4ml.report.aggregate_graph_reports(db, hls_dirs[:2])
+        assert aggregated == hls4ml.report.aggregate_graph_reports(graph_reports)
+
+        with pytest.raises(Exception, match='hls_dirs'):
+            hls4ml.report.aggregate_graph_reports(db)
+        with pytest.raises(Exception, match='No reports of .*missing'):
+            hls4ml.report.aggregate_graph_reports(db, hls_dirs[:2] + hls_dirs[-1:])
+
+        # Only the projects with modified reports are parsed again
+        os.utime(f'{hls_dirs[1]}/vivado_synth.rpt', ns=(0, 0))
+        stats = db.scan(hls_dirs[:-1], max_workers=2)
+        assert stats['parsed'] == 1
+        assert stats['cached'] == 3
+
+        # Projects that can no longer be parsed are removed
+        shutil.rmtree(hls_dirs[3])
+        stats = db.scan(hls_dirs[:-1], max_workers=2)
+        assert list(stats['failed']) == [hls_dirs[3]]
+        assert stats['cached'] == 3
+        assert [row['hls_dir'] for row in db.query(order_by='hls_dir')] == sorted(hls_dirs[:3])
+
+    # The reports persist in the database file
+    reports = hls4ml.report.parse_vivado_reports(hls_dirs[:3], db_path=db_path)
+    assert reports[output_dir] == report
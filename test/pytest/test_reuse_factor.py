@@ -0,0 +1,21 @@
+import pytest
+
+import hls4ml
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Quartus', 'Catapult'])
+def test_valid_reuse_factors(backend):
+    backend = hls4ml.backends.get_backend(backend)
+
+    for n_in, n_out in [(1, 1), (1, 10), (10, 1), (7, 13), (16, 8), (24, 36), (100, 70)]:
+        # Exhaustive search over all reuse factors
+        expected = [rf for rf in range(1, n_in * n_out + 1) if backend._validate_reuse_factor(n_in, n_out, rf)]
+        assert backend.get_valid_reuse_factors(n_in, n_out) == expected
+
+        options = backend.get_reuse_factor_options(n_in, n_out)
+        assert list(options) == expected
+        assert all(rf * multiplier_limit == n_in * n_out for rf, multiplier_limit in options.items())
+
+    # The returned list can be modified without affecting the cached reuse factors
+    backend.get_valid_reuse_factors(16, 8).pop()
+    assert backend.get_valid_reuse_factors(16, 8)[-1] == 128
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import numpy as np
@@ -10,6 +11,7 @@ from tensorflow.keras.layers import Flatten, Input
 from tensorflow.keras.models import Sequential
 
 import hls4ml
+from hls4ml.utils.link import set_library_pool
 
 test_root_path = Path(__file__).parent
 example_model_path = (test_root_path / '../../example-models').resolve()
@@ -31,9 +33,10 @@ def qkeras_model(input_shape):
     return model
 
 
+@pytest.mark.parametrize('fmt', ['tar', 'binary'])
 @pytest.mark.parametrize('backend', ['Vitis', 'Catapult', 'oneAPI'])
 @pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
-def test_save_load__model(test_case_id, io_type, backend):
+def test_save_load__model(test_case_id, io_type, backend, fmt):
     input_shape = (8, 8, 3)
 
     keras_model = qkeras_model(input_shape)
@@ -61,7 +64,7 @@ def test_save_load__model(test_case_id, io_type, backend):
     hls_model.compile()
     y_original = hls_model.predict(X)
 
-    hls_model.save(out_dir / 'qonnx_model.fml')
+    hls_model.save(out_dir / 'qonnx_model.fml', fmt=fmt)
     hls_model_clone = hls4ml.converters.load_saved_model(out_dir / 'qonnx_model.fml')
     hls_model_clone.config.config['OutputDir'] = str(out_dir / 'clone')
     hls_model_clone.compile()
@@ -144,3 +147,54 @@ def test_linking_project(test_case_id, io_type, backend):
     y_clone = hls_model_clone.predict(X)
 
     np.testing.assert_equal(y_original, y_clone)
+
+
+def test_linking_library_pool(test_case_id):
+    input_shape = (8, 8, 3)
+
+    keras_model = qkeras_model(input_shape)
+
+    X = np.random.uniform(low=0, high=1, size=10 * np.prod(input_shape)).reshape((10, *input_shape))
+    X = (np.round(X * 2**10) * 2**-10).astype(np.float32)
+
+    config = hls4ml.utils.config.config_from_keras_model(keras_model, granularity='name', default_precision='fixed<16,6>')
+
+    y_original = []
+    for i in range(3):
+        hls_model = hls4ml.converters.convert_from_keras_model(
+            keras_model, output_dir=str(test_root_path / test_case_id / f'prj{i}'), backend='Vitis', hls_config=config
+        )
+        hls_model.compile()
+        y_original.append(hls_model.predict(X))
+
+    pool = set_library_pool(max_size=2)
+
+    # The libraries are up to date, so they are loaded without compiling
+    for i in range(3):
+        hls_model_clone = hls4ml.converters.link_existing_project(test_root_path / test_case_id / f'prj{i}')
+        np.testing.assert_equal(hls_model_clone.predict(X), y_original[i])
+    assert pool.stats()['entries'] == 2
+    assert pool.stats()['evictions'] == 1
+
+    # A library older than the sources is not used until compiled again
+    os.utime(test_root_path / test_case_id / 'prj0' / 'firmware' / 'myproject.cpp')
+    hls_model_clone = hls4ml.converters.link_existing_project(test_root_path / test_case_id / 'prj0')
+    with pytest.raises(Exception, match='Model not compiled'):
+        hls_model_clone.predict(X)
+    hls_model_clone.compile()
+    np.testing.assert_equal(hls_model_clone.predict(X), y_original[0])
+
+    # A library is not unloaded while any call using it is running
+    pool = set_library_pool(max_size=1)
+    hls_model_clone = hls4ml.converters.link_existing_project(test_root_path / test_case_id / 'prj0')
+    first = hls_model_clone.predict_iter(X, chunk_size=5)
+    second = hls_model_clone.predict_iter(X, chunk_size=5)
+    next(first)
+    y_second = [next(second)]
+    first.close()
+    hls_model_other = hls4ml.converters.link_existing_project(test_root_path / test_case_id / 'prj1')
+    np.testing.assert_equal(hls_model_other.predict(X), y_original[1])
+    assert pool.stats()['entries'] == 2
+    y_second += list(second)
+    np.testing.assert_equal(np.concatenate(y_second), y_original[0])
+    assert pool.stats()['entries'] == 1
@@ -54,3 +54,78 @@ def test_trace(test_case_id, backend, activation):
     for key in hls4ml_trace.keys():
         np.testing.assert_allclose(hls4ml_trace[key], keras_trace[key], rtol=1e-2, atol=0.01)
     np.testing.assert_allclose(hls4ml_pred, keras_prediction, rtol=1e-2, atol=0.01)
+    for key in hls4ml_trace.keys():
+        assert hls4ml_trace[key].shape == (X_input.shape[0], 2)
+
+    # The trace storage is released after tracing, so predicting again must not write to the trace arrays
+    traced_dense = hls4ml_trace['Dense'].copy()
+    np.testing.assert_array_equal(hls_model.predict(X_input[::-1].copy())[::-1], hls4ml_pred)
+    np.testing.assert_array_equal(hls4ml_trace['Dense'], traced_dense)
+
+
+def test_get_ymodel_keras_batched():
+    """Test that capturing the Keras outputs in batches, or only their summaries, matches a single batch."""
+    inputs = tf.keras.Input(shape=(4,))
+    x = Dense(8, activation='relu', name='dense_relu')(inputs)
+    x = Dense(8, name='dense_linear')(x)
+    outputs = Activation('tanh', name='tanh')(x)
+    model = tf.keras.Model(inputs=inputs, outputs=outputs)
+
+    X_input = np.random.rand(250, 4).astype(np.float32) - 0.5
+    keras_trace = hls4ml.model.profiling.get_ymodel_keras(model, X_input, batch_size=1000)
+    assert list(keras_trace.keys()) == ['dense_relu', 'dense_relu_relu', 'dense_linear', 'tanh']
+    np.testing.assert_allclose(keras_trace['tanh'], model.predict(X_input), rtol=1e-5, atol=1e-6)
+    assert model.get_layer('dense_relu').activation.__name__ == 'relu'
+
+    batched_trace = hls4ml.model.profiling.get_ymodel_keras(model, X_input, batch_size=32)
+    for key in keras_trace.keys():
+        np.testing.assert_allclose(batched_trace[key], keras_trace[key], rtol=1e-5, atol=1e-6)
+
+    summary = hls4ml.model.profiling.get_ymodel_keras(model, X_input, batch_size=32, summary=True)
+    for key, y in keras_trace.items():
+        assert summary[key]['min'] == pytest.approx(y.min())
+        assert summary[key]['max'] == pytest.approx(y.max())
+        assert summary[key]['count'] == y.size
+        assert summary[key]['zeros'] == np.count_nonzero(y == 0)
+        for p, value in summary[key]['percentiles'].items():
+            exact = np.percentile(y, p, method='inverted_cdf')
+            assert value == pytest.approx(exact, rel=0.011, abs=1e-12)
+
+
+@pytest.mark.parametrize('plot', ['boxplot', 'histogram'])
+def test_activations_hlsmodel_streaming(test_case_id, monkeypatch, plot):
+    """Test that profiling the activations in chunks gives the same summaries as tracing all samples at once."""
+    model = tf.keras.models.Sequential()
+    model.add(Dense(8, input_shape=(4,), name='dense', activation='relu'))
+    model.add(Dense(2, name='dense_linear'))
+    model.compile(optimizer='adam', loss='mse')
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend='Vivado')
+    for layer in config['LayerName'].keys():
+        config['LayerName'][layer]['Trace'] = True
+    output_dir = str(test_root_path / test_case_id)
+    hls_model = hls4ml.converters.convert_from_keras_model(model, hls_config=config, output_dir=output_dir, backend='Vivado')
+    hls_model.compile()
+
+    X_input = np.random.rand(500, 4) - 0.5
+    expected = hls4ml.model.profiling.activations_hlsmodel(hls_model, X_input, plot=plot)
+
+    # The project is written and built once, not for every chunk
+    builds = []
+    backend = hls_model.config.backend
+    write, compile_lib = hls_model.write, backend.compile
+    monkeypatch.setattr(hls_model, 'write', lambda: builds.append('write') or write())
+    monkeypatch.setattr(backend, 'compile', lambda model: builds.append('compile') or compile_lib(model))
+    streamed = hls4ml.model.profiling.activations_hlsmodel(hls_model, X_input, plot=plot, chunk_size=64)
+    assert builds == ['write', 'compile']
+    assert [s['weight'] for s in streamed] == [s['weight'] for s in expected]
+    for s, e in zip(streamed, expected):
+        assert s.keys() == e.keys()
+        if plot == 'histogram':
+            np.testing.assert_array_equal(s['b'], e['b'])
+            np.testing.assert_allclose(s['h'], e['h'])
+        else:
+            assert s['whislo'] == e['whislo']
+            assert s['whishi'] == e['whishi']
+            for key in ['q1', 'med', 'q3']:
+                assert s[key] == pytest.approx(e[key], rel=0.05)
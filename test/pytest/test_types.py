@@ -1,15 +1,19 @@
+import numpy as np
 import pytest
 
 from hls4ml.backends.fpga.fpga_backend import FPGABackend
 from hls4ml.backends.fpga.fpga_types import ACFixedPrecisionDefinition, APFixedPrecisionDefinition
 from hls4ml.model.types import (
+    CompressedWeightVariable,
     ExponentPrecisionType,
+    ExponentWeightVariable,
     FixedPrecisionType,
     FloatPrecisionType,
     IntegerPrecisionType,
     RoundingMode,
     SaturationMode,
     StandardFloatPrecisionType,
+    WeightVariable,
     XnorPrecisionType,
 )
 
@@ -184,3 +188,33 @@ def test_ac_float_parsing(prec_tuple):
     assert evalprec.integer == integer
     assert evalprec.exponent == exponent
     assert evalprec.rounding_mode == round_mode
+
+
+@pytest.mark.parametrize('dtype', [np.float16, np.float32, np.float64, np.int8, np.uint16, np.int64])
+@pytest.mark.parametrize(
+    'precision',
+    [
+        FixedPrecisionType(16, 6),
+        FixedPrecisionType(8, 10),
+        FixedPrecisionType(40, 2),
+        IntegerPrecisionType(8),
+        ExponentPrecisionType(4),
+        FloatPrecisionType(),
+    ],
+)
+def test_weight_formatting(dtype, precision):
+    """Test that the bulk formatting of the weights matches the formatting of the individual values"""
+    rng = np.random.default_rng(42)
+    data = (rng.standard_normal((15, 4)) * 100).astype(dtype)
+    data[data.astype(np.float64) < 10] = 0
+
+    weights = WeightVariable('w1', 'w1_t', precision, data)
+    assert ', '.join(weights.format_data(chunk_size=7)) == ', '.join(weights)
+
+    weights = CompressedWeightVariable('w1', 'w1_t', precision, data, reuse_factor=3)
+    assert ', '.join(weights.format_data(chunk_size=7)) == ', '.join(weights)
+
+    if np.issubdtype(dtype, np.floating):
+        po2_data = np.where(data < 0, -1, 1) * 2.0 ** rng.integers(-4, 4, size=data.shape)
+        weights = ExponentWeightVariable('w1', 'w1_t', precision, po2_data.astype(dtype))
+        assert ', '.join(weights.format_data(chunk_size=7)) == ', '.join(weights)
@@ -2,8 +2,9 @@ import os
 import shutil
 from pathlib import Path
 
+import numpy as np
 import pytest
-from tensorflow.keras.layers import Dense
+from tensorflow.keras.layers import Conv1D, Dense, Flatten
 from tensorflow.keras.models import Sequential
 
 import hls4ml
@@ -78,6 +79,120 @@ def test_write_weights_txt(test_case_id, keras_model, write_weights_txt, backend
     assert txt_written == write_weights_txt
 
 
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+def test_weights_format(test_case_id, keras_model, backend):
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name', backend=backend)
+    x = np.random.rand(20, 15)
+
+    predictions = []
+    for weights_format in ['txt', 'bin']:
+        odir = str(test_root_path / f'{test_case_id}_{weights_format}')
+        hls_model = hls4ml.converters.convert_from_keras_model(
+            keras_model, hls_config=config, output_dir=odir, backend=backend, weights_format=weights_format
+        )
+        hls_model.compile()
+        predictions.append(hls_model.predict(x))
+
+        assert os.path.exists(odir + f'/firmware/weights/w2.{weights_format}')
+
+    np.testing.assert_array_equal(predictions[0], predictions[1])
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+def test_weights_format_invalid(test_case_id, keras_model, backend):
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name', backend=backend)
+    odir = str(test_root_path / test_case_id)
+    with pytest.raises(Exception, match='Unsupported weights format "npy"'):
+        hls4ml.converters.convert_from_keras_model(
+            keras_model, hls_config=config, output_dir=odir, backend=backend, weights_format='npy'
+        )
+
+    # Also checked when writing, as the writer configuration may not come from the backend (e.g., from a YAML file)
+    hls_model = hls4ml.converters.convert_from_keras_model(keras_model, hls_config=config, output_dir=odir, backend=backend)
+    hls_model.config.writer_config['WeightsFormat'] = 'npy'
+    with pytest.raises(Exception, match='Unsupported weights format "npy"'):
+        hls_model.write()
+
+
+@pytest.mark.parametrize('io_type', ['io_stream', 'io_parallel'])
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+@pytest.mark.parametrize('namespace', [None, 'test_namespace'])
+def test_compile_units(test_case_id, io_type, backend, namespace):
+    model = Sequential()
+    model.add(Conv1D(4, 3, activation='relu', input_shape=(16, 4)))
+    model.add(Flatten())
+    model.add(Dense(16, activation='relu'))
+    model.add(Dense(8))
+    model.add(Dense(5, activation='softmax'))
+    model.compile()
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend=backend)
+    x = np.random.rand(20, 16, 4)
+
+    predictions = []
+    for compile_units in [1, 3]:
+        odir = str(test_root_path / f'{test_case_id}_units{compile_units}')
+        hls_model = hls4ml.converters.convert_from_keras_model(
+            model,
+            hls_config=config,
+            io_type=io_type,
+            output_dir=odir,
+            backend=backend,
+            namespace=namespace,
+            compile_units=compile_units,
+        )
+        hls_model.compile()
+        predictions.append(hls_model.predict(x))
+
+        n_unit_files = len(list(Path(odir, 'firmware').glob('myproject_unit*.cpp')))
+        assert n_unit_files == (compile_units if compile_units > 1 else 0)
+
+    np.testing.assert_array_equal(predictions[0], predictions[1])
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+def test_tb_data(test_case_id, keras_model, backend):
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name', backend=backend)
+    odir = test_root_path / test_case_id
+    odir.mkdir(exist_ok=True)
+    x = np.random.rand(20, 15).astype(np.float32)
+    y = np.random.rand(20, 10)
+    np.save(odir / 'x.npy', x)
+    np.save(odir / 'y.npy', y)
+
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        keras_model,
+        hls_config=config,
+        output_dir=str(odir),
+        backend=backend,
+        input_data_tb=str(odir / 'x.npy'),
+        output_data_tb=str(odir / 'y.npy'),
+    )
+    hls_model.write()
+
+    # The values are written with enough digits to be parsed back exactly
+    x_dat = np.loadtxt(odir / 'tb_data/tb_input_features.dat', dtype=np.float32)
+    y_dat = np.loadtxt(odir / 'tb_data/tb_output_predictions.dat')
+    np.testing.assert_array_equal(x_dat, x)
+    np.testing.assert_array_equal(y_dat, y)
+
+    # Up-to-date files are not written again
+    ctime = os.stat(odir / 'tb_data/tb_input_features.dat').st_ctime_ns
+    (odir / 'tb_data/tb_output_predictions.dat').unlink()
+    hls_model.write()
+    assert os.stat(odir / 'tb_data/tb_input_features.dat').st_ctime_ns == ctime
+    np.testing.assert_array_equal(np.loadtxt(odir / 'tb_data/tb_output_predictions.dat'), y)
+
+    # Another source with the same modification time (e.g., copied with cp -p) is written
+    x_other = np.random.rand(20, 15).astype(np.float32)
+    np.save(odir / 'x_other.npy', x_other)
+    x_stat = os.stat(odir / 'x.npy')
+    os.utime(odir / 'x_other.npy', ns=(x_stat.st_atime_ns, x_stat.st_mtime_ns))
+    hls_model.config.config['InputData'] = str(odir / 'x_other.npy')
+    hls_model.write()
+    np.testing.assert_array_equal(np.loadtxt(odir / 'tb_data/tb_input_features.dat', dtype=np.float32), x_other)
+
+
 @pytest.mark.skip(reason='Skipping for now as it needs the installation of the compiler.')
 @pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
 @pytest.mark.parametrize('tb_output_stream', ['stdout', 'file', 'both'])